@@ -0,0 +1,97 @@
+"""
+Compares collecting self-play transitions as pickled Python lists with streaming
+them into memory-mapped .npy shards (game2048/dataset.py).
+
+For both, the same games are played once up front; the benchmark times writing
+the transitions, the bytes per transition on disk, reading everything back and
+drawing random batches.
+
+Usage: python benchmarks/bench_dataset.py --games 200 --batch 256
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+import numpy.typing as npt  # noqa: E402
+
+from game2048 import dataset  # noqa: E402
+
+Transition = Tuple[List[List[int]], int, int, List[List[int]]]
+
+
+def to_lists(transitions: npt.NDArray[np.void], size: int) -> List[Transition]:
+    """Turns transitions into the (board, action, reward, next board) lists they replace."""
+
+    def board(row: npt.NDArray[np.uint8]) -> List[List[int]]:
+        tiles = [1 << int(e) if e else 0 for e in row]
+        return [tiles[start:][:size] for start in range(0, size * size, size)]
+
+    return [
+        (board(row["board"]), int(row["action"]), int(row["reward"]), board(row["next_board"]))
+        for row in transitions
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--samples", type=int, default=200, help="random batches to draw")
+    args = parser.parse_args()
+
+    games = list(dataset.generate(args.games, seed=0))
+    lists = [transition for game in games for transition in to_lists(game, 4)]
+    count = len(lists)
+    print(f"{args.games} games, {count} transitions")
+    print(f"{'format':>8} {'write s':>8} {'bytes/tr':>9} {'read s':>7} {'batch us':>9}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "transitions.pickle")
+        start = time.perf_counter()
+        with open(path, "wb") as pickle_file:
+            pickle.dump(lists, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
+        write = time.perf_counter() - start
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        with open(path, "rb") as pickle_file:
+            loaded = pickle.load(pickle_file)
+        read = time.perf_counter() - start
+        rnd = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(args.samples):
+            [loaded[rnd.randrange(count)] for _ in range(args.batch)]
+        batch = (time.perf_counter() - start) / args.samples
+        print(f"{'pickle':>8} {write:>8.3f} {size / count:>9.1f} {read:>7.3f} {batch * 1e6:>9.1f}")
+
+        shards = os.path.join(directory, "shards")
+        start = time.perf_counter()
+        with dataset.ShardWriter(shards, 4, 1 << 20) as writer:
+            for transitions in games:
+                writer.write(transitions)
+        write = time.perf_counter() - start
+        size = sum(entry.stat().st_size for entry in os.scandir(shards))
+        with dataset.ShardReader(shards) as reader:
+            start = time.perf_counter()
+            for view in reader.batches(4096):
+                view["reward"].sum()
+            read = time.perf_counter() - start
+            rng = np.random.default_rng(0)
+            start = time.perf_counter()
+            for _ in range(args.samples):
+                reader.sample(args.batch, rng)
+            batch = (time.perf_counter() - start) / args.samples
+        print(f"{'npy':>8} {write:>8.3f} {size / count:>9.1f} {read:>7.3f} {batch * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures bulk leaderboard export and import through PostgreSQL COPY on a
+generated multi-million-row users table.
+
+Uses the DB_* variables from .env with DB_NAME replaced by TEST_DB_NAME,
+because the users table is dropped first.
+
+Usage: python benchmarks/bench_db_copy.py --rows 2000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+    if not os.getenv("TEST_DB_NAME"):
+        sys.exit("Set TEST_DB_NAME to a disposable PostgreSQL database.")
+    os.environ["DB_NAME"] = os.environ["TEST_DB_NAME"]
+
+    from game2048.db import DatabaseManager, connect
+
+    logging.getLogger("game2048.db").setLevel(logging.WARNING)
+    connection = connect()
+    with connection, connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS users")
+    connection.close()
+    db = DatabaseManager()
+    db.create_table()
+
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        seed_path = os.path.join(directory, "seed.csv")
+        start = time.perf_counter()
+        with open(seed_path, "w", encoding="utf-8") as file:
+            file.write("name,scores\n")
+            for index in range(args.rows):
+                file.write(f"user{index},{rnd.randrange(1_000_000)}\n")
+        print(f"generated {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'operation':>22} {'rows':>10} {'seconds':>8} {'rows/s':>10}")
+        steps = [
+            ("import csv (new rows)", db.import_scores, seed_path, "csv"),
+            ("export csv", db.export_scores, os.path.join(directory, "out.csv"), "csv"),
+            ("export binary", db.export_scores, os.path.join(directory, "out.bin"), "binary"),
+            ("import csv (merge)", db.import_scores, os.path.join(directory, "out.csv"), "csv"),
+            (
+                "import binary (merge)",
+                db.import_scores,
+                os.path.join(directory, "out.bin"),
+                "binary",
+            ),
+        ]
+        for name, action, path, file_format in steps:
+            stats = action(path, file_format)
+            if stats is None:
+                sys.exit(f"{name} failed, see the log for details.")
+            print(f"{name:>22} {stats.rows:>10} {stats.seconds:>8.2f} {stats.rows_per_sec:>10.0f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
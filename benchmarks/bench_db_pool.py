@@ -0,0 +1,88 @@
+"""
+Load test for DatabaseManager against a local PostgreSQL instance, comparing a
+connection per manager with managers sharing a ConnectionPool.
+
+Connection settings come from the DB_* variables in .env. Scores are written
+for user names prefixed with "bench-" and removed afterwards.
+
+Usage: python benchmarks/bench_db_pool.py --threads 16 --requests 200 --pool-size 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.db import DatabaseManager, connect  # noqa: E402
+from game2048.pool import ConnectionPool  # noqa: E402
+
+
+def run_threads(threads: int, requests: int, work: Callable[[int, int], None]) -> float:
+    """Runs work(thread, request) from several threads and returns the wall time."""
+
+    def worker(thread: int) -> None:
+        for request in range(requests):
+            work(thread, request)
+
+    workers: List[threading.Thread] = [
+        threading.Thread(target=worker, args=(thread,)) for thread in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per thread")
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+    logging.getLogger("game2048.db").setLevel(logging.WARNING)
+
+    try:
+        connect().close()
+    except Exception as e:
+        sys.exit(f"Cannot reach PostgreSQL database '{os.getenv('DB_NAME')}': {e}")
+    setup = DatabaseManager()
+    setup.create_table()
+    total = args.threads * args.requests
+
+    def unpooled(thread: int, request: int) -> None:
+        db = DatabaseManager()
+        db.update_or_create_row(f"bench-{thread}", request)
+        db.close()
+
+    seconds = run_threads(args.threads, args.requests, unpooled)
+    print(f"{'connection per call':>20}: {total / seconds:8.0f} req/s")
+
+    pool = ConnectionPool(connect, min_size=1, max_size=args.pool_size, timeout=30.0)
+    shared = DatabaseManager(pool)
+
+    def pooled(thread: int, request: int) -> None:
+        shared.update_or_create_row(f"bench-{thread}", request)
+
+    seconds = run_threads(args.threads, args.requests, pooled)
+    print(f"{'pooled':>20}: {total / seconds:8.0f} req/s")
+    for key, value in pool.stats().items():
+        print(f"{key:>20}: {value:g}")
+    pool.close()
+
+    setup.close()
+    connection = connect()
+    with connection, connection.cursor() as cursor:
+        cursor.execute("DELETE FROM users WHERE name LIKE 'bench-%%'")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Plays full games with the expectimax solver and reports tile rates, per-move
+latency and transposition table hit rate.
+
+Usage: python benchmarks/bench_expectimax.py --games 5 --depth 3 --budget 0.05
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.bitboard import BitboardGame2048  # noqa: E402
+from game2048.expectimax import ExpectimaxSolver  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=None, help="seconds per move")
+    parser.add_argument("--cache", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tiles: Counter[int] = Counter()
+    for index in range(args.games):
+        game = BitboardGame2048(rng=GameRNG(args.seed + index))
+        solver = ExpectimaxSolver(args.depth, time_budget=args.budget, cache_size=args.cache)
+        start = time.perf_counter()
+        while not game.is_game_over():
+            move = solver.choose(game)
+            if move is not None and game.move(move):
+                game.insert_random_tile()
+        max_tile = max(max(row) for row in game.board)
+        tiles[max_tile] += 1
+        stats = solver.stats
+        print(
+            f"game {index}: score {game.score}, max tile {max_tile}, moves {stats.moves}, "
+            f"{time.perf_counter() - start:.1f}s, latency mean {stats.mean_seconds * 1000:.2f}ms "
+            f"p99 {stats.percentile(0.99) * 1000:.2f}ms max {stats.max_seconds * 1000:.2f}ms, "
+            f"hit rate {stats.hit_rate:.1%}, table {solver.table_size}, timeouts {stats.timeouts}"
+        )
+    for tile in sorted(tiles):
+        reached = sum(count for value, count in tiles.items() if value >= tile)
+        print(f"reached {tile}: {reached / args.games:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures GameHistory over long games: time per recorded move, undo and redo,
+and the memory held by the history compared with a deep copy of every board.
+
+Games that end are continued by undoing a few positions, so every run records
+the requested number of moves.
+
+Usage: python benchmarks/bench_history.py --moves 100000 --sizes 4 8 16
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.bitboard import BitboardGame2048  # noqa: E402
+from game2048.game import DIRECTIONS, Game2048  # noqa: E402
+from game2048.history import GameHistory  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+
+
+def deep_copy_bytes(size: int) -> int:
+    """Returns the size of one board stored as a deep-copied list of lists."""
+    board = [[0] * size for _ in range(size)]
+    return sys.getsizeof(board) + sum(sys.getsizeof(row) for row in board)
+
+
+def measure(game: Game2048, moves: int, max_states: Optional[int], seed: int) -> None:
+    """Plays random moves through a history and prints its timings and memory."""
+    rnd = random.Random(seed)
+    history = GameHistory(game, max_states=max_states)
+    recorded = 0
+    start = time.perf_counter()
+    while recorded < moves:
+        if game.is_game_over():
+            for _ in range(10):
+                history.undo()
+        recorded += history.move(rnd.choice(DIRECTIONS))
+    move_seconds = time.perf_counter() - start
+
+    steps = len(history) - 1
+    start = time.perf_counter()
+    while history.undo():
+        pass
+    undo_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    while history.redo():
+        pass
+    redo_seconds = time.perf_counter() - start
+
+    engine = type(game).__name__
+    naive = deep_copy_bytes(game.size) * (steps + 1)
+    print(
+        f"{engine:>17} {game.size:>4} {steps:>7} {move_seconds / moves * 1e6:>8.1f} "
+        f"{undo_seconds / max(steps, 1) * 1e6:>8.1f} {redo_seconds / max(steps, 1) * 1e6:>8.1f} "
+        f"{history.memory_usage() / 2**20:>9.1f} {naive / 2**20:>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moves", type=int, default=100_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--max-states", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+    print(
+        f"{'engine':>17} {'size':>4} {'states':>7} {'move us':>8} {'undo us':>8} {'redo us':>8} "
+        f"{'held MiB':>9} {'copies MiB':>10}"
+    )
+    for size in args.sizes:
+        games = [Game2048(size, GameRNG(args.seed))]
+        if size == 4:
+            games.append(BitboardGame2048(size, GameRNG(args.seed)))
+        for game in games:
+            measure(game, args.moves, args.max_states, args.seed)
+
+
+if __name__ == "__main__":
+    main()
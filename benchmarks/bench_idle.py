@@ -0,0 +1,52 @@
+"""
+Measures the CPU used by GameManager.run while the player is idle, comparing
+the busy polling loop, an FPS-capped polling loop and the event-driven loop.
+
+Runs on the SDL dummy video driver.
+
+Usage: python benchmarks/bench_idle.py --seconds 2
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from game2048.game import Game2048  # noqa: E402
+from game2048.manager import GameManager  # noqa: E402
+
+
+def idle_cpu(seconds: float, fps: int, wait_for_events: bool) -> float:
+    """Runs an idle game for the given time and returns the CPU share used."""
+    manager = GameManager(Game2048(4), fps=fps, wait_for_events=wait_for_events)
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+    wall, cpu = time.perf_counter(), time.process_time()
+    manager.run()
+    return (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--fps", type=int, default=60)
+    args = parser.parse_args()
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+    modes = (
+        ("busy polling", 0, False),
+        (f"polling capped at {args.fps} fps", args.fps, False),
+        ("event-driven", args.fps, True),
+    )
+    for name, fps, wait_for_events in modes:
+        print(f"{name:>28}: {idle_cpu(args.seconds, fps, wait_for_events):6.1%} CPU")
+
+
+if __name__ == "__main__":
+    main()
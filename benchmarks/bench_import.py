@@ -0,0 +1,80 @@
+"""
+Measures the import time of the entry points with ``python -X importtime``, as a
+regression check for startup cost.
+
+Each module is imported in a fresh interpreter and the cumulative time of its
+own import is reported, the best of --repeat runs. Headless modules must not
+load pygame, psycopg2, dotenv or numpy; the check fails if they do, or if an
+import takes longer than --max-ms.
+
+Usage: python benchmarks/bench_import.py --repeat 5 --max-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+root = Path(__file__).resolve().parent.parent
+
+# Modules timed, and whether they must start without the heavy dependencies.
+modules: List[Tuple[str, bool]] = [
+    ("game2048.game", True),
+    ("game2048.bitboard", True),
+    ("game2048.selfplay", True),
+    ("game2048.console", True),
+    ("main", True),
+    ("game2048.storage", True),
+    ("game2048.manager", False),
+]
+
+heavy = ("pygame", "psycopg2", "dotenv", "numpy")
+
+
+def import_time(module: str) -> Tuple[float, List[str]]:
+    """Imports module in a new interpreter; returns its milliseconds and the heavy modules loaded."""
+    code = f"import sys, {module}; print(' '.join(m for m in {heavy!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root,
+        env=dict(os.environ, PYTHONPATH=str(root), PYGAME_HIDE_SUPPORT_PROMPT="1"),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    micros = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            micros = int(fields[1])
+    return micros / 1000, result.stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<20} {'best ms':>8}  heavy modules loaded")
+    for module, headless in modules:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        best = min(ms for ms, _ in runs)
+        loaded = runs[0][1]
+        print(f"{module:<20} {best:>8.1f}  {' '.join(loaded) or '-'}")
+        if headless and loaded:
+            failures.append(f"{module} loads {', '.join(loaded)}")
+        if headless and args.max_ms is not None and best > args.max_ms:
+            failures.append(f"{module} takes {best:.1f} ms, over {args.max_ms} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares Game2048 with LargeBoardGame2048 on spawn, move and is_game_over
+for board sizes 4 to 128, and on spawns into a board with --empty-percent of
+its cells empty, where most spawns miss their random probes and fall back to
+picking among the empty cells.
+
+Usage: python benchmarks/bench_large.py --steps 200 --sizes 4 8 16 32 64 128 --empty-percent 5
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Type
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.game import DIRECTIONS, Game2048  # noqa: E402
+from game2048.large import LargeBoardGame2048  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+
+
+def measure(engine: Type[Game2048], size: int, steps: int, seed: int) -> Dict[str, float]:
+    """
+    Plays random moves and times each operation.
+
+    Returns:
+        Dict[str, float]: Mean microseconds per spawn, move and is_game_over call.
+    """
+    moves = random.Random(seed)
+    game = engine(size, GameRNG(seed))
+    # Fill part of the board so that moves and checks see realistic positions.
+    for _ in range(size * size // 2):
+        game.insert_random_tile()
+    totals = {"spawn": 0.0, "move": 0.0, "is_game_over": 0.0}
+    calls = {"spawn": 0, "move": 0, "is_game_over": 0}
+
+    def timed(name: str, call: Callable[[], object]) -> object:
+        start = time.perf_counter()
+        result = call()
+        totals[name] += time.perf_counter() - start
+        calls[name] += 1
+        return result
+
+    for _ in range(steps):
+        if timed("is_game_over", game.is_game_over):
+            break
+        direction = moves.choice(DIRECTIONS)
+        if timed("move", lambda: game.move(direction)):
+            timed("spawn", game.insert_random_tile)
+    return {name: totals[name] / max(calls[name], 1) * 1e6 for name in totals}
+
+
+def measure_full(
+    engine: Type[Game2048], size: int, steps: int, seed: int, empty_percent: float
+) -> float:
+    """
+    Times spawns into a nearly full board, reloading it whenever half its empty cells are used.
+
+    Returns:
+        float: Mean microseconds per spawn.
+    """
+    rnd = random.Random(seed)
+    cells = size * size
+    empty = max(2, int(cells * empty_percent / 100))
+    board = [[2 << rnd.randrange(12) for _ in range(size)] for _ in range(size)]
+    for index in rnd.sample(range(cells), empty):
+        board[index // size][index % size] = 0
+    game = engine(size, GameRNG(seed))
+    total = 0.0
+    done = 0
+    while done < steps:
+        game.load_board(board)
+        for _ in range(min(empty // 2, steps - done)):
+            start = time.perf_counter()
+            game.insert_random_tile()
+            total += time.perf_counter() - start
+            done += 1
+    return total / steps * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 8, 16, 32, 64, 128])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--empty-percent", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+    print(f"{'size':>5} {'operation':>13} {'Game2048 us':>12} {'Large us':>10} {'speedup':>8}")
+    for size in args.sizes:
+        results: List[Dict[str, float]] = [
+            measure(engine, size, args.steps, args.seed)
+            for engine in (Game2048, LargeBoardGame2048)
+        ]
+        for name in ("spawn", "move", "is_game_over"):
+            base, large = results[0][name], results[1][name]
+            speedup = base / large if large else 0.0
+            print(f"{size:>5} {name:>13} {base:>12.1f} {large:>10.1f} {speedup:>7.1f}x")
+        base, large = (
+            measure_full(engine, size, args.steps, args.seed, args.empty_percent)
+            for engine in (Game2048, LargeBoardGame2048)
+        )
+        speedup = base / large if large else 0.0
+        print(f"{size:>5} {'full spawn':>13} {base:>12.1f} {large:>10.1f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measures the cost of logging on the game loop, for:
+
+- none: the game logger disabled, the baseline;
+- game: the game logger as shipped, queued, which records game starts and ends;
+- filtered: one record per move below the logger level;
+- sync: one record per move through a synchronous RotatingFileHandler with the
+  old 10 kB rotation size and an f-string message;
+- queue: one record per move through the queued handler with a %-style message,
+  the file written on a background thread.
+
+The "drain" column is the time the background thread still needed after the loop.
+
+Usage: python benchmarks/bench_logging.py --moves 100000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.game import DIRECTIONS, Game2048, game_logger  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+from logger.logger import Logger, flush_logs  # noqa: E402
+
+
+def play(moves: int, log: Optional[logging.Logger], lazy: bool) -> float:
+    """Plays random moves, logging one record per move, and returns the seconds taken."""
+    rnd = random.Random(0)
+    game = Game2048(4, GameRNG(0))
+    start = time.perf_counter()
+    for _ in range(moves):
+        if game.is_game_over():
+            game = Game2048(4, GameRNG(rnd.getrandbits(64)))
+        direction = rnd.choice(DIRECTIONS)
+        changed = game.move(direction)
+        if log is not None:
+            if lazy:
+                log.info("Moved %s, changed %s, score %d.", direction, changed, game.score)
+            else:
+                log.info(f"Moved {direction}, changed {changed}, score {game.score}.")
+        if changed:
+            game.insert_random_tile()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moves", type=int, default=100_000)
+    args = parser.parse_args()
+    game_logger.propagate = False
+    game_level = game_logger.level
+    game_logger.setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filtered = Logger(
+            "bench.filtered", os.path.join(directory, "filtered.log"), level=logging.WARNING
+        ).get_logger()
+        sync = Logger(
+            "bench.sync", os.path.join(directory, "sync.log"), max_bytes=10000
+        ).get_logger()
+        queued = Logger(
+            "bench.queue", os.path.join(directory, "queue.log"), use_queue=True
+        ).get_logger()
+        for each in (filtered, sync, queued):
+            each.propagate = False
+
+        play(args.moves // 10, None, True)  # warm up
+        baseline = play(args.moves, None, True)
+        print(f"{'mode':>9} {'us/move':>8} {'overhead us':>12} {'drain s':>8}")
+        print(f"{'none':>9} {baseline / args.moves * 1e6:>8.2f} {0.0:>12.2f} {0.0:>8.2f}")
+        modes: List[Tuple[str, Optional[logging.Logger], bool]] = [
+            ("game", None, True),
+            ("filtered", filtered, True),
+            ("sync", sync, False),
+            ("queue", queued, True),
+        ]
+        for mode, log, lazy in modes:
+            game_logger.setLevel(game_level if mode == "game" else logging.CRITICAL)
+            seconds = play(args.moves, log, lazy)
+            start = time.perf_counter()
+            flush_logs()
+            drain = time.perf_counter() - start
+            overhead = (seconds - baseline) / args.moves * 1e6
+            print(f"{mode:>9} {seconds / args.moves * 1e6:>8.2f} {overhead:>12.2f} {drain:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
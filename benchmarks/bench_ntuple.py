@@ -0,0 +1,78 @@
+"""
+Measures the n-tuple network (game2048/ntuple.py): the time to evaluate one
+afterstate and to pick a greedy move, compared with a depth-2 expectimax move,
+and the training throughput over a few TD-learning games.
+
+Usage: python benchmarks/bench_ntuple.py --tuples small --train-games 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from game2048.bitboard import BitboardGame2048  # noqa: E402
+from game2048.expectimax import ExpectimaxSolver, load_heuristic  # noqa: E402
+from game2048.ntuple import NTupleNetwork, TDTrainer, default_tuples, small_tuples  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tuples", choices=("default", "small"), default="small")
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--train-games", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    network = NTupleNetwork(default_tuples if args.tuples == "default" else small_tuples)
+    print(
+        f"allocated {sum(len(t) for t in network.tables) * 4 / 2**20:.1f} MiB "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    for table in network.arrays():
+        table[:] = np.random.default_rng(0).random(len(table), dtype=np.float32)
+
+    # A mid-game position to evaluate.
+    game = BitboardGame2048(rng=GameRNG(0))
+    for _ in range(60):
+        for direction in ("left", "up", "right", "down"):
+            if game.move(direction):
+                game.insert_random_tile()
+    packed = game.bits
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        network.value(packed)
+    value = (time.perf_counter() - start) / args.calls
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        network.best_move(packed)
+    greedy = (time.perf_counter() - start) / args.calls
+    # A fresh solver per call, so that no move is answered from its cache.
+    calls = max(1, args.calls // 1000)
+    load_heuristic()
+    start = time.perf_counter()
+    for _ in range(calls):
+        ExpectimaxSolver(2).choose(game)
+    search = (time.perf_counter() - start) / calls
+    print(f"{'value':<22} {value * 1e6:>10.1f} us")
+    print(f"{'greedy move':<22} {greedy * 1e6:>10.1f} us")
+    print(f"{'expectimax depth 2':<22} {search * 1e6:>10.1f} us")
+
+    trainer = TDTrainer(NTupleNetwork(network.tuples))
+    for _ in trainer.run(args.train_games):
+        pass
+    stats = trainer.stats
+    print(
+        f"training: {stats.games} games, {stats.games_per_sec:.1f} games/s, "
+        f"{stats.moves_per_sec:.0f} moves/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measures the cost of the hot-path timers: moves per second on the list and
+bitboard engines with instrumentation off, then on.
+
+Usage: python benchmarks/bench_profiling.py --moves 200000
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Type
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048 import profiling  # noqa: E402
+from game2048.bitboard import BitboardGame2048  # noqa: E402
+from game2048.game import DIRECTIONS, Game2048  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+
+
+def play(engine: Type[Game2048], moves: int) -> float:
+    """Plays random moves, starting new games as needed, and returns microseconds per move."""
+    rnd = random.Random(0)
+    game = engine(4, GameRNG(0))
+    start = time.perf_counter()
+    for _ in range(moves):
+        if game.is_game_over():
+            game = engine(4, GameRNG(rnd.getrandbits(64)))
+        if game.move(rnd.choice(DIRECTIONS)):
+            game.insert_random_tile()
+    return (time.perf_counter() - start) / moves * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moves", type=int, default=200_000)
+    args = parser.parse_args()
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+    print(f"{'engine':>17} {'off us':>8} {'on us':>8} {'overhead':>9}")
+    for engine in (Game2048, BitboardGame2048):
+        play(engine, args.moves // 10)  # warm up
+        off = play(engine, args.moves)
+        profiling.enable()
+        on = play(engine, args.moves)
+        profiling.disable()
+        print(f"{engine.__name__:>17} {off:>8.2f} {on:>8.2f} {on / off - 1:>8.1%}")
+    print()
+    print(profiling.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Records self-play games to a binary record file, then replays and verifies
+them through the memory-mapped reader, reporting size and replay throughput.
+
+Usage: python benchmarks/bench_record.py --games 2000 --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.record import RecordReader, RecordWriter, replay  # noqa: E402
+from game2048.selfplay import SelfPlayRunner  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    runner = SelfPlayRunner(args.games, workers=args.workers, seed=args.seed, record=True)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.rec")
+        with RecordWriter(path) as writer:
+            for result in runner.run():
+                assert result.record is not None
+                writer.write(result.record)
+        size = os.path.getsize(path)
+        moves = runner.stats.moves
+
+        start = time.perf_counter()
+        with RecordReader(path) as reader:
+            games, failures = reader.verify()
+            seconds = time.perf_counter() - start
+            sample = next(iter(reader))
+        print(f"{games} games, {moves} moves, {size} bytes ({size / games:.0f} bytes/game)")
+        print(
+            f"replayed and verified in {seconds:.2f}s: {games / seconds:.0f} games/s, "
+            f"{moves / seconds:.0f} moves/s, {len(failures)} mismatches"
+        )
+        # Size of the same games stored as JSON board snapshots after every move.
+        board, _ = replay(sample)
+        snapshot = len(json.dumps(board))
+        print(f"JSON snapshots would take about {snapshot * (moves + games) / size:.0f}x more")
+
+
+if __name__ == "__main__":
+    main()
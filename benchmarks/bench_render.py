@@ -0,0 +1,52 @@
+"""
+Measures GameManager.draw_board frame times on the SDL dummy video driver.
+
+Usage: python benchmarks/bench_render.py --frames 300 --sizes 4 16 32 64
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from game2048.game import DIRECTIONS  # noqa: E402
+from game2048.large import LargeBoardGame2048  # noqa: E402
+from game2048.manager import GameManager  # noqa: E402
+from game2048.rng import GameRNG  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 32, 64])
+    parser.add_argument("--move-every", type=int, default=10, help="frames between moves")
+    args = parser.parse_args()
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+    print(f"{'size':>5} {'mean ms':>8} {'p99 ms':>8} {'max fps':>8}")
+    for size in args.sizes:
+        moves = random.Random(size)
+        game = LargeBoardGame2048(size, GameRNG(size))
+        for _ in range(size * size // 2):
+            game.insert_random_tile()
+        manager = GameManager(game)
+        for frame in range(args.frames):
+            if frame % args.move_every == 0 and game.move(moves.choice(DIRECTIONS)):
+                game.insert_random_tile()
+            manager.draw_board()
+        times = sorted(manager.frame_times)
+        mean = manager.frame_time
+        p99 = times[min(len(times) - 1, int(0.99 * len(times)))]
+        print(f"{size:>5} {mean * 1000:>8.3f} {p99 * 1000:>8.3f} {1 / mean:>8.0f}")
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
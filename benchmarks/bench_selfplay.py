@@ -0,0 +1,45 @@
+"""
+Measures how self-play throughput scales with the number of worker processes.
+
+Usage: python benchmarks/bench_selfplay.py --games 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.selfplay import SelfPlayRunner  # noqa: E402
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, cores])
+    parser.add_argument("--policy", default="random")
+    parser.add_argument("--engine", choices=("list", "bitboard"), default="bitboard")
+    args = parser.parse_args()
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+    print(f"{cores} cores available")
+    print(f"{'workers':>7} {'games/s':>9} {'moves/s':>10} {'speedup':>8} {'efficiency':>10}")
+    baseline = 0.0
+    for workers in sorted(set(args.workers)):
+        runner = SelfPlayRunner(args.games, policy=args.policy, workers=workers, engine=args.engine)
+        for _ in runner.run():
+            pass
+        stats = runner.stats
+        baseline = baseline or stats.games_per_sec / workers
+        speedup = stats.games_per_sec / baseline if baseline else 0.0
+        print(
+            f"{workers:>7} {stats.games_per_sec:>9.1f} {stats.moves_per_sec:>10.0f} "
+            f"{speedup:>7.2f}x {speedup / workers:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
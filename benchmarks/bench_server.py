@@ -0,0 +1,141 @@
+"""
+Load generator for the game server (game2048/server.py).
+
+Starts the server in a subprocess, opens --sessions games over --connections
+TCP connections, then plays random moves on every session for --seconds and
+reports the move throughput, the p50/p99/max move latency and the server's
+memory per session. A session whose game ends is replaced by a new one, so the
+number of open sessions stays constant.
+
+Usage: python benchmarks/bench_server.py --sessions 10000 --connections 100 --seconds 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+root = Path(__file__).resolve().parent.parent
+
+directions = ("left", "right", "up", "down")
+
+
+def rss(pid: int) -> int:
+    """Returns the resident memory of a process in bytes, from /proc."""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+class Connection:
+    """One client connection, sending a request at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        response: Dict[str, Any] = json.loads(await self.reader.readline())
+        if "error" in response:
+            raise RuntimeError(f"Server error: {response['error']}")
+        return response
+
+
+async def play(
+    connection: Connection, sessions: List[str], deadline: float, seed: int
+) -> Tuple[List[float], int]:
+    """Plays random moves round-robin on the sessions until the deadline."""
+    rnd = random.Random(seed)
+    latencies: List[float] = []
+    games = 0
+    while time.perf_counter() < deadline:
+        for i, session in enumerate(sessions):
+            request = {"op": "move", "session": session, "direction": rnd.choice(directions)}
+            start = time.perf_counter()
+            response = await connection.request(request)
+            latencies.append(time.perf_counter() - start)
+            if response["over"]:
+                sessions[i] = (await connection.request({"op": "new"}))["session"]
+                games += 1
+    return latencies, games
+
+
+async def run(args: argparse.Namespace, port: int, pid: int) -> None:
+    connections = []
+    for _ in range(args.connections):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        connections.append(Connection(reader, writer))
+    idle = rss(pid)
+    start = time.perf_counter()
+    sessions: List[List[str]] = [[] for _ in connections]
+    for index in range(args.sessions):
+        connection = connections[index % len(connections)]
+        response = await connection.request({"op": "new", "seed": index})
+        sessions[index % len(connections)].append(response["session"])
+    opened = time.perf_counter() - start
+    per_session = (rss(pid) - idle) / args.sessions
+    print(
+        f"opened {args.sessions} sessions in {opened:.2f}s, "
+        f"{per_session / 1024:.1f} KiB of server memory each"
+    )
+
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    results = await asyncio.gather(
+        *(play(c, s, deadline, i) for i, (c, s) in enumerate(zip(connections, sessions)))
+    )
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for result in results for latency in result[0])
+    games = sum(result[1] for result in results)
+    for connection in connections:
+        connection.writer.close()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(
+        f"{len(latencies)} moves in {elapsed:.1f}s: {len(latencies) / elapsed:.0f} moves/s, "
+        f"{games} games finished"
+    )
+    print(
+        f"move latency: p50 {percentile(0.5):.2f} ms, p99 {percentile(0.99):.2f} ms, "
+        f"max {latencies[-1] * 1000:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(root))
+    command = [sys.executable, "-m", "game2048.server", "--port", "0", "--no-scores"]
+    command += ["--max-sessions", str(args.sessions)]
+    # The server's log file goes to a scratch directory.
+    with tempfile.TemporaryDirectory() as directory:
+        server = subprocess.Popen(
+            command, cwd=directory, env=env, stdout=subprocess.PIPE, text=True
+        )
+        try:
+            assert server.stdout is not None
+            port = int(server.stdout.readline().rsplit(":", 1)[1])
+            asyncio.run(run(args, port, server.pid))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measures leaderboard storage throughput for single upserts, batched submits,
+top-K reads and rank lookups, on SQLite and, when reachable, PostgreSQL.
+
+PostgreSQL uses the DB_* variables from .env with DB_NAME replaced by
+TEST_DB_NAME, because the users table is dropped first.
+
+Usage: python benchmarks/bench_storage.py --users 10000 --ops 2000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game2048.storage import LeaderboardStorage, SQLiteStorage  # noqa: E402
+
+
+def rate(ops: int, action: Callable[[int], object]) -> float:
+    """Runs action(index) ops times and returns operations per second."""
+    start = time.perf_counter()
+    for index in range(ops):
+        action(index)
+    return ops / (time.perf_counter() - start)
+
+
+def run(storage: LeaderboardStorage, users: int, ops: int) -> None:
+    """Prints the throughput of each storage operation."""
+    rnd = random.Random(0)
+    storage.create_table()
+    batch: List[Tuple[str, int]] = [(f"user{i}", rnd.randrange(100000)) for i in range(users)]
+    start = time.perf_counter()
+    storage.submit_scores(batch)
+    print(f"{'submit_scores':>22}: {users / (time.perf_counter() - start):10.0f} rows/s")
+    results = {
+        "update_or_create_row": rate(
+            ops,
+            lambda i: storage.update_or_create_row(
+                f"user{rnd.randrange(users)}", rnd.randrange(100000)
+            ),
+        ),
+        "get_row": rate(ops, lambda i: storage.get_row(f"user{rnd.randrange(users)}")),
+        "get_top(10)": rate(ops, lambda i: storage.get_top(10)),
+        "get_rank": rate(ops, lambda i: storage.get_rank(f"user{rnd.randrange(users)}")),
+    }
+    for name, value in results.items():
+        print(f"{name:>22}: {value:10.0f} ops/s")
+    storage.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+    for name in ("game2048.storage", "game2048.db"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("SQLite")
+        run(SQLiteStorage(os.path.join(directory, "bench.sqlite3")), args.users, args.ops)
+
+    if not os.getenv("TEST_DB_NAME"):
+        print("PostgreSQL skipped: set TEST_DB_NAME to a disposable database")
+        return
+    os.environ["DB_NAME"] = os.environ["TEST_DB_NAME"]
+    from game2048.db import DatabaseManager, connect
+
+    try:
+        connection = connect()
+    except Exception as e:
+        print(f"PostgreSQL skipped: {e}")
+        return
+    with connection, connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS users")
+    connection.close()
+    print("PostgreSQL")
+    run(DatabaseManager(), args.users, args.ops)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures board canonicalization and the StateIndex (game2048/symmetry.py):
+
+- the time to canonicalize one packed board, and many at once with NumPy;
+- the positions visited by --games self-play games, distinct as boards and
+  distinct up to symmetry;
+- the time and memory to count them in a StateIndex, against a Python set of
+  the raw boards.
+
+Usage: python benchmarks/bench_symmetry.py --games 2000 --policy greedy
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from game2048 import dataset  # noqa: E402
+from game2048.symmetry import StateIndex, canonical, canonical_array  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--policy", default="greedy")
+    args = parser.parse_args()
+
+    games = list(dataset.generate(args.games, args.policy, seed=0))
+    exponents = np.concatenate([game["board"] for game in games]).astype(np.uint64)
+    boards = np.bitwise_or.reduce(exponents << (np.uint64(4) * np.arange(16, dtype=np.uint64)), 1)
+    scalars = boards[:100_000].tolist()
+
+    start = time.perf_counter()
+    for packed in scalars:
+        canonical(packed)
+    scalar = (time.perf_counter() - start) / len(scalars)
+    start = time.perf_counter()
+    canonical_array(boards)
+    vector = (time.perf_counter() - start) / len(boards)
+    print(f"canonical: {scalar * 1e6:.2f} us per board, {vector * 1e9:.0f} ns per board in arrays")
+
+    start = time.perf_counter()
+    raw = set(boards.tolist())
+    set_seconds = time.perf_counter() - start
+    set_bytes = sys.getsizeof(raw) + sum(sys.getsizeof(packed) for packed in raw)
+    index = StateIndex()
+    start = time.perf_counter()
+    index.add_many(boards)
+    index_seconds = time.perf_counter() - start
+    print(f"{len(boards)} positions from {args.games} games")
+    print(f"{'':<12} {'distinct':>9} {'seconds':>8} {'MiB':>7}")
+    print(f"{'set':<12} {len(raw):>9} {set_seconds:>8.3f} {set_bytes / 2**20:>7.1f}")
+    print(
+        f"{'StateIndex':<12} {len(index):>9} {index_seconds:>8.3f} "
+        f"{index.memory_usage() / 2**20:>7.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
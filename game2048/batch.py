@@ -0,0 +1,280 @@
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from game2048.game import DIRECTIONS, game_logger, spawn_tries
+from game2048.rng import GameRNG
+
+# Move codes accepted by BatchGame2048.move are indices into DIRECTIONS.
+MoveCodes = Union[Sequence[int], npt.NDArray[np.integer[Any]]]
+
+
+def slide_left(
+    rows: npt.NDArray[np.uint8],
+) -> Tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]:
+    """
+    Slides and merges rows of tile exponents to the left.
+
+    Each row follows the semantics of Game2048._merge: tiles are compacted,
+    equal neighbours are merged once from left to right and the row is padded
+    with empty cells.
+
+    Args:
+        rows (np.ndarray): A (rows, size) array of tile exponents, 0 for empty cells.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The slid rows and the score gained by each row.
+    """
+    order = np.argsort(rows == 0, axis=1, kind="stable")
+    compact = np.take_along_axis(rows, order, axis=1)
+    gains = np.zeros(len(rows), dtype=np.int64)
+    for i in range(rows.shape[1] - 1):
+        left, right = compact[:, i], compact[:, i + 1]
+        merge = (left != 0) & (left == right)
+        left[merge] += 1
+        right[merge] = 0
+        gains[merge] += np.left_shift(1, left[merge].astype(np.int64))
+    order = np.argsort(compact == 0, axis=1, kind="stable")
+    return np.take_along_axis(compact, order, axis=1), gains
+
+
+def _orient(boards: npt.NDArray[np.uint8], direction: int) -> npt.NDArray[np.uint8]:
+    """Rotates boards so that a move in the given direction becomes a left move."""
+    if direction == 1:
+        return boards[:, :, ::-1]
+    if direction == 2:
+        return boards.transpose(0, 2, 1)
+    if direction == 3:
+        return boards.transpose(0, 2, 1)[:, :, ::-1]
+    return boards
+
+
+def _restore(boards: npt.NDArray[np.uint8], direction: int) -> npt.NDArray[np.uint8]:
+    """Undoes _orient for the given direction."""
+    if direction == 1:
+        return boards[:, :, ::-1]
+    if direction == 2:
+        return boards.transpose(0, 2, 1)
+    if direction == 3:
+        return boards[:, :, ::-1].transpose(0, 2, 1)
+    return boards
+
+
+class BatchGame2048:
+    """
+    Vectorized engine that steps many independent 2048 games at once.
+
+    Boards are stored as one (count, size, size) array of tile exponents
+    (0 for an empty cell, 1 for 2, 2 for 4, ...), and every operation runs as
+    array operations across the whole batch.
+
+    With a seed, game i draws its spawns from ``GameRNG(seed).split(i)`` by the
+    rule of Game2048.insert_random_tile, so it plays the same game as
+    ``Game2048(size, GameRNG(seed).split(i))`` given the same moves. Those spawns
+    are placed one game at a time; without a seed they are drawn for the whole
+    batch at once.
+
+    Attributes:
+        _size (int): The size of each board.
+        _boards (np.ndarray): The tile exponents of all boards.
+        _scores (np.ndarray): The current score of every game.
+        _rng (np.random.Generator): The random generator used for unseeded spawns.
+        _root (Optional[GameRNG]): The stream the games' streams are split from, if seeded.
+        _lanes (Optional[List[GameRNG]]): The spawn stream of every game, if seeded.
+    """
+
+    __slots__ = ("_size", "_boards", "_scores", "_rng", "_root", "_lanes")
+
+    def __init__(self, count: int, board_size: int = 4, seed: Optional[int] = None) -> None:
+        """
+        Initializes the batch with two random tiles on every board.
+
+        Args:
+            count (int): The number of games in the batch.
+            board_size (int): The size of each game board.
+            seed (Optional[int]): Seed the games' spawn streams are split from;
+                unseeded, vectorized spawns if None.
+        """
+        if board_size < 2:
+            raise ValueError("Board size must be at least 2.")
+        if count < 1:
+            raise ValueError("Batch must contain at least one game.")
+        self._size = board_size
+        self._boards = np.zeros((count, board_size, board_size), dtype=np.uint8)
+        self._scores = np.zeros(count, dtype=np.int64)
+        self._rng = np.random.default_rng()
+        self._root = None if seed is None else GameRNG(seed)
+        self._lanes: Optional[List[GameRNG]] = None
+        if self._root is not None:
+            self._lanes = [self._root.split(lane) for lane in range(count)]
+        for _ in range(2):
+            self.spawn()
+        game_logger.info(
+            "Batch of %d games initialized with board size %dx%d.", count, board_size, board_size
+        )
+
+    @property
+    def count(self) -> int:
+        """Returns the number of games in the batch."""
+        return len(self._boards)
+
+    @property
+    def size(self) -> int:
+        """Returns the size of each game board."""
+        return self._size
+
+    @property
+    def scores(self) -> npt.NDArray[np.int64]:
+        """Returns a copy of the scores of all games."""
+        return self._scores.copy()
+
+    @property
+    def exponents(self) -> npt.NDArray[np.uint8]:
+        """Returns a copy of the tile exponents of all boards."""
+        return self._boards.copy()
+
+    @property
+    def boards(self) -> npt.NDArray[np.int64]:
+        """Returns the tile values of all boards."""
+        values = np.left_shift(1, self._boards.astype(np.int64))
+        values[self._boards == 0] = 0
+        return values
+
+    def load_boards(
+        self, boards: Sequence[Sequence[Sequence[int]]], scores: Optional[Sequence[int]] = None
+    ) -> None:
+        """
+        Replaces every board of the batch with the given tile values.
+
+        Args:
+            boards (Sequence[Sequence[Sequence[int]]]): The boards as tile values.
+            scores (Optional[Sequence[int]]): The scores to restore, zero by default.
+        """
+        values = np.asarray(boards, dtype=np.int64)
+        if values.ndim != 3 or values.shape[1] != values.shape[2] or values.shape[1] < 2:
+            raise ValueError("Boards must have shape (count, size, size).")
+        if np.any((values != 0) & ((values < 2) | (values & (values - 1) != 0))):
+            raise ValueError("Tile values must be 0 or powers of two.")
+        if scores is not None and len(scores) != len(values):
+            raise ValueError("Expected exactly one score per board.")
+        exponents: npt.NDArray[np.uint8] = np.zeros(values.shape, dtype=np.uint8)
+        occupied = values != 0
+        exponents[occupied] = np.log2(values[occupied]).astype(np.uint8)
+        self._size = values.shape[1]
+        self._boards = exponents
+        if self._root is not None and self._lanes is not None:
+            # Games keep their streams; added games get the next split streams.
+            count = len(values)
+            del self._lanes[count:]
+            self._lanes.extend(self._root.split(lane) for lane in range(len(self._lanes), count))
+        self._scores = (
+            np.zeros(len(values), dtype=np.int64)
+            if scores is None
+            else np.asarray(scores, dtype=np.int64).copy()
+        )
+
+    def get_empty_counts(self) -> npt.NDArray[np.int64]:
+        """Returns the number of empty cells on every board."""
+        return np.asarray(np.count_nonzero(self._boards == 0, axis=(1, 2)), dtype=np.int64)
+
+    def spawn(self, mask: Optional[npt.NDArray[np.bool_]] = None) -> None:
+        """
+        Inserts a 2 (90%) or a 4 (10%) into a random empty cell of the selected boards.
+
+        Args:
+            mask (Optional[npt.NDArray[np.bool_]]): Boolean array selecting the boards to spawn on,
+                all boards by default. Boards without an empty cell are skipped.
+        """
+        flat = self._boards.reshape(self.count, -1)
+        selected = np.ones(self.count, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        if self._lanes is not None:
+            self._spawn_seeded(flat, np.flatnonzero(selected).tolist())
+            return
+        selected = selected & np.any(flat == 0, axis=1)
+        # The arg-max of uniform keys over the empty cells picks one of them uniformly.
+        keys = self._rng.random(flat.shape)
+        keys[flat != 0] = -1.0
+        cells = np.argmax(keys, axis=1)
+        values = np.where(self._rng.random(self.count) < 0.9, 1, 2).astype(np.uint8)
+        rows = np.flatnonzero(selected)
+        flat[rows, cells[rows]] = values[rows]
+
+    def _spawn_seeded(self, flat: npt.NDArray[np.uint8], games: List[int]) -> None:
+        """Spawns on each game from its own stream, drawing as Game2048.insert_random_tile."""
+        assert self._lanes is not None
+        cells = flat.shape[1]
+        for game in games:
+            rng = self._lanes[game]
+            board = flat[game]
+            for _ in range(spawn_tries):
+                cell = rng.below(cells)
+                if not board[cell]:
+                    break
+            else:
+                empty = np.flatnonzero(board == 0)
+                if not len(empty):
+                    continue
+                cell = int(empty[rng.below(len(empty))])
+            board[cell] = 1 if rng.tile() == 2 else 2
+
+    def move(self, moves: MoveCodes) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+        """
+        Applies one move to every game without spawning new tiles.
+
+        Args:
+            moves (MoveCodes): The move code of every game (see DIRECTIONS);
+                a negative code leaves the game untouched.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The score gained and the changed flag of every game.
+        """
+        codes = np.asarray(moves)
+        if codes.shape != (self.count,):
+            raise ValueError("Expected exactly one move per game.")
+        gains = np.zeros(self.count, dtype=np.int64)
+        changed = np.zeros(self.count, dtype=bool)
+        for direction in range(len(DIRECTIONS)):
+            games = np.flatnonzero(codes == direction)
+            if not len(games):
+                continue
+            before = self._boards[games]
+            rows = _orient(before, direction).reshape(-1, self._size)
+            slid, row_gains = slide_left(rows)
+            after = _restore(slid.reshape(-1, self._size, self._size), direction)
+            self._boards[games] = after
+            gains[games] = row_gains.reshape(-1, self._size).sum(axis=1)
+            changed[games] = np.any(after != before, axis=(1, 2))
+        self._scores += gains
+        return gains, changed
+
+    def is_game_over(self) -> npt.NDArray[np.bool_]:
+        """
+        Checks every game for valid moves.
+
+        Returns:
+            np.ndarray: Boolean array, True where the game is over.
+        """
+        boards = self._boards
+        has_empty = np.any(boards == 0, axis=(1, 2))
+        horizontal = np.any(boards[:, :, 1:] == boards[:, :, :-1], axis=(1, 2))
+        vertical = np.any(boards[:, 1:, :] == boards[:, :-1, :], axis=(1, 2))
+        over: npt.NDArray[np.bool_] = ~(has_empty | horizontal | vertical)
+        return over
+
+    def step(
+        self, moves: MoveCodes
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+        """
+        Applies one move to every game and spawns a tile wherever the board changed.
+
+        Args:
+            moves (MoveCodes): The move code of every game (see DIRECTIONS).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The score gained, the changed flag
+            and the game-over flag of every game.
+        """
+        gains, changed = self.move(moves)
+        self.spawn(changed)
+        return gains, changed, self.is_game_over()
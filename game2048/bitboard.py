@@ -0,0 +1,347 @@
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from game2048.game import Afterstate, Game2048, game_logger
+from game2048.rng import GameRNG
+
+# A 4x4 board is packed into a single 64-bit integer. Every cell holds the
+# exponent of its tile in 4 bits (0 for an empty cell, 1 for 2, 2 for 4, ...),
+# so the largest representable tile is 2 ** 15 = 32768. Cell (row, col) lives
+# at bit offset 4 * (4 * row + col), which makes row ``r`` the 16-bit chunk
+# starting at bit 16 * r with column 0 in its lowest nibble.
+
+BOARD_SIZE = 4
+ROW_MASK = 0xFFFF
+MAX_EXPONENT = 15
+
+
+def _reverse_row(row: int) -> int:
+    """Reverses the order of the four nibbles of a packed row."""
+    return (
+        ((row & 0x000F) << 12)
+        | ((row & 0x00F0) << 4)
+        | ((row & 0x0F00) >> 4)
+        | ((row & 0xF000) >> 12)
+    )
+
+
+def _build_tables() -> Tuple[List[int], List[int], List[int]]:
+    """
+    Precomputes the result of sliding every possible packed row.
+
+    Returns:
+        Tuple[List[int], List[int], List[int]]: The rows after a left move, the rows
+        after a right move and the score gained by either move, indexed by packed row.
+    """
+    left = [0] * (ROW_MASK + 1)
+    right = [0] * (ROW_MASK + 1)
+    score = [0] * (ROW_MASK + 1)
+    for row in range(ROW_MASK + 1):
+        cells = [(row >> (4 * i)) & 0xF for i in range(BOARD_SIZE)]
+        non_zero = [cell for cell in cells if cell != 0]
+        merged = []
+        gain = 0
+        i = 0
+        while i < len(non_zero):
+            # Two 32768 tiles would overflow a nibble, so they are left unmerged.
+            if (
+                i + 1 < len(non_zero)
+                and non_zero[i] == non_zero[i + 1]
+                and non_zero[i] < MAX_EXPONENT
+            ):
+                merged.append(non_zero[i] + 1)
+                gain += 1 << (non_zero[i] + 1)
+                i += 2
+            else:
+                merged.append(non_zero[i])
+                i += 1
+        result = 0
+        for j, exponent in enumerate(merged):
+            result |= exponent << (4 * j)
+        left[row] = result
+        # Merging is symmetric, so the reversed row slid left is the row slid right
+        # and both directions score the same.
+        score[row] = gain
+    for row in range(ROW_MASK + 1):
+        right[row] = _reverse_row(left[_reverse_row(row)])
+    return left, right, score
+
+
+class _RowTable(Protocol):
+    def __getitem__(self, row: int) -> int: ...
+
+
+class _LazyRowTable:
+    """
+    Stands in for a row table until the first lookup, which builds the tables and
+    rebinds the module globals to them, so importing the module stays cheap and
+    later moves look rows up in plain lists.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, index: int) -> None:
+        self._index = index
+
+    def __getitem__(self, row: int) -> int:
+        return load_tables()[self._index][row]
+
+
+def load_tables() -> Tuple[_RowTable, _RowTable, _RowTable]:
+    """
+    Builds the row tables, once, in place of the stand-ins.
+
+    The first move does this on its own; call it ahead of time to keep the cost
+    out of a timed section or to share the tables with forked worker processes.
+
+    Returns:
+        Tuple[_RowTable, _RowTable, _RowTable]: The left, right and score tables.
+    """
+    global _ROW_LEFT, _ROW_RIGHT, _ROW_SCORE
+    if isinstance(_ROW_LEFT, _LazyRowTable):
+        _ROW_LEFT, _ROW_RIGHT, _ROW_SCORE = _build_tables()
+    return _ROW_LEFT, _ROW_RIGHT, _ROW_SCORE
+
+
+_ROW_LEFT: _RowTable = _LazyRowTable(0)
+_ROW_RIGHT: _RowTable = _LazyRowTable(1)
+_ROW_SCORE: _RowTable = _LazyRowTable(2)
+
+
+def pack(board: List[List[int]]) -> int:
+    """
+    Packs a 4x4 board of tile values into a 64-bit integer.
+
+    Args:
+        board (List[List[int]]): The board as a 2D list of tile values.
+
+    Returns:
+        int: The packed board.
+    """
+    if len(board) != BOARD_SIZE or any(len(row) != BOARD_SIZE for row in board):
+        raise ValueError("Bitboard engine only supports a 4x4 board.")
+    packed = 0
+    for i, value in enumerate(value for row in board for value in row):
+        if value == 0:
+            continue
+        exponent = value.bit_length() - 1
+        if value != 1 << exponent or not 1 <= exponent <= MAX_EXPONENT:
+            raise ValueError(f"Tile value {value} cannot be stored in a bitboard.")
+        packed |= exponent << (4 * i)
+    return packed
+
+
+def unpack(packed: int) -> List[List[int]]:
+    """
+    Unpacks a 64-bit board into a 4x4 list of tile values.
+
+    Args:
+        packed (int): The packed board.
+
+    Returns:
+        List[List[int]]: The board as a 2D list of tile values.
+    """
+    board = []
+    for row in range(BOARD_SIZE):
+        cells = []
+        for col in range(BOARD_SIZE):
+            exponent = (packed >> (4 * (BOARD_SIZE * row + col))) & 0xF
+            cells.append(1 << exponent if exponent else 0)
+        board.append(cells)
+    return board
+
+
+def transpose(packed: int) -> int:
+    """Swaps rows and columns of a packed board."""
+    a1 = packed & 0xF0F00F0FF0F00F0F
+    a2 = packed & 0x0000F0F00000F0F0
+    a3 = packed & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _slide_rows(packed: int, table: _RowTable) -> Tuple[int, int]:
+    """Slides every row of a packed board through a row table."""
+    r0 = packed & ROW_MASK
+    r1 = (packed >> 16) & ROW_MASK
+    r2 = (packed >> 32) & ROW_MASK
+    r3 = (packed >> 48) & ROW_MASK
+    moved = table[r0] | (table[r1] << 16) | (table[r2] << 32) | (table[r3] << 48)
+    return moved, _ROW_SCORE[r0] + _ROW_SCORE[r1] + _ROW_SCORE[r2] + _ROW_SCORE[r3]
+
+
+def move_left(packed: int) -> Tuple[int, int]:
+    """Returns the packed board after a left move and the score gained."""
+    return _slide_rows(packed, _ROW_LEFT)
+
+
+def move_right(packed: int) -> Tuple[int, int]:
+    """Returns the packed board after a right move and the score gained."""
+    return _slide_rows(packed, _ROW_RIGHT)
+
+
+def move_up(packed: int) -> Tuple[int, int]:
+    """Returns the packed board after an up move and the score gained."""
+    moved, gain = _slide_rows(transpose(packed), _ROW_LEFT)
+    return transpose(moved), gain
+
+
+def move_down(packed: int) -> Tuple[int, int]:
+    """Returns the packed board after a down move and the score gained."""
+    moved, gain = _slide_rows(transpose(packed), _ROW_RIGHT)
+    return transpose(moved), gain
+
+
+MOVES: Dict[str, Callable[[int], Tuple[int, int]]] = {
+    "left": move_left,
+    "right": move_right,
+    "up": move_up,
+    "down": move_down,
+}
+
+
+def empty_cells(packed: int) -> List[Tuple[int, int]]:
+    """Returns the (row, column) coordinates of the empty cells in row-major order."""
+    return [
+        divmod(i, BOARD_SIZE)
+        for i in range(BOARD_SIZE * BOARD_SIZE)
+        if not (packed >> (4 * i)) & 0xF
+    ]
+
+
+def is_game_over(packed: int) -> bool:
+    """Checks whether no move changes a packed board."""
+    return all(move(packed)[0] == packed for move in MOVES.values())
+
+
+class BitboardGame2048(Game2048):
+    """
+    Game2048 backed by a 64-bit bitboard and precomputed row lookup tables.
+
+    It exposes the same API as Game2048 and produces identical boards and scores,
+    but only supports the classic 4x4 board with tiles up to 32768.
+
+    Attributes:
+        _bits (int): The packed game board.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, board_size: int = BOARD_SIZE, rng: Optional[GameRNG] = None) -> None:
+        """
+        Initializes the packed game board.
+
+        Args:
+            board_size (int): The size of the game board, must be 4.
+            rng (Optional[GameRNG]): The spawn stream; a freshly seeded one if None.
+        """
+        if board_size != BOARD_SIZE:
+            raise ValueError("Bitboard engine only supports a 4x4 board.")
+        self._size = board_size
+        self._rng = rng if rng is not None else GameRNG()
+        self._bits = 0
+        self._score = 0
+        self._initialize_board()
+        game_logger.info("Bitboard game initialized with board size %dx%d.", self._size, self._size)
+
+    @property
+    def board(self) -> List[List[int]]:
+        """Returns the game board unpacked into a 2D list."""
+        return unpack(self._bits)
+
+    @property
+    def bits(self) -> int:
+        """Returns the packed game board."""
+        return self._bits
+
+    def load_board(self, board: List[List[int]], score: int = 0) -> None:
+        """
+        Replaces the game board and score.
+
+        Args:
+            board (List[List[int]]): The 4x4 board to load.
+            score (int): The score to restore.
+        """
+        self._bits = pack(board)
+        self._score = score
+
+    def load_bits(self, bits: int, score: int = 0) -> None:
+        """
+        Replaces the packed game board and score.
+
+        Args:
+            bits (int): The packed board to load.
+            score (int): The score to restore.
+        """
+        self._bits = bits
+        self._score = score
+
+    def get_empty_cells(self) -> List[Tuple[int, int]]:
+        """Returns a list of coordinates of empty cells."""
+        return empty_cells(self._bits)
+
+    def get_tile(self, position: Tuple[int, int]) -> int:
+        """
+        Returns the tile value at a position, 0 for an empty cell.
+
+        Args:
+            position (Tuple[int, int]): The (row, column) position.
+        """
+        x, y = position
+        exponent = (self._bits >> (4 * (BOARD_SIZE * x + y))) & 0xF
+        return 1 << exponent if exponent else 0
+
+    def insert_2_or_4(self, position: Tuple[int, int]) -> None:
+        """
+        Inserts a 2 or 4 in the specified position.
+
+        Args:
+            position (Tuple[int, int]): The (row, column) position for insertion.
+        """
+        x, y = position
+        shift = 4 * (BOARD_SIZE * x + y)
+        exponent = 1 if self._rng.tile() == 2 else 2
+        self._bits = (self._bits & ~(0xF << shift)) | (exponent << shift)
+
+    def move(self, direction: str) -> bool:
+        """
+        Moves the tiles using the precomputed row tables.
+
+        Args:
+            direction (str): The direction to move ('left', 'right', 'up', 'down').
+
+        Returns:
+            bool: True if the board changed, False otherwise.
+        """
+        moved, gain = MOVES[direction](self._bits)
+        self._score += gain
+        changed = moved != self._bits
+        self._bits = moved
+        return changed
+
+    def get_afterstates(self) -> Dict[str, Afterstate]:
+        """
+        Computes the result of all four moves through the row tables.
+
+        Returns:
+            Dict[str, Afterstate]: The resulting board, score gain and changed flag per direction.
+        """
+        states = {}
+        for direction, move in MOVES.items():
+            moved, gain = move(self._bits)
+            states[direction] = Afterstate(unpack(moved), gain, moved != self._bits)
+        return states
+
+    def is_game_over(self) -> bool:
+        """
+        Checks if there are no valid moves left.
+
+        Returns:
+            bool: True if the game is over, False otherwise.
+        """
+        if is_game_over(self._bits):
+            game_logger.warning("Game over detected.")
+            return True
+        return False
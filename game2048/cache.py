@@ -0,0 +1,212 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from game2048.storage import LeaderboardStorage
+
+Row = Tuple[str, int]
+
+
+def _order(row: Row) -> Tuple[int, str]:
+    """Sort key of the leaderboard order: best scores first, ties by name."""
+    return -row[1], row[0]
+
+
+class LeaderboardCache:
+    """
+    An in-process cache in front of the leaderboard reads of a storage backend.
+
+    It keeps a snapshot of the top rows and a bounded map of per-user scores,
+    both expiring after a TTL. Writes go through to the database and then
+    patch the cached entries in place, so a score submission does not force
+    the next leaderboard read back to the database.
+    """
+
+    def __init__(
+        self,
+        db: LeaderboardStorage,
+        top_size: int = 100,
+        ttl: float = 30.0,
+        max_names: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create an empty cache.
+
+        :param db: Storage that serves cache misses and receives writes.
+        :param top_size: Number of leaderboard rows kept in the snapshot.
+        :param ttl: Seconds before a cached snapshot or score is read again.
+        :param max_names: Maximum number of per-user scores kept, least recently used
+            first out.
+        :param clock: Monotonic time source, in seconds.
+        """
+        self.db = db
+        self.top_size = top_size
+        self.ttl = ttl
+        self.max_names = max_names
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._top: List[Row] = []
+        self._top_keys: List[Tuple[int, str]] = []
+        # True when the snapshot holds every row of the table.
+        self._complete = False
+        self._top_expires = float("-inf")
+        # Name -> (best score or None if the user does not exist, expiry time).
+        self._names: "OrderedDict[str, Tuple[Optional[int], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of reads answered without querying the database."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_top(self, k: int = 10) -> List[Row]:
+        """
+        Retrieve the best k rows of the leaderboard.
+
+        :param k: Number of rows to return; requests beyond top_size bypass the cache.
+        :return: List of tuples containing user information (name and score).
+        """
+        if k > self.top_size:
+            with self._lock:
+                self.misses += 1
+            return self.db.get_top(k)
+        with self._lock:
+            if self._clock() < self._top_expires:
+                self.hits += 1
+                return self._top[:k]
+            self.misses += 1
+        rows = self.db.get_top(self.top_size)
+        with self._lock:
+            self._set_top(rows)
+        return rows[:k]
+
+    def get_all_rows(self) -> List[Row]:
+        """
+        Retrieve all user records sorted by scores in descending order, from the
+        snapshot when it holds the whole table.
+
+        :return: List of tuples containing user information (name and score).
+        """
+        with self._lock:
+            if self._complete and self._clock() < self._top_expires:
+                self.hits += 1
+                return list(self._top)
+            self.misses += 1
+        rows = self.db.get_all_rows()
+        limit = self.top_size
+        with self._lock:
+            self._set_top(rows[:limit])
+        return rows
+
+    def get_row(self, name: str) -> Optional[Row]:
+        """
+        Retrieve a user record by name.
+
+        :param name: Name of the user.
+        :return: Tuple containing the user's name and score, or None if not found.
+        """
+        with self._lock:
+            entry = self._names.get(name)
+            if entry is not None and self._clock() < entry[1]:
+                self._names.move_to_end(name)
+                self.hits += 1
+                return None if entry[0] is None else (name, entry[0])
+            self.misses += 1
+        row = self.db.get_row(name)
+        with self._lock:
+            self._set_name(name, None if row is None else row[1])
+        return row
+
+    def update_or_create_row(self, name: str, score: int) -> Optional[int]:
+        """
+        Save a score in the database and patch the cached entries for the user.
+
+        :param name: Name of the user.
+        :param score: New score of the user.
+        :return: The user's best score after the update, or None on failure.
+        """
+        best = self.db.update_or_create_row(name, score)
+        if best is not None:
+            with self._lock:
+                self._set_name(name, best)
+                self._patch_top(name, best)
+        return best
+
+    def submit_scores(self, scores: Iterable[Row]) -> int:
+        """
+        Save many scores in the database and patch the cached entries for their users.
+
+        :param scores: Pairs of user name and score.
+        :return: Number of distinct users submitted, 0 on failure.
+        """
+        best: Dict[str, int] = {}
+        for name, score in scores:
+            if name not in best or score > best[name]:
+                best[name] = score
+        submitted = self.db.submit_scores(best.items())
+        if not submitted:
+            return 0
+        with self._lock:
+            now = self._clock()
+            for name, score in best.items():
+                entry = self._names.get(name)
+                if entry is not None and now < entry[1]:
+                    self._set_name(name, score if entry[0] is None else max(score, entry[0]))
+                else:
+                    # The stored best may be higher than this score; forget the user.
+                    self._names.pop(name, None)
+                self._patch_top(name, score)
+        return submitted
+
+    def invalidate(self) -> None:
+        """
+        Drop every cached entry.
+        """
+        with self._lock:
+            self._top, self._top_keys = [], []
+            self._complete = False
+            self._top_expires = float("-inf")
+            self._names.clear()
+
+    def _set_top(self, rows: List[Row]) -> None:
+        self._top = list(rows)
+        self._top_keys = [_order(row) for row in rows]
+        self._complete = len(rows) < self.top_size
+        self._top_expires = self._clock() + self.ttl
+
+    def _set_name(self, name: str, score: Optional[int]) -> None:
+        self._names[name] = (score, self._clock() + self.ttl)
+        self._names.move_to_end(name)
+        while len(self._names) > self.max_names:
+            self._names.popitem(last=False)
+
+    def _patch_top(self, name: str, score: int) -> None:
+        """
+        Apply a saved score to the snapshot. Stored scores only grow, so a row in the
+        snapshot stays in it, and a user outside an incomplete snapshot whose new score
+        ranks inside it must have that score as their best.
+        """
+        if self._clock() >= self._top_expires:
+            return
+        for index, row in enumerate(self._top):
+            if row[0] == name:
+                if row[1] >= score:
+                    return
+                del self._top[index], self._top_keys[index]
+                break
+        key = _order((name, score))
+        if not self._complete and (not self._top_keys or key > self._top_keys[-1]):
+            # The row belongs somewhere after the snapshot's last row.
+            return
+        index = bisect.bisect_left(self._top_keys, key)
+        self._top.insert(index, (name, score))
+        self._top_keys.insert(index, key)
+        limit = self.top_size
+        if len(self._top) > limit:
+            del self._top[limit:], self._top_keys[limit:]
+            self._complete = False
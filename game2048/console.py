@@ -0,0 +1,127 @@
+import argparse
+import sys
+from typing import Dict, List, Optional, Sequence, TextIO
+
+from game2048.game import Game2048
+from game2048.history import GameHistory
+from game2048.rng import GameRNG
+from game2048.selfplay import create_game
+
+# Commands read from the input, by the words and letters that spell them. A line
+# holds one word or any number of letters, e.g. "wasd".
+commands: Dict[str, str] = {
+    "w": "up",
+    "a": "left",
+    "s": "down",
+    "d": "right",
+    "u": "undo",
+    "r": "redo",
+    "q": "quit",
+    "up": "up",
+    "left": "left",
+    "down": "down",
+    "right": "right",
+    "undo": "undo",
+    "redo": "redo",
+    "quit": "quit",
+}
+
+help_text = "Moves: w/a/s/d or up/left/down/right, u to undo, r to redo, q to quit."
+
+
+def render(game: Game2048) -> str:
+    """
+    Draws the board and score as text.
+
+    Args:
+        game (Game2048): The game to draw.
+
+    Returns:
+        str: The board with right-aligned tiles, dots for empty cells, then the score.
+    """
+    board = game.board
+    width = max(len(str(value)) for row in board for value in row)
+    lines = [" ".join(str(value or ".").rjust(width) for value in row) for row in board]
+    lines.append(f"Score: {game.score}")
+    return "\n".join(lines)
+
+
+def parse(line: str) -> List[str]:
+    """
+    Reads the commands on one input line.
+
+    Args:
+        line (str): The line as typed.
+
+    Returns:
+        List[str]: The commands, with unknown words and letters left out.
+    """
+    line = line.strip().lower()
+    if line in commands:
+        return [commands[line]]
+    return [commands[letter] for letter in line if letter in commands]
+
+
+def play(
+    game: Game2048, source: TextIO = sys.stdin, out: TextIO = sys.stdout, quiet: bool = False
+) -> int:
+    """
+    Plays a game from text commands until it ends, the input ends or the player quits.
+
+    Args:
+        game (Game2048): The game to play.
+        source (TextIO): The commands, one line at a time.
+        out (TextIO): Where boards and messages are written.
+        quiet (bool): Only write the final board, e.g. when moves are piped in.
+
+    Returns:
+        int: The final score.
+    """
+    history = GameHistory(game)
+    if not quiet:
+        print(help_text, render(game), sep="\n", file=out)
+    playing = not game.is_game_over()
+    for line in source:
+        for command in parse(line):
+            if command == "quit":
+                playing = False
+                break
+            if command == "undo":
+                history.undo()
+            elif command == "redo":
+                history.redo()
+            else:
+                history.move(command)
+            if game.is_game_over():
+                playing = False
+                break
+        if not quiet:
+            print(render(game), file=out)
+        if not playing:
+            break
+    if quiet:
+        print(render(game), file=out)
+    if game.is_game_over():
+        print("Game over!", file=out)
+    print(f"Final score: {game.score}", file=out)
+    return game.score
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point: ``python -m game2048.console``.
+
+    Plays in the terminal, or from moves piped to stdin, without pygame or a database.
+    """
+    parser = argparse.ArgumentParser(description="Play 2048 in the terminal.")
+    parser.add_argument("--size", type=int, default=4, help="board size")
+    parser.add_argument("--engine", choices=("list", "bitboard"), default="list")
+    parser.add_argument("--seed", type=int, default=None, help="spawn seed, random by default")
+    parser.add_argument("--quiet", action="store_true", help="only print the final board")
+    args = parser.parse_args(argv)
+    game = create_game(args.size, args.engine, GameRNG(args.seed))
+    play(game, quiet=args.quiet)
+
+
+if __name__ == "__main__":
+    main()
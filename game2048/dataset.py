@@ -0,0 +1,430 @@
+import argparse
+import bisect
+import json
+import multiprocessing
+import os
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from game2048.game import DIRECTIONS, Game2048
+from game2048.rng import GameRNG
+from game2048.selfplay import (
+    Policy,
+    _init_worker,
+    _load_shared_tables,
+    create_game,
+    resolve_policy,
+)
+
+# A dataset is a directory of .npy shards plus INDEX_NAME, a JSON index listing
+# the shards in order with their transition counts. Every shard is a standard
+# one-dimensional .npy array of transition_dtype records, so np.load reads it
+# without this module.
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+SHARD_NAME = "shard-{:06d}.npy"
+
+
+def transition_dtype(board_size: int) -> np.dtype[np.void]:
+    """
+    Returns the fixed-width record of one transition.
+
+    Boards hold one tile exponent byte per cell in row-major order (0 for an
+    empty cell, 1 for a 2, 2 for a 4, ...). The action is the index of the move
+    in DIRECTIONS, the reward its score gain and next_board the board after the
+    move and the tile spawned after it. done marks the last move of a game.
+
+    Args:
+        board_size (int): The size of the game board.
+    """
+    cells = board_size * board_size
+    return np.dtype(
+        [
+            ("board", "u1", (cells,)),
+            ("action", "u1"),
+            ("reward", "<i4"),
+            ("next_board", "u1", (cells,)),
+            ("done", "?"),
+        ]
+    )
+
+
+def _state(game: Game2048) -> Union[int, bytes]:
+    """Returns the board cheaply: the packed bits on a bitboard, else exponent bytes."""
+    bits: Optional[int] = getattr(game, "bits", None)
+    if bits is not None:
+        return bits
+    return bytes(value.bit_length() - 1 if value else 0 for row in game.board for value in row)
+
+
+def _exponents(states: List[Union[int, bytes]], cells: int) -> npt.NDArray[np.uint8]:
+    """Converts the collected states to one row of exponent bytes per board."""
+    if states and isinstance(states[0], int):
+        packed = np.array(states, dtype=np.uint64)
+        shifts = np.arange(0, 4 * cells, 4, dtype=np.uint64)
+        return ((packed[:, None] >> shifts) & np.uint64(0xF)).astype(np.uint8)
+    data = b"".join(state for state in states if isinstance(state, bytes))
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(states), cells)
+
+
+def play_transitions(
+    seed: int, policy: Union[str, Policy], board_size: int = 4, engine: str = "bitboard"
+) -> npt.NDArray[np.void]:
+    """
+    Plays one game and returns every move that changed the board as a transition.
+
+    Games are seeded as in game2048.selfplay.play_game, so a seed yields the same
+    game in both.
+
+    Args:
+        seed (int): The game seed.
+        policy (Union[str, Policy]): The policy choosing every move.
+        board_size (int): The size of the game board.
+        engine (str): The game engine to use.
+
+    Returns:
+        npt.NDArray[np.void]: The game's transitions as transition_dtype records.
+    """
+    choose = resolve_policy(policy)
+    streams = GameRNG(seed)
+    game = create_game(board_size, engine, streams.split(0))
+    rng = random.Random(streams.split(1).seed)
+    codes = {direction: code for code, direction in enumerate(DIRECTIONS)}
+    states = [_state(game)]
+    actions: List[int] = []
+    rewards: List[int] = []
+    while not game.is_game_over():
+        direction = choose(game, rng)
+        score = game.score
+        if game.move(direction):
+            game.insert_random_tile()
+            actions.append(codes[direction])
+            rewards.append(game.score - score)
+            states.append(_state(game))
+    boards = _exponents(states, board_size * board_size)
+    transitions = np.zeros(len(actions), dtype=transition_dtype(board_size))
+    transitions["board"] = boards[:-1]
+    transitions["action"] = actions
+    transitions["reward"] = rewards
+    transitions["next_board"] = boards[1:]
+    if len(transitions):
+        transitions["done"][-1] = True
+    return transitions
+
+
+def _play_task(task: Tuple[int, Union[str, Policy], int, str]) -> npt.NDArray[np.void]:
+    """Unpacks a pool task for play_transitions."""
+    return play_transitions(*task)
+
+
+def generate(
+    games: int,
+    policy: Union[str, Policy] = "random",
+    seed: int = 0,
+    board_size: int = 4,
+    engine: str = "bitboard",
+    workers: int = 1,
+) -> Iterator[npt.NDArray[np.void]]:
+    """
+    Plays games and yields each game's transitions in game order.
+
+    Game ``i`` is played with seed ``seed + i``, so the stream does not depend on
+    the number of workers. Only the games in flight are held in memory.
+
+    Args:
+        games (int): The number of games to play.
+        policy (Union[str, Policy]): The policy name, 'module:function' path or a
+            module-level callable (it must be picklable to run on a pool).
+        seed (int): The run seed.
+        board_size (int): The size of the game boards.
+        engine (str): 'list' or 'bitboard'.
+        workers (int): The number of worker processes; 1 plays in the current process.
+    """
+    resolve_policy(policy)
+    tasks = ((seed + index, policy, board_size, engine) for index in range(games))
+    if workers == 1:
+        yield from map(_play_task, tasks)
+        return
+    _load_shared_tables(engine)
+    pool = multiprocessing.Pool(workers, initializer=_init_worker)
+    try:
+        yield from pool.imap(_play_task, tasks, chunksize=max(1, games // (workers * 8)))
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+class ShardWriter:
+    """
+    Streams transitions into size-bounded .npy shards through memory-mapped writes.
+
+    Each shard is created at its full size and mapped, and transitions are copied
+    straight into the mapping, so memory use does not grow with the dataset. When a
+    shard is full, or the writer is closed, its header is rewritten with the final
+    count and the file truncated to it, and the shard is added to the index.
+
+    Opening a directory that already holds a dataset appends to it.
+    """
+
+    def __init__(self, directory: str, board_size: int = 4, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Opens the dataset directory for appending, creating it if needed.
+
+        Args:
+            directory (str): The dataset directory.
+            board_size (int): The size of the game boards.
+            max_bytes (int): The largest shard data size in bytes (default is 64 MiB).
+        """
+        self.directory = directory
+        self.dtype = transition_dtype(board_size)
+        self.capacity = max(1, max_bytes // self.dtype.itemsize)
+        os.makedirs(directory, exist_ok=True)
+        self._index: Dict[str, Any] = {
+            "version": INDEX_VERSION,
+            "board_size": board_size,
+            "dtype": np.lib.format.dtype_to_descr(self.dtype),
+            "shards": [],
+        }
+        index_path = os.path.join(directory, INDEX_NAME)
+        if os.path.exists(index_path):
+            existing = _read_index(directory)
+            if existing["board_size"] != board_size:
+                raise ValueError(
+                    f"{directory} holds {existing['board_size']}x{existing['board_size']} boards, "
+                    f"not {board_size}x{board_size}."
+                )
+            self._index["shards"] = existing["shards"]
+        self._array: Optional[np.memmap[Any, np.dtype[np.void]]] = None
+        self._path = ""
+        self._count = 0
+
+    @property
+    def transitions(self) -> int:
+        """Returns the number of transitions in the dataset, including the open shard."""
+        finished: int = sum(shard["transitions"] for shard in self._index["shards"])
+        return finished + self._count
+
+    def write(self, transitions: npt.NDArray[np.void]) -> None:
+        """
+        Appends transitions, starting new shards as the current one fills up.
+
+        Args:
+            transitions (npt.NDArray[np.void]): Records of transition_dtype, e.g. one game.
+        """
+        if transitions.dtype != self.dtype:
+            raise ValueError(
+                f"Expected transitions of dtype {self.dtype}, got {transitions.dtype}."
+            )
+        offset = 0
+        while offset < len(transitions):
+            if self._array is None:
+                self._path = os.path.join(
+                    self.directory, SHARD_NAME.format(len(self._index["shards"]))
+                )
+                self._array = np.lib.format.open_memmap(
+                    self._path, mode="w+", dtype=self.dtype, shape=(self.capacity,)
+                )
+                self._count = 0
+            take = min(self.capacity - self._count, len(transitions) - offset)
+            start, end, stop = self._count, self._count + take, offset + take
+            self._array[start:end] = transitions[offset:stop]
+            self._count, offset = end, stop
+            if self._count == self.capacity:
+                self._finish_shard()
+
+    def _finish_shard(self) -> None:
+        """Shrinks the open shard to its transitions and adds it to the index."""
+        if self._array is None:
+            return
+        self._array.flush()
+        data_offset = self._array.offset
+        self._array = None
+        with open(self._path, "r+b") as shard:
+            # numpy pads the header so that the count can grow in place; shrinking it
+            # keeps the header length, which is checked before the data is cut.
+            header = {
+                "descr": self._index["dtype"],
+                "fortran_order": False,
+                "shape": (self._count,),
+            }
+            np.lib.format.write_array_header_1_0(shard, header)
+            if shard.tell() != data_offset:
+                raise RuntimeError(f"Rewriting the header of {self._path} moved its data.")
+            shard.truncate(data_offset + self._count * self.dtype.itemsize)
+        self._index["shards"].append(
+            {"file": os.path.basename(self._path), "transitions": self._count}
+        )
+        self._count = 0
+        self._write_index()
+
+    def _write_index(self) -> None:
+        """Replaces the index file atomically, so readers never see a partial index."""
+        path = os.path.join(self.directory, INDEX_NAME)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as index_file:
+            json.dump(self._index, index_file, indent=1)
+        os.replace(f"{path}.tmp", path)
+
+    def close(self) -> None:
+        """Finishes the open shard and writes the index."""
+        self._finish_shard()
+        self._write_index()
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _read_index(directory: str) -> Dict[str, Any]:
+    """Loads and checks a dataset index."""
+    path = os.path.join(directory, INDEX_NAME)
+    try:
+        with open(path, encoding="utf-8") as index_file:
+            index: Dict[str, Any] = json.load(index_file)
+    except FileNotFoundError:
+        raise ValueError(f"{directory} is not a transition dataset: no {INDEX_NAME}.") from None
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported dataset index version {index.get('version')} in {path}.")
+    return index
+
+
+class ShardReader:
+    """
+    Reads a transition dataset through memory-mapped shards.
+
+    Shards are mapped, not loaded: batches are views into the mappings, and
+    sampling copies only the sampled transitions, so datasets larger than memory
+    can be iterated and sampled.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Maps every shard listed in the dataset index.
+
+        Args:
+            directory (str): The dataset directory.
+        """
+        self.directory = directory
+        index = _read_index(directory)
+        self.board_size: int = index["board_size"]
+        self.dtype = transition_dtype(self.board_size)
+        self._shards: List[npt.NDArray[np.void]] = []
+        # Index of the first transition of every shard, for locating a transition.
+        self._starts: List[int] = []
+        total = 0
+        for shard in index["shards"]:
+            array = np.load(os.path.join(directory, shard["file"]), mmap_mode="r")
+            if array.dtype != self.dtype or len(array) != shard["transitions"]:
+                raise ValueError(f"Shard {shard['file']} does not match the dataset index.")
+            self._shards.append(array)
+            self._starts.append(total)
+            total += len(array)
+        self._total = total
+
+    @property
+    def shards(self) -> List[npt.NDArray[np.void]]:
+        """Returns the memory-mapped shards in order."""
+        return list(self._shards)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, index: int) -> np.void:
+        """Returns one transition by its position in the dataset."""
+        if index < 0:
+            index += self._total
+        if not 0 <= index < self._total:
+            raise IndexError("Transition index out of range.")
+        shard = bisect.bisect_right(self._starts, index) - 1
+        return self._shards[shard][index - self._starts[shard]]  # type: ignore[no-any-return]
+
+    def batches(self, batch_size: int = 4096) -> Iterator[npt.NDArray[np.void]]:
+        """
+        Yields the transitions in order as zero-copy views of the shards.
+
+        Batches do not span shards, so the last batch of every shard may be shorter.
+
+        Args:
+            batch_size (int): The largest number of transitions per batch.
+        """
+        for array in self._shards:
+            for start in range(0, len(array), batch_size):
+                end = start + batch_size
+                yield array[start:end]
+
+    def sample(
+        self, count: int, rng: Optional[np.random.Generator] = None, replace: bool = True
+    ) -> npt.NDArray[np.void]:
+        """
+        Draws transitions uniformly from across all shards.
+
+        Args:
+            count (int): The number of transitions to draw.
+            rng (Optional[np.random.Generator]): The generator to draw with, a fresh one if None.
+            replace (bool): Whether a transition may be drawn more than once.
+
+        Returns:
+            npt.NDArray[np.void]: The drawn transitions, in draw order, copied out of the shards.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        indices = rng.choice(self._total, size=count, replace=replace)
+        shard_of = np.searchsorted(self._starts, indices, side="right") - 1
+        out = np.empty(count, dtype=self.dtype)
+        for shard in np.unique(shard_of).tolist():
+            hits = shard_of == shard
+            out[hits] = self._shards[shard][indices[hits] - self._starts[shard]]
+        return out
+
+    def close(self) -> None:
+        """Releases the shard mappings; views handed out keep theirs alive."""
+        self._shards = []
+        self._starts = []
+        self._total = 0
+
+    def __enter__(self) -> "ShardReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point: ``python -m game2048.dataset``.
+
+    Plays games and appends their transitions to a sharded dataset directory.
+    """
+    parser = argparse.ArgumentParser(description="Write self-play transitions to .npy shards.")
+    parser.add_argument("directory", help="dataset directory, appended to if it exists")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="run seed, game i uses seed + i")
+    parser.add_argument("--policy", default="random", help="policy name or 'module:function'")
+    parser.add_argument("--size", type=int, default=4, help="board size")
+    parser.add_argument(
+        "--engine", choices=("list", "bitboard"), default="bitboard", help="game engine"
+    )
+    parser.add_argument("--shard-mb", type=float, default=64, help="largest shard size in MiB")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stream = generate(args.games, args.policy, args.seed, args.size, args.engine, args.workers)
+    with ShardWriter(args.directory, args.size, int(args.shard_mb * 1024 * 1024)) as writer:
+        written = writer.transitions
+        for transitions in stream:
+            writer.write(transitions)
+        written = writer.transitions - written
+    seconds = time.perf_counter() - start
+    print(
+        f"{args.games} games, {written} transitions in {seconds:.2f}s "
+        f"({written / seconds if seconds else 0.0:.0f} transitions/s) written to {args.directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()
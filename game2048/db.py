@@ -1,46 +1,187 @@
+import argparse
+import functools
 import logging
 import os
-from typing import List, Optional, Tuple
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 import psycopg2
 from dotenv import load_dotenv
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 
-# Load environment variables from .env file
-load_dotenv()
+from game2048.pool import ConnectionPool
+from game2048.storage import LeaderboardStorage
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Insert users or raise their best score, atomically and in a single statement.
+KEEP_BEST_SCORE_SQL = (
+    "ON CONFLICT (name) DO UPDATE SET scores = GREATEST(users.scores, EXCLUDED.scores)"
+)
+UPSERT_SCORE_SQL = (
+    f"INSERT INTO users (name, scores) VALUES (%s, %s) {KEEP_BEST_SCORE_SQL} RETURNING scores"
+)
+UPSERT_SCORES_SQL = f"INSERT INTO users (name, scores) VALUES %s {KEEP_BEST_SCORE_SQL}"
 
-class DatabaseManager:
-    def __init__(self) -> None:
+# COPY options for the file formats accepted by export_scores and import_scores.
+COPY_FORMATS = {"csv": "(FORMAT csv, HEADER true)", "binary": "(FORMAT binary)"}
+
+_shared_pool: Optional[ConnectionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def load_settings() -> None:
+    """
+    Load environment variables from the .env file, once, on first use rather than at import.
+    """
+    load_dotenv()
+
+
+def connect() -> Any:
+    """
+    Open a new database connection using environment variables.
+
+    :return: A psycopg2 connection returning rows as dictionaries.
+    """
+    load_settings()
+    connection = psycopg2.connect(
+        dbname=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        host=os.getenv("DB_HOST"),
+        port=os.getenv("DB_PORT"),
+        cursor_factory=DictCursor,
+    )
+    connection.autocommit = False
+    return connection
+
+
+def _copy_options(file_format: str) -> str:
+    """Returns the COPY options of a file format, rejecting unknown formats."""
+    try:
+        return COPY_FORMATS[file_format]
+    except KeyError:
+        raise ValueError(f"Unknown file format: {file_format}") from None
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Return the process-wide connection pool, creating it on first use.
+
+    The pool size is read from the DB_POOL_MIN and DB_POOL_MAX environment
+    variables (default 1 and 10).
+
+    :return: The shared connection pool.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            load_settings()
+            _shared_pool = ConnectionPool(
+                connect,
+                min_size=int(os.getenv("DB_POOL_MIN", "1")),
+                max_size=int(os.getenv("DB_POOL_MAX", "10")),
+            )
+            logger.info(
+                f"Created connection pool for '{os.getenv('DB_NAME')}' "
+                f"({_shared_pool.min_size}-{_shared_pool.max_size} connections)."
+            )
+        return _shared_pool
+
+
+def close_pool() -> None:
+    """
+    Close the process-wide connection pool, if it was created.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            _shared_pool = None
+
+
+class TransferStats(NamedTuple):
+    """Size and duration of a bulk export or import."""
+
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Returns the number of rows transferred per wall-clock second."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class DatabaseManager(LeaderboardStorage):
+    # True while iter_rows streams from the dedicated connection.
+    _streaming = False
+
+    def __init__(self, pool: Optional[ConnectionPool] = None) -> None:
         """
-        Initialize the database connection using environment variables.
+        Initialize the database access, either on a dedicated connection or on a pool.
+
+        :param pool: Connection pool to borrow a connection from for each call.
+            Without one, the manager opens and owns a single connection.
         """
+        self.pool = pool
+        self.connection: Any = None
+        if pool is not None:
+            return
         try:
-            self.connection = psycopg2.connect(
-                dbname=os.getenv("DB_NAME"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                host=os.getenv("DB_HOST"),
-                port=os.getenv("DB_PORT"),
-                cursor_factory=DictCursor,
-            )
-            self.connection.autocommit = False
-            self.cursor = self.connection.cursor()
+            self.connection = connect()
             logger.info(f"Connected to the database '{os.getenv('DB_NAME')}' successfully.")
         except Exception as e:
             logger.error(f"Failed to connect to the database: {e}")
             raise
 
+    @classmethod
+    def pooled(cls) -> "DatabaseManager":
+        """
+        Create a manager on the process-wide connection pool.
+
+        :return: A DatabaseManager sharing connections with every other pooled manager.
+        """
+        return cls(get_pool())
+
+    @contextmanager
+    def _cursor(self, name: Optional[str] = None) -> Iterator[Any]:
+        """
+        Borrow a connection and yield a cursor inside a transaction that is
+        committed on success and rolled back on error.
+
+        :param name: Name for a server-side cursor, which fetches rows in batches.
+        :raises RuntimeError: If iter_rows is streaming from the dedicated connection.
+        """
+        if self.pool is None and self._streaming:
+            # Committing another query would close the stream's server-side cursor.
+            raise RuntimeError("The connection is busy streaming iter_rows.")
+        connection = self.connection if self.pool is None else self.pool.getconn()
+        broken = False
+        try:
+            with connection.cursor(name=name) as cursor:
+                yield cursor
+            connection.commit()
+        except Exception as e:
+            broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            try:
+                connection.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            if self.pool is not None:
+                self.pool.putconn(connection, discard=broken)
+
     def create_table(self) -> None:
         """
         Create a table for storing user information if it does not already exist.
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute(
                     """
                     CREATE TABLE IF NOT EXISTS users (
@@ -50,52 +191,71 @@ class DatabaseManager:
                     )
                 """
                 )
-                self.connection.commit()
-                logger.info("Table 'users' created successfully (if it did not exist).")
+                # Serves the leaderboard order, keyset pages and rank counts.
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS users_scores_name_idx ON users (scores DESC, name)
+                """
+                )
+            logger.info("Table 'users' created successfully (if it did not exist).")
         except Exception as e:
-            self.connection.rollback()
             logger.error(f"Error creating table: {e}")
 
-    def update_or_create_row(self, name: str, score: int) -> None:
+    def update_or_create_row(self, name: str, score: int) -> Optional[int]:
         """
         Update the user's score if it is higher than the current score,
         or create a new user if they do not exist.
 
+        The check and the write happen in one atomic upsert, so concurrent
+        submissions for the same name cannot race.
+
         :param name: Name of the user.
         :param score: New score of the user.
+        :return: The user's best score after the update, or None on failure.
         """
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT scores FROM users WHERE name = %s", (name,))
+            with self._cursor() as cursor:
+                cursor.execute(UPSERT_SCORE_SQL, (name, score))
                 row = cursor.fetchone()
-
-                if row:
-                    old_score = row["scores"]
-                    if score > old_score:
-                        cursor.execute(
-                            """
-                            UPDATE users SET scores = %s WHERE name = %s
-                        """,
-                            (score, name),
-                        )
-                        self.connection.commit()
-                        logger.info(f"Updated score for user '{name}' to {score}.")
-                    else:
-                        logger.info(
-                            f"User '{name}' already has a higher or equal score ({old_score})."
-                        )
-                else:
-                    cursor.execute(
-                        """
-                        INSERT INTO users (name, scores) VALUES (%s, %s)
-                    """,
-                        (name, score),
-                    )
-                    self.connection.commit()
-                    logger.info(f"User '{name}' with score {score} added to the database.")
+            best: int = row["scores"]
+            logger.info(f"Saved score {score} for user '{name}', best score is {best}.")
+            return best
         except Exception as e:
-            self.connection.rollback()
             logger.error(f"Error updating or creating user: {e}")
+            return None
+
+    def submit_scores(self, scores: Iterable[Tuple[str, int]], page_size: int = 10000) -> int:
+        """
+        Record many scores at once, keeping the highest score per user.
+
+        Scores are reduced to the best one per name and sent as multi-row
+        upserts of up to page_size rows each, in a single transaction.
+
+        :param scores: Pairs of user name and score.
+        :param page_size: Maximum number of rows sent per statement.
+        :return: Number of distinct users submitted, 0 on failure.
+        """
+        best: Dict[str, int] = {}
+        for name, score in scores:
+            if name not in best or score > best[name]:
+                best[name] = score
+        if not best:
+            return 0
+        # A stable row order keeps concurrent batches from deadlocking each other.
+        rows = sorted(best.items())
+        try:
+            with self._cursor() as cursor:
+                execute_values(
+                    cursor,
+                    UPSERT_SCORES_SQL,
+                    rows,
+                    page_size=page_size,
+                )
+            logger.info(f"Submitted scores for {len(rows)} users.")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error submitting scores: {e}")
+            return 0
 
     def get_row(self, name: str) -> Optional[Tuple[str, int]]:
         """
@@ -105,7 +265,7 @@ class DatabaseManager:
         :return: Tuple containing the user's name and score, or None if not found.
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute(
                     """
                     SELECT name, scores FROM users WHERE name = %s
@@ -113,50 +273,267 @@ class DatabaseManager:
                     (name,),
                 )
                 row = cursor.fetchone()
-                if row:
-                    logger.info(f"Record found: {row}")
-                    return row["name"], row["scores"]
-                logger.info(f"User '{name}' not found.")
-                return None
+            if row:
+                logger.info(f"Record found: {row}")
+                return row["name"], row["scores"]
+            logger.info(f"User '{name}' not found.")
+            return None
         except Exception as e:
             logger.error(f"Error retrieving record: {e}")
             return None
 
+    def get_top(self, k: int = 10, offset: int = 0) -> List[Tuple[str, int]]:
+        """
+        Retrieve one page of the leaderboard, best scores first and ties by name.
+
+        Large offsets still walk the skipped rows; use get_page for deep pages.
+
+        :param k: Number of rows to return.
+        :param offset: Number of leading rows to skip.
+        :return: List of tuples containing user information (name and score).
+        """
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT name, scores FROM users ORDER BY scores DESC, name
+                    LIMIT %s OFFSET %s
+                """,
+                    (k, offset),
+                )
+                rows = cursor.fetchall()
+            return [(row["name"], row["scores"]) for row in rows]
+        except Exception as e:
+            logger.error(f"Error retrieving top scores: {e}")
+            return []
+
+    def get_page(
+        self, k: int = 10, after: Optional[Tuple[str, int]] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Retrieve the leaderboard page that follows a given row (keyset pagination).
+
+        Each page is an index range scan starting at the last row of the previous
+        page, so deep pages cost the same as the first one.
+
+        :param k: Number of rows to return.
+        :param after: Last (name, score) of the previous page, or None for the first page.
+        :return: List of tuples containing user information (name and score).
+        """
+        if after is None:
+            return self.get_top(k)
+        name, score = after
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT name, scores FROM users
+                    WHERE scores < %s OR (scores = %s AND name > %s)
+                    ORDER BY scores DESC, name LIMIT %s
+                """,
+                    (score, score, name, k),
+                )
+                rows = cursor.fetchall()
+            return [(row["name"], row["scores"]) for row in rows]
+        except Exception as e:
+            logger.error(f"Error retrieving leaderboard page: {e}")
+            return []
+
+    def get_rank(self, name: str) -> Optional[int]:
+        """
+        Retrieve a user's leaderboard position; users with equal scores share a rank.
+
+        The user's score is found by the unique name index, and the better scores
+        are counted from the scores index without reading the table rows.
+
+        :param name: Name of the user.
+        :return: 1-based rank, or None if the user is not found.
+        """
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT 1 + (SELECT COUNT(*) FROM users better WHERE better.scores > u.scores)
+                        AS rank
+                    FROM users u WHERE u.name = %s
+                """,
+                    (name,),
+                )
+                row = cursor.fetchone()
+            return row["rank"] if row else None
+        except Exception as e:
+            logger.error(f"Error retrieving rank: {e}")
+            return None
+
+    def iter_rows(self, batch_size: int = 10000) -> Iterator[Tuple[str, int]]:
+        """
+        Stream every user record in leaderboard order through a server-side cursor,
+        holding at most batch_size rows in memory.
+
+        On a dedicated connection the stream holds the connection until it is
+        exhausted or closed, and other calls on the manager fail in the meantime.
+        A pooled manager borrows a separate connection for each call. A failure
+        is logged and ends the stream.
+
+        :param batch_size: Number of rows fetched per round trip.
+        :return: Iterator of tuples containing user information (name and score).
+        """
+        try:
+            with self._cursor(name="users_export") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute("SELECT name, scores FROM users ORDER BY scores DESC, name")
+                self._streaming = self.pool is None
+                try:
+                    for row in cursor:
+                        yield row["name"], row["scores"]
+                finally:
+                    self._streaming = False
+        except Exception as e:
+            logger.error(f"Error streaming records: {e}")
+
     def get_all_rows(self) -> List[Tuple[str, int]]:
         """
         Retrieve all user records sorted by scores in descending order,
         excluding the ID field.
 
+        Loads the whole table; prefer get_top, get_page or iter_rows.
+
         :return: List of tuples containing user information (name and score).
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute(
                     """
-                    SELECT name, scores FROM users ORDER BY scores DESC
+                    SELECT name, scores FROM users ORDER BY scores DESC, name
                 """
                 )
                 rows = cursor.fetchall()
-                return [(row["name"], row["scores"]) for row in rows]
+            return [(row["name"], row["scores"]) for row in rows]
         except Exception as e:
             logger.error(f"Error retrieving all records: {e}")
             return []
 
+    def export_scores(self, path: str, file_format: str = "csv") -> Optional[TransferStats]:
+        """
+        Stream the leaderboard to a file with COPY, in bounded memory.
+
+        The rows are written to a temporary file that replaces path only once the
+        export succeeded, so a failed export leaves no truncated file behind.
+
+        :param path: Destination file, overwritten if it exists.
+        :param file_format: "csv" (with a name,scores header) or PostgreSQL "binary".
+        :return: Number of rows written and the time taken, or None on failure.
+        """
+        options = _copy_options(file_format)
+        start = time.perf_counter()
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as file, self._cursor() as cursor:
+                cursor.copy_expert(
+                    "COPY (SELECT name, scores FROM users ORDER BY scores DESC, name) "
+                    f"TO STDOUT WITH {options}",
+                    file,
+                )
+                stats = TransferStats(cursor.rowcount, time.perf_counter() - start)
+            os.replace(tmp, path)
+            logger.info(f"Exported {stats.rows} users to {path} ({stats.rows_per_sec:.0f} rows/s).")
+            return stats
+        except Exception as e:
+            logger.error(f"Error exporting scores: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+
+    def import_scores(self, path: str, file_format: str = "csv") -> Optional[TransferStats]:
+        """
+        Merge a file written by export_scores into the leaderboard, keeping the
+        higher score for users that already exist.
+
+        The file is streamed with COPY into a temporary table and merged with one
+        upsert, all in a single transaction.
+
+        :param path: Source file.
+        :param file_format: "csv" (with a name,scores header) or PostgreSQL "binary".
+        :return: Number of rows read and the time taken, or None on failure.
+        """
+        options = _copy_options(file_format)
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as file, self._cursor() as cursor:
+                cursor.execute(
+                    """
+                    CREATE TEMP TABLE users_import (
+                        name VARCHAR(100) NOT NULL,
+                        scores INTEGER NOT NULL
+                    ) ON COMMIT DROP
+                """
+                )
+                cursor.copy_expert(
+                    f"COPY users_import (name, scores) FROM STDIN WITH {options}", file
+                )
+                rows = cursor.rowcount
+                # Duplicate names within the file are reduced first; an upsert may
+                # not touch the same row twice.
+                cursor.execute(
+                    "INSERT INTO users (name, scores) "
+                    "SELECT name, MAX(scores) FROM users_import GROUP BY name ORDER BY name "
+                    + KEEP_BEST_SCORE_SQL
+                )
+            stats = TransferStats(rows, time.perf_counter() - start)
+            logger.info(
+                f"Imported {stats.rows} rows from {path} ({stats.rows_per_sec:.0f} rows/s)."
+            )
+            return stats
+        except Exception as e:
+            logger.error(f"Error importing scores: {e}")
+            return None
+
     def close(self) -> None:
         """
-        Close the database connection and cursor.
+        Close the manager's own connection. A pooled manager leaves the pool
+        open for other managers; close it with ``close_pool`` or ``pool.close()``.
         """
         try:
-            if self.cursor:
-                self.cursor.close()
-            if self.connection:
+            if self.connection is not None:
                 self.connection.close()
-            logger.info("Database connection closed.")
+                self.connection = None
+                logger.info("Database connection closed.")
         except Exception as e:
             logger.error(f"Error closing the connection: {e}")
 
-    def __del__(self):
+    def __del__(self) -> None:
         """
         Ensure the connection is closed when the instance is deleted.
         """
         self.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point: ``python -m game2048.db export|import PATH``.
+
+    Prints the number of rows transferred and the throughput.
+    """
+    parser = argparse.ArgumentParser(description="Bulk export or import the leaderboard.")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="file to write or read")
+    parser.add_argument("--format", choices=sorted(COPY_FORMATS), default="csv")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    db = DatabaseManager()
+    try:
+        if args.command == "export":
+            stats = db.export_scores(args.path, args.format)
+        else:
+            db.create_table()
+            stats = db.import_scores(args.path, args.format)
+    finally:
+        db.close()
+    if stats is None:
+        sys.exit(f"{args.command.capitalize()} failed, see the log for details.")
+    print(f"{stats.rows} rows in {stats.seconds:.2f}s ({stats.rows_per_sec:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
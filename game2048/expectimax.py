@@ -0,0 +1,365 @@
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Protocol, Tuple
+
+from game2048.bitboard import MOVES, BitboardGame2048, load_tables, pack, transpose
+from game2048.game import Game2048
+
+# Weights of the board heuristic. Every packed row is scored once, on first use, and
+# a board is scored as the sum over its rows and its columns.
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+# Probabilities of the tiles spawned by Game2048.insert_2_or_4.
+SPAWN_2_PROBABILITY = 0.9
+SPAWN_4_PROBABILITY = 0.1
+
+
+def _build_heuristic_table() -> List[float]:
+    """Scores every packed row by emptiness, merge potential, monotonicity and tile sum."""
+    table = [0.0] * 0x10000
+    for row in range(0x10000):
+        line = [(row >> (4 * i)) & 0xF for i in range(4)]
+        total = sum(rank**SUM_POWER for rank in line)
+        empty = line.count(0)
+        merges = 0
+        previous = 0
+        counter = 0
+        for rank in line:
+            if rank == 0:
+                continue
+            if previous == rank:
+                counter += 1
+            elif counter > 0:
+                merges += 1 + counter
+                counter = 0
+            previous = rank
+        if counter > 0:
+            merges += 1 + counter
+        left = right = 0.0
+        for i in range(1, 4):
+            if line[i - 1] > line[i]:
+                left += line[i - 1] ** MONOTONICITY_POWER - line[i] ** MONOTONICITY_POWER
+            else:
+                right += line[i] ** MONOTONICITY_POWER - line[i - 1] ** MONOTONICITY_POWER
+        table[row] = (
+            LOST_PENALTY
+            + EMPTY_WEIGHT * empty
+            + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(left, right)
+            - SUM_WEIGHT * total
+        )
+    return table
+
+
+class _HeuristicTable(Protocol):
+    def __getitem__(self, row: int) -> float: ...
+
+
+class _LazyHeuristicTable:
+    """
+    Stands in for the heuristic table until the first lookup, which builds the
+    table and rebinds the module global to it, so importing the module stays cheap.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, row: int) -> float:
+        return load_heuristic()[row]
+
+
+def load_heuristic() -> _HeuristicTable:
+    """
+    Builds the row heuristic table, once, in place of the stand-in.
+
+    The first evaluation does this on its own; call it ahead of time to keep the
+    cost out of a timed section or to share the table with forked worker processes.
+
+    Returns:
+        _HeuristicTable: The heuristic of every packed row.
+    """
+    global _HEURISTIC
+    if isinstance(_HEURISTIC, _LazyHeuristicTable):
+        _HEURISTIC = _build_heuristic_table()
+    return _HEURISTIC
+
+
+_HEURISTIC: _HeuristicTable = _LazyHeuristicTable()
+
+
+def _rows_heuristic(packed: int) -> float:
+    """Sums the heuristic of the four rows of a packed board."""
+    return (
+        _HEURISTIC[packed & 0xFFFF]
+        + _HEURISTIC[(packed >> 16) & 0xFFFF]
+        + _HEURISTIC[(packed >> 32) & 0xFFFF]
+        + _HEURISTIC[(packed >> 48) & 0xFFFF]
+    )
+
+
+def evaluate(packed: int) -> float:
+    """Scores a packed board by the heuristic of its rows and columns."""
+    return _rows_heuristic(packed) + _rows_heuristic(transpose(packed))
+
+
+def count_empty(packed: int) -> int:
+    """Counts the empty cells of a packed board."""
+    packed |= (packed >> 2) & 0x3333333333333333
+    packed |= packed >> 1
+    return bin(~packed & 0x1111111111111111).count("1")
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the per-move time budget runs out."""
+
+
+class SolverStats:
+    """
+    Per-move latency and transposition table statistics of an ExpectimaxSolver.
+
+    Attributes:
+        moves (int): The number of moves chosen.
+        total_seconds (float): The total time spent choosing moves.
+        max_seconds (float): The slowest move.
+        hits (int): Transposition table lookups that were answered from the table.
+        misses (int): Transposition table lookups that needed a search.
+        evictions (int): Entries evicted to keep the table within its size.
+        timeouts (int): Moves whose deepest search was cut by the time budget.
+        latencies (Deque[float]): The latencies of the most recent moves.
+    """
+
+    __slots__ = (
+        "moves",
+        "total_seconds",
+        "max_seconds",
+        "hits",
+        "misses",
+        "evictions",
+        "timeouts",
+        "latencies",
+    )
+
+    def __init__(self, window: int = 1000) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            window (int): The number of recent move latencies kept for percentiles.
+        """
+        self.moves = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.timeouts = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the share of table lookups answered from the table."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Returns the mean latency per move."""
+        return self.total_seconds / self.moves if self.moves else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns a latency percentile over the recent moves.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ExpectimaxSolver:
+    """
+    Expectimax search over move and spawn nodes of a 4x4 board.
+
+    Boards are searched as bitboards. The search depth grows as the board fills
+    up, chance nodes are memoized in a size-bounded LRU transposition table that
+    persists across moves, and iterative deepening keeps each move within an
+    optional time budget.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 3,
+        time_budget: Optional[float] = None,
+        cache_size: int = 200_000,
+        min_probability: float = 1e-4,
+    ) -> None:
+        """
+        Initialize the ExpectimaxSolver.
+
+        Args:
+            max_depth (int): The number of moves searched ahead on a nearly full board.
+            time_budget (Optional[float]): Seconds allowed per move, unlimited if None.
+            cache_size (int): The maximum number of transposition table entries.
+            min_probability (float): Chance nodes reached with a lower probability are
+                evaluated by the heuristic instead of being expanded.
+        """
+        if max_depth < 1:
+            raise ValueError("Search depth must be at least 1.")
+        if cache_size < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self.min_probability = min_probability
+        self.stats = SolverStats()
+        self._table: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+        self._deadline: Optional[float] = None
+        # Built here rather than at import, and before the first move's time budget starts.
+        load_tables()
+        load_heuristic()
+
+    @property
+    def table_size(self) -> int:
+        """Returns the current number of transposition table entries."""
+        return len(self._table)
+
+    def clear(self) -> None:
+        """Empties the transposition table."""
+        self._table.clear()
+
+    def depth_for(self, packed: int) -> int:
+        """
+        Picks the search depth for a board: the fewer empty cells, the deeper.
+
+        Args:
+            packed (int): The packed board.
+
+        Returns:
+            int: The number of moves to search ahead.
+        """
+        empty = count_empty(packed)
+        if empty > 8:
+            return max(1, self.max_depth - 2)
+        if empty > 4:
+            return max(1, self.max_depth - 1)
+        return self.max_depth
+
+    def best_move(self, packed: int) -> Optional[str]:
+        """
+        Chooses the best move for a packed board.
+
+        Args:
+            packed (int): The packed board.
+
+        Returns:
+            Optional[str]: The best direction, or None if no move changes the board.
+        """
+        start = time.perf_counter()
+        best: Optional[str] = None
+        for depth in range(1, self.depth_for(packed) + 1):
+            # The shallowest search always completes so that a move is available.
+            self._deadline = start + self.time_budget if self.time_budget and depth > 1 else None
+            try:
+                move = self._search_root(packed, depth)
+            except _SearchTimeout:
+                self.stats.timeouts += 1
+                break
+            if move is None:
+                break
+            best = move
+        elapsed = time.perf_counter() - start
+        stats = self.stats
+        stats.moves += 1
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
+        stats.latencies.append(elapsed)
+        return best
+
+    def choose(self, game: Game2048) -> Optional[str]:
+        """
+        Chooses the best move for a 4x4 game on any engine.
+
+        Args:
+            game (Game2048): The game.
+
+        Returns:
+            Optional[str]: The best direction, or None if the game is over.
+        """
+        packed = game.bits if isinstance(game, BitboardGame2048) else pack(game.board)
+        return self.best_move(packed)
+
+    def _search_root(self, packed: int, depth: int) -> Optional[str]:
+        """Returns the move with the highest expected value at the given depth."""
+        best: Optional[str] = None
+        best_value = -1.0
+        for direction, move in MOVES.items():
+            moved, _ = move(packed)
+            if moved == packed:
+                continue
+            value = self._chance(moved, depth - 1, 1.0)
+            if value > best_value:
+                best, best_value = direction, value
+        return best
+
+    def _max(self, packed: int, depth: int, probability: float) -> float:
+        """Evaluates a board where the player moves next."""
+        best = 0.0
+        for move in MOVES.values():
+            moved, _ = move(packed)
+            if moved != packed:
+                best = max(best, self._chance(moved, depth - 1, probability))
+        return best
+
+    def _chance(self, packed: int, depth: int, probability: float) -> float:
+        """Evaluates a board where a tile spawns next, averaged over all spawns."""
+        if depth == 0 or probability < self.min_probability:
+            return evaluate(packed)
+        table = self._table
+        entry = table.get(packed)
+        if entry is not None and entry[0] >= depth:
+            table.move_to_end(packed)
+            self.stats.hits += 1
+            return entry[1]
+        self.stats.misses += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+        empty = [4 * i for i in range(16) if not (packed >> (4 * i)) & 0xF]
+        if not empty:
+            return evaluate(packed)
+        probability_2 = probability * SPAWN_2_PROBABILITY / len(empty)
+        probability_4 = probability * SPAWN_4_PROBABILITY / len(empty)
+        total = 0.0
+        for shift in empty:
+            total += SPAWN_2_PROBABILITY * self._max(packed | (1 << shift), depth, probability_2)
+            total += SPAWN_4_PROBABILITY * self._max(packed | (2 << shift), depth, probability_4)
+        value = total / len(empty)
+        table[packed] = (depth, value)
+        table.move_to_end(packed)
+        if len(table) > self.cache_size:
+            table.popitem(last=False)
+            self.stats.evictions += 1
+        return value
+
+
+_policy_solver: Optional[ExpectimaxSolver] = None
+
+
+def expectimax_policy(game: Game2048, rng: random.Random) -> str:
+    """
+    Self-play policy backed by a per-process ExpectimaxSolver.
+
+    Usable as ``--policy game2048.expectimax:expectimax_policy``.
+    """
+    global _policy_solver
+    if _policy_solver is None:
+        _policy_solver = ExpectimaxSolver()
+    return _policy_solver.choose(game) or "up"
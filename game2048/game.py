@@ -1,10 +1,54 @@
-import random
-from typing import List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+from game2048.rng import GameRNG
 from logger.logger import Logger
 
-# Instantiate the logger
-game_logger = Logger(name="Game2048", log_file="game2048.log").get_logger()
+# Instantiate the logger; records are written to the file from a background thread.
+game_logger = Logger(name="Game2048", log_file="game2048.log", use_queue=True).get_logger()
+
+DIRECTIONS: Tuple[str, ...] = ("left", "right", "up", "down")
+
+# Random cells tried for a spawn before picking among the listed empty cells.
+spawn_tries = 8
+
+
+class Afterstate(NamedTuple):
+    """The result of one move applied to a board, before a new tile spawns."""
+
+    board: List[List[int]]
+    gain: int
+    changed: bool
+
+
+def merge_line(line: List[int]) -> Tuple[List[int], int]:
+    """
+    Slides and merges a row or column towards its start without touching any game.
+
+    Args:
+        line (List[int]): The row or column to merge.
+
+    Returns:
+        Tuple[List[int], int]: The merged line and the score gained by merging.
+    """
+    # Compact the line to remove zeros
+    non_zero = [num for num in line if num != 0]
+    merged = []
+    gain = 0
+    skip = False
+    for i in range(len(non_zero)):
+        if skip:
+            skip = False
+            continue
+        if i + 1 < len(non_zero) and non_zero[i] == non_zero[i + 1]:
+            # Merge tiles
+            merged.append(non_zero[i] * 2)
+            gain += non_zero[i] * 2
+            skip = True  # Skip the next tile as it has been merged
+        else:
+            merged.append(non_zero[i])
+    # Fill with zeros to maintain line size
+    merged += [0] * (len(line) - len(merged))
+    return merged, gain
 
 
 class Game2048:
@@ -15,37 +59,28 @@ class Game2048:
         _size (int): The size of the board (e.g., 4 for a 4x4 board).
         _board (List[List[int]]): The game board represented as a 2D list.
         _score (int): The current score of the game.
+        _rng (GameRNG): The random stream of the game's tile spawns.
     """
 
-    __slots__ = ("_size", "_board", "_score")
-    _instance: Optional["Game2048"] = None
+    __slots__ = ("_size", "_board", "_score", "_rng")
 
-    def __new__(cls, *args, **kwargs) -> "Game2048":
-        """
-        Singleton implementation: ensures only one instance of the class is created.
-
-        Returns:
-            Game2048: Single instance of the class.
-        """
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self, board_size: int) -> None:
+    def __init__(self, board_size: int, rng: Optional[GameRNG] = None) -> None:
         """
         Initializes the game board.
 
         Args:
             board_size (int): The size of the game board.
+            rng (Optional[GameRNG]): The spawn stream; a freshly seeded one if None.
         """
 
         self._size = board_size
+        self._rng = rng if rng is not None else GameRNG()
         if board_size < 2:
             raise ValueError("Board size must be at least 2.")
         self._board = [[0] * self._size for _ in range(self._size)]
         self._score = 0
         self._initialize_board()
-        game_logger.info(f"Game initialized with board size {self._size}x{self._size}.")
+        game_logger.info("Game initialized with board size %dx%d.", self._size, self._size)
 
     @property
     def score(self) -> int:
@@ -57,17 +92,33 @@ class Game2048:
         """Returns the size of the game board."""
         return self._size
 
+    @property
+    def rng(self) -> GameRNG:
+        """Returns the random stream of the game's tile spawns."""
+        return self._rng
+
     @property
     def board(self) -> List[List[int]]:
         """Returns a copy of the game board."""
         return [row[:] for row in self._board]
 
+    def load_board(self, board: List[List[int]], score: int = 0) -> None:
+        """
+        Replaces the game board and score, e.g. to resume or analyse a position.
+
+        Args:
+            board (List[List[int]]): The board to load, of the game's size.
+            score (int): The score to restore.
+        """
+        if len(board) != self._size or any(len(row) != self._size for row in board):
+            raise ValueError(f"Board must be {self._size}x{self._size}.")
+        self._board = [list(row) for row in board]
+        self._score = score
+
     def _initialize_board(self) -> None:
         """Starts the game by placing two random tiles on the board."""
         for _ in range(2):
-            empty_cells = self.get_empty_cells()
-            if empty_cells:
-                self.insert_2_or_4(random.choice(empty_cells))
+            self.insert_random_tile()
 
     def get_empty_cells(self) -> List[Tuple[int, int]]:
         """Returns a list of coordinates of empty cells."""
@@ -75,6 +126,41 @@ class Game2048:
             (i, j) for i in range(self._size) for j in range(self._size) if self._board[i][j] == 0
         ]
 
+    def get_tile(self, position: Tuple[int, int]) -> int:
+        """
+        Returns the tile value at a position, 0 for an empty cell.
+
+        Args:
+            position (Tuple[int, int]): The (row, column) position.
+        """
+        x, y = position
+        return self._board[x][y]
+
+    def insert_random_tile(self) -> Optional[Tuple[int, int]]:
+        """
+        Inserts a 2 or 4 into a random empty cell.
+
+        A few random cells are tried first, so a spawn rarely lists the empty cells.
+        The cells drawn depend only on which cells are empty, so every engine spawns
+        the same tiles from the same stream.
+
+        Returns:
+            Optional[Tuple[int, int]]: The position of the new tile, or None if the board is full.
+        """
+        size = self._size
+        cells = size * size
+        for _ in range(spawn_tries):
+            position = divmod(self._rng.below(cells), size)
+            if not self.get_tile(position):
+                break
+        else:
+            empty_cells = self.get_empty_cells()
+            if not empty_cells:
+                return None
+            position = empty_cells[self._rng.below(len(empty_cells))]
+        self.insert_2_or_4(position)
+        return position
+
     def insert_2_or_4(self, position: Tuple[int, int]) -> None:
         """
         Inserts a 2 or 4 in the specified position.
@@ -83,7 +169,7 @@ class Game2048:
             position (Tuple[int, int]): The (row, column) position for insertion.
         """
         x, y = position
-        self._board[x][y] = 2 if random.random() < 0.9 else 4
+        self._board[x][y] = self._rng.tile()
 
     def _merge(self, row: List[int]) -> Tuple[List[int], bool]:
         """
@@ -95,23 +181,8 @@ class Game2048:
         Returns:
             Tuple[List[int], bool]: The merged row and a flag indicating if merging occurred.
         """
-        # Compact the row to remove zeros
-        non_zero = [num for num in row if num != 0]
-        merged = []
-        skip = False
-        for i in range(len(non_zero)):
-            if skip:
-                skip = False
-                continue
-            if i + 1 < len(non_zero) and non_zero[i] == non_zero[i + 1]:
-                # Merge tiles
-                merged.append(non_zero[i] * 2)
-                self._score += non_zero[i] * 2  # Update the score
-                skip = True  # Skip the next tile as it has been merged
-            else:
-                merged.append(non_zero[i])
-        # Fill with zeros to maintain row size
-        merged += [0] * (self._size - len(merged))
+        merged, gain = merge_line(row)
+        self._score += gain
 
         # Return whether the row has changed
         return merged, merged != row
@@ -141,10 +212,10 @@ class Game2048:
                     self._board[row][col] = compacted[row]
 
             else:
-                row = self._board[col]
+                line = self._board[col][:]
                 if direction == "right":
-                    row.reverse()
-                compacted, _ = self._merge(row)
+                    line.reverse()
+                compacted, _ = self._merge(line)
                 if direction == "right":
                     compacted.reverse()
                 if self._board[col] != compacted:
@@ -168,6 +239,51 @@ class Game2048:
         """Handles the logic for moving tiles down."""
         return self.move("down")
 
+    @staticmethod
+    def afterstates(board: List[List[int]]) -> Dict[str, Afterstate]:
+        """
+        Computes the result of all four moves on a board without mutating it or any game.
+
+        Rows are merged once for left and right and columns once for up and down.
+
+        Args:
+            board (List[List[int]]): The board to move.
+
+        Returns:
+            Dict[str, Afterstate]: The resulting board, score gain and changed flag per direction.
+        """
+        left, right, gains = [], [], [0, 0, 0, 0]
+        for row in board:
+            merged, gain = merge_line(row)
+            left.append(merged)
+            gains[0] += gain
+            merged, gain = merge_line(row[::-1])
+            right.append(merged[::-1])
+            gains[1] += gain
+        up_columns, down_columns = [], []
+        for column in zip(*board):
+            merged, gain = merge_line(list(column))
+            up_columns.append(merged)
+            gains[2] += gain
+            merged, gain = merge_line(list(column[::-1]))
+            down_columns.append(merged[::-1])
+            gains[3] += gain
+        up = [list(row) for row in zip(*up_columns)]
+        down = [list(row) for row in zip(*down_columns)]
+        return {
+            direction: Afterstate(result, gain, result != board)
+            for direction, result, gain in zip(DIRECTIONS, (left, right, up, down), gains)
+        }
+
+    def get_afterstates(self) -> Dict[str, Afterstate]:
+        """
+        Computes the result of all four moves on the live board without copying or mutating it.
+
+        Returns:
+            Dict[str, Afterstate]: The resulting board, score gain and changed flag per direction.
+        """
+        return self.afterstates(self._board)
+
     def is_game_over(self) -> bool:
         """
         Checks if there are no valid moves left.
@@ -175,17 +291,15 @@ class Game2048:
         Returns:
             bool: True if the game is over, False otherwise.
         """
-        if self.get_empty_cells():
+        if any(0 in row for row in self._board):
             return False
-
-        for row in self._board:
-            for i in range(self._size - 1):
-                if row[i] == row[i + 1]:
-                    return False
-
-        for col in range(self._size):
-            for row in range(self._size - 1):
-                if self._board[row][col] == self._board[row + 1][col]:
-                    return False
+        # On a full board a line can move in some direction exactly when merging changes it.
+        for line in self._board:
+            if merge_line(line)[0] != line:
+                return False
+        for column in zip(*self._board):
+            line = list(column)
+            if merge_line(line)[0] != line:
+                return False
         game_logger.warning("Game over detected.")
         return True
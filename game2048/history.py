@@ -0,0 +1,203 @@
+import sys
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from game2048.bitboard import BitboardGame2048
+from game2048.game import Game2048
+
+# Tile values by exponent, for decoding rows stored as exponent bytes.
+_VALUES = [0] + [1 << exponent for exponent in range(1, 256)]
+
+
+class HistoryState(NamedTuple):
+    """
+    One immutable position of a game.
+
+    ``cells`` is the packed board for the bitboard engine, and a tuple of rows for
+    the other engines, each row holding one exponent byte per cell. Rows that a
+    move left unchanged are the same bytes objects as in the previous state.
+    """
+
+    cells: Union[int, Tuple[bytes, ...]]
+    score: int
+
+
+class GameHistory:
+    """
+    Undo, redo and named snapshots for a game.
+
+    The history keeps the positions before and after the current one on two
+    stacks, so undo and redo are O(1) besides loading the board into the game.
+    Positions are stored compactly and share their unchanged rows, and the undo
+    stack keeps at most ``max_states`` positions, dropping the oldest first.
+    Moves must be made through ``move``; after changing the game in any other
+    way, call ``record``.
+    """
+
+    __slots__ = (
+        "game",
+        "max_states",
+        "_undo",
+        "_redo",
+        "_snapshots",
+        "_current",
+        "_board",
+        "_rows",
+    )
+
+    def __init__(self, game: Game2048, max_states: Optional[int] = 100_000) -> None:
+        """
+        Starts the history at the game's current position.
+
+        Args:
+            game (Game2048): The game to track, on any engine.
+            max_states (Optional[int]): The maximum number of positions that can be
+                undone, None for no limit.
+        """
+        self.game = game
+        self.max_states = max_states
+        self._undo: Deque[HistoryState] = deque(maxlen=max_states)
+        self._redo: List[HistoryState] = []
+        self._snapshots: Dict[str, HistoryState] = {}
+        # The current position decoded and as rows, for sharing rows with the next one.
+        self._board: List[List[int]] = []
+        self._rows: Tuple[bytes, ...] = ()
+        self._current = self._encode()
+
+    @property
+    def can_undo(self) -> bool:
+        """Returns True if there is a position to go back to."""
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """Returns True if there is an undone position to go forward to."""
+        return bool(self._redo)
+
+    @property
+    def snapshots(self) -> List[str]:
+        """Returns the names of the saved snapshots."""
+        return list(self._snapshots)
+
+    def __len__(self) -> int:
+        """Returns the number of positions held, including the current one."""
+        return len(self._undo) + 1 + len(self._redo)
+
+    def move(self, direction: str) -> bool:
+        """
+        Moves the game and, if the board changed, spawns a tile and records the position.
+
+        Args:
+            direction (str): The direction to move ('left', 'right', 'up', 'down').
+
+        Returns:
+            bool: True if the board changed, False otherwise.
+        """
+        if not self.game.move(direction):
+            return False
+        self.game.insert_random_tile()
+        self.record()
+        return True
+
+    def record(self) -> None:
+        """Records the game's current position, discarding the positions undone before it."""
+        self._undo.append(self._current)
+        self._redo.clear()
+        self._current = self._encode()
+
+    def undo(self) -> bool:
+        """
+        Restores the previous position.
+
+        Returns:
+            bool: True if a position was restored, False if there was none.
+        """
+        if not self._undo:
+            return False
+        self._redo.append(self._current)
+        self._restore(self._undo.pop())
+        return True
+
+    def redo(self) -> bool:
+        """
+        Restores the position most recently undone.
+
+        Returns:
+            bool: True if a position was restored, False if there was none.
+        """
+        if not self._redo:
+            return False
+        self._undo.append(self._current)
+        self._restore(self._redo.pop())
+        return True
+
+    def snapshot(self, name: str) -> None:
+        """
+        Saves the current position under a name, replacing any snapshot of that name.
+
+        Args:
+            name (str): The snapshot name.
+        """
+        self._snapshots[name] = self._current
+
+    def restore(self, name: str) -> None:
+        """
+        Returns to a snapshot. The position left behind can be undone to, and
+        moves made from here branch off a new line of play.
+
+        Args:
+            name (str): The snapshot name.
+        """
+        state = self._snapshots.get(name)
+        if state is None:
+            raise KeyError(f"No snapshot named '{name}'.")
+        self._undo.append(self._current)
+        self._redo.clear()
+        self._restore(state)
+
+    def memory_usage(self) -> int:
+        """
+        Returns the bytes held by the stored positions, counting shared rows once.
+
+        Returns:
+            int: The approximate memory usage in bytes.
+        """
+        seen = set()
+        total = 0
+        states = [*self._undo, self._current, *self._redo, *self._snapshots.values()]
+        for state in states:
+            parts: List[object] = [state, state.cells, state.score]
+            if isinstance(state.cells, tuple):
+                parts.extend(state.cells)
+            for part in parts:
+                if id(part) not in seen:
+                    seen.add(id(part))
+                    total += sys.getsizeof(part)
+        return total
+
+    def _encode(self) -> HistoryState:
+        """Encodes the game's position, reusing the rows of the current one."""
+        if isinstance(self.game, BitboardGame2048):
+            return HistoryState(self.game.bits, self.game.score)
+        board = self.game.board
+        previous, shared = self._board, self._rows
+        rows = []
+        for x, row in enumerate(board):
+            if x < len(previous) and row == previous[x]:
+                rows.append(shared[x])
+            else:
+                rows.append(bytes(value.bit_length() - 1 if value else 0 for value in row))
+        self._board, self._rows = board, tuple(rows)
+        return HistoryState(self._rows, self.game.score)
+
+    def _restore(self, state: HistoryState) -> None:
+        """Loads a position into the game and makes it the current one."""
+        cells = state.cells
+        if isinstance(cells, int):
+            assert isinstance(self.game, BitboardGame2048)
+            self.game.load_bits(cells, state.score)
+        else:
+            board = [[_VALUES[exponent] for exponent in row] for row in cells]
+            self._board, self._rows = board, cells
+            self.game.load_board(board, state.score)
+        self._current = state
@@ -0,0 +1,216 @@
+from typing import List, Optional, Tuple
+
+from game2048.game import Game2048, game_logger, merge_line, spawn_tries
+from game2048.rng import GameRNG
+
+
+class LargeBoardGame2048(Game2048):
+    """
+    Game2048 for large boards with incremental bookkeeping.
+
+    Every cell write goes through _set, which keeps a free-list of empty cells,
+    a Fenwick tree over the empty cells, the number of adjacent equal tile pairs
+    and the tile count of every row and column up to date. Random spawns are O(1)
+    amortized: they draw the same cells as Game2048.insert_random_tile, and the
+    rare fallback to the k-th empty cell in row-major order is an O(log N) search
+    of the tree instead of a sort. Game-over checks are O(1), and moves skip empty
+    lines and write only the cells that change.
+
+    Attributes:
+        _free (List[int]): Flat indices of the empty cells, in no particular order.
+        _slot (List[int]): Position of every flat index in _free, -1 for occupied cells.
+        _tree (List[int]): 1-based Fenwick tree of the number of empty cells by flat index.
+        _pairs (int): The number of horizontally or vertically adjacent equal tiles.
+        _row_tiles (List[int]): The number of tiles in every row.
+        _col_tiles (List[int]): The number of tiles in every column.
+    """
+
+    __slots__ = ("_free", "_slot", "_tree", "_pairs", "_row_tiles", "_col_tiles")
+
+    def __init__(self, board_size: int, rng: Optional[GameRNG] = None) -> None:
+        """
+        Initializes the game board and its bookkeeping.
+
+        Args:
+            board_size (int): The size of the game board.
+            rng (Optional[GameRNG]): The spawn stream; a freshly seeded one if None.
+        """
+        self._reset_tracking(max(board_size, 0))
+        super().__init__(board_size, rng)
+
+    def _reset_tracking(self, size: int) -> None:
+        """Resets the bookkeeping to an empty board of the given size."""
+        self._free = list(range(size * size))
+        self._slot = list(range(size * size))
+        # Every cell is empty, so each node holds the length of the range it covers.
+        self._tree = [index & -index for index in range(size * size + 1)]
+        self._pairs = 0
+        self._row_tiles = [0] * size
+        self._col_tiles = [0] * size
+
+    def load_board(self, board: List[List[int]], score: int = 0) -> None:
+        """
+        Replaces the game board and score and rebuilds the bookkeeping.
+
+        Args:
+            board (List[List[int]]): The board to load, of the game's size.
+            score (int): The score to restore.
+        """
+        if len(board) != self._size or any(len(row) != self._size for row in board):
+            raise ValueError(f"Board must be {self._size}x{self._size}.")
+        self._board = [[0] * self._size for _ in range(self._size)]
+        self._reset_tracking(self._size)
+        for x, row in enumerate(board):
+            for y, value in enumerate(row):
+                self._set(x, y, value)
+        self._score = score
+
+    @property
+    def empty_count(self) -> int:
+        """Returns the number of empty cells."""
+        return len(self._free)
+
+    def _set(self, x: int, y: int, value: int) -> None:
+        """Writes one cell and updates the free-list, pair count and line counts."""
+        row = self._board[x]
+        old = row[y]
+        if old == value:
+            return
+        size = self._size
+        delta = 0
+        for neighbour in (
+            row[y - 1] if y > 0 else 0,
+            row[y + 1] if y + 1 < size else 0,
+            self._board[x - 1][y] if x > 0 else 0,
+            self._board[x + 1][y] if x + 1 < size else 0,
+        ):
+            if neighbour:
+                delta += (neighbour == value) - (neighbour == old)
+        self._pairs += delta
+        index = x * size + y
+        if old == 0:
+            # Swap-remove the cell from the free-list.
+            free = self._free
+            slot = self._slot[index]
+            last = free.pop()
+            if last != index:
+                free[slot] = last
+                self._slot[last] = slot
+            self._slot[index] = -1
+            self._row_tiles[x] += 1
+            self._col_tiles[y] += 1
+        elif value == 0:
+            self._slot[index] = len(self._free)
+            self._free.append(index)
+            self._row_tiles[x] -= 1
+            self._col_tiles[y] -= 1
+        row[y] = value
+        if old and value:
+            return
+        # Updates the Fenwick tree of empty cells, inlined since moves write many cells.
+        change = 1 if value == 0 else -1
+        tree = self._tree
+        node = index + 1
+        end = len(tree)
+        while node < end:
+            tree[node] += change
+            node += node & -node
+
+    def _kth_empty(self, k: int) -> int:
+        """Returns the flat index of the k-th empty cell (from 0) in row-major order."""
+        tree = self._tree
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = index + step
+            if node < len(tree) and tree[node] <= k:
+                index = node
+                k -= tree[node]
+            step >>= 1
+        return index
+
+    def get_empty_cells(self) -> List[Tuple[int, int]]:
+        """Returns a list of coordinates of empty cells in row-major order."""
+        return [divmod(index, self._size) for index in sorted(self._free)]
+
+    def insert_random_tile(self) -> Optional[Tuple[int, int]]:
+        """
+        Inserts a 2 or 4 into a random empty cell, drawing like Game2048.insert_random_tile.
+
+        Returns:
+            Optional[Tuple[int, int]]: The position of the new tile, or None if the board is full.
+        """
+        size = self._size
+        cells = size * size
+        slot = self._slot
+        for _ in range(spawn_tries):
+            index = self._rng.below(cells)
+            if slot[index] >= 0:
+                break
+        else:
+            if not self._free:
+                return None
+            index = self._kth_empty(self._rng.below(len(self._free)))
+        position = divmod(index, size)
+        self.insert_2_or_4(position)
+        return position
+
+    def insert_2_or_4(self, position: Tuple[int, int]) -> None:
+        """
+        Inserts a 2 or 4 in the specified position.
+
+        Args:
+            position (Tuple[int, int]): The (row, column) position for insertion.
+        """
+        x, y = position
+        self._set(x, y, self._rng.tile())
+
+    def move(self, direction: str) -> bool:
+        """
+        Moves the tiles, writing only the cells that change.
+
+        Args:
+            direction (str): The direction to move ('left', 'right', 'up', 'down').
+
+        Returns:
+            bool: True if the board changed, False otherwise.
+        """
+        size = self._size
+        board = self._board
+        horizontal = direction in {"left", "right"}
+        reverse = direction in {"right", "down"}
+        tiles = self._row_tiles if horizontal else self._col_tiles
+        changed = False
+        for k in range(size):
+            if not tiles[k]:
+                continue
+            line = board[k][:] if horizontal else [board[row][k] for row in range(size)]
+            if reverse:
+                line.reverse()
+            merged, gain = merge_line(line)
+            if merged == line:
+                continue
+            changed = True
+            self._score += gain
+            if reverse:
+                line.reverse()
+                merged.reverse()
+            for i in range(size):
+                if merged[i] != line[i]:
+                    if horizontal:
+                        self._set(k, i, merged[i])
+                    else:
+                        self._set(i, k, merged[i])
+        return changed
+
+    def is_game_over(self) -> bool:
+        """
+        Checks if there are no valid moves left in O(1).
+
+        Returns:
+            bool: True if the game is over, False otherwise.
+        """
+        if self._free or self._pairs:
+            return False
+        game_logger.warning("Game over detected.")
+        return True
@@ -1,9 +1,11 @@
-import random
-from typing import Dict, Tuple
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 
 import pygame
 
 from game2048.game import Game2048
+from game2048.history import GameHistory
 
 # Game Settings
 colors: Dict[int, Tuple[int, int, int]] = {
@@ -22,6 +24,14 @@ colors: Dict[int, Tuple[int, int, int]] = {
 }
 
 black = (0, 0, 0)
+header_height = 110
+
+key_directions: Dict[int, str] = {
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_UP: "up",
+    pygame.K_DOWN: "down",
+}
 
 
 class GameManager:
@@ -29,23 +39,45 @@ class GameManager:
     A class to manage the graphical interface and gameplay loop for the 2048 game.
     """
 
-    def __init__(self, game: Game2048) -> None:
+    def __init__(
+        self,
+        game: Game2048,
+        fps: int = 60,
+        wait_for_events: bool = True,
+        history: Optional[GameHistory] = None,
+    ) -> None:
         """
         Initialize the GameManager.
 
         Args:
             game (Game2048): The game logic instance.
+            fps (int): The maximum number of frames drawn per second, 0 for no cap.
+            wait_for_events (bool): Block on pygame.event.wait between frames instead of
+                polling, so an idle player costs no CPU.
+            history (Optional[GameHistory]): The game's history; when given, moves are
+                recorded and U and R undo and redo them.
         """
         self.game = game
+        self.history = history
+        self.fps = fps
+        self.wait_for_events = wait_for_events
+        self.needs_redraw = True
         self.size_block = max(20, 600 // self.game.size)  # Dynamically calculate block size
         self.margin = max(5, self.size_block // 10)  # Margin proportional to block size
         self.width = self.game.size * self.size_block + (self.game.size + 1) * self.margin
-        self.height = self.width + 110
+        self.height = self.width + header_height
 
         pygame.init()
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("game2048")
+        # Fonts are loaded once; tile surfaces are rendered once per value and block size.
         self.font = pygame.font.Font(None, self.size_block // 2)
+        self.font_score = pygame.font.SysFont("Arial", self.size_block // 3)
+        self.font_game_over = pygame.font.SysFont("Arial", self.size_block // 2)
+        self._tiles: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._drawn_board: Optional[List[List[int]]] = None
+        self._drawn_score: Optional[int] = None
+        self.frame_times: Deque[float] = deque(maxlen=600)
 
     @staticmethod
     def get_color(value: int) -> Tuple[int, int, int]:
@@ -60,75 +92,179 @@ class GameManager:
         """
         return colors.get(value, (255 - min(value, 255), 255 - (min(value, 255) // 2), 200))
 
+    @property
+    def frame_time(self) -> float:
+        """Returns the mean time in seconds spent drawing the recent frames."""
+        return sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
+
+    def invalidate(self) -> None:
+        """Forces the next draw_board call to redraw the whole screen."""
+        self._drawn_board = None
+        self._drawn_score = None
+        self.needs_redraw = True
+
+    def get_tile(self, value: int) -> pygame.Surface:
+        """
+        Get the pre-rendered surface of a tile, rendering it on first use.
+
+        Args:
+            value (int): The tile value.
+
+        Returns:
+            pygame.Surface: The tile surface of the current block size.
+        """
+        key = (value, self.size_block)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = pygame.Surface((self.size_block, self.size_block))
+            tile.fill(self.get_color(value))
+            if value != 0:
+                text = self.font.render(str(value), True, black)
+                tile.blit(text, text.get_rect(center=(self.size_block // 2, self.size_block // 2)))
+            self._tiles[key] = tile
+        return tile
+
+    def get_cell_rect(self, row: int, col: int) -> pygame.Rect:
+        """
+        Get the screen rectangle of a board cell.
+
+        Args:
+            row (int): The cell row.
+            col (int): The cell column.
+
+        Returns:
+            pygame.Rect: The rectangle covered by the cell.
+        """
+        w = col * self.size_block + (col + 1) * self.margin
+        h = row * self.size_block + (row + 1) * self.margin + header_height
+        return pygame.Rect(w, h, self.size_block, self.size_block)
+
     def draw_board(self) -> None:
         """
         Draw the game board on the screen.
-        """
-        self.screen.fill(black)
-        font_score = pygame.font.SysFont("Arial", self.size_block // 3)
-        text_score = font_score.render(f"Score: {self.game.score}", True, colors[256])
-        self.screen.blit(text_score, (20, 35))
 
+        Only the cells and the score that changed since the last frame are redrawn
+        and pushed to the display.
+        """
+        start = time.perf_counter()
+        board = self.game.board
+        score = self.game.score
+        dirty: List[pygame.Rect] = []
+        drawn = self._drawn_board
+        full = drawn is None
+        if full:
+            self.screen.fill(black)
+        if full or score != self._drawn_score:
+            header = pygame.Rect(0, 0, self.width, header_height)
+            self.screen.fill(black, header)
+            text_score = self.font_score.render(f"Score: {score}", True, colors[256])
+            self.screen.blit(text_score, (20, 35))
+            dirty.append(header)
         for row in range(self.game.size):
             for col in range(self.game.size):
-                value = self.game.board[row][col]
-                w = col * self.size_block + (col + 1) * self.margin
-                h = row * self.size_block + (row + 1) * self.margin + 110
-                pygame.draw.rect(
-                    self.screen, self.get_color(value), (w, h, self.size_block, self.size_block)
-                )
-                if value != 0:
-                    text = self.font.render(str(value), True, black)
-                    text_rect = text.get_rect(
-                        center=(w + self.size_block // 2, h + self.size_block // 2)
-                    )
-                    self.screen.blit(text, text_rect)
-        pygame.display.update()
+                value = board[row][col]
+                if drawn is None or drawn[row][col] != value:
+                    rect = self.get_cell_rect(row, col)
+                    self.screen.blit(self.get_tile(value), rect)
+                    dirty.append(rect)
+        self._drawn_board = board
+        self._drawn_score = score
+        if full:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+        self.frame_times.append(time.perf_counter() - start)
 
     def display_game_over(self) -> None:
         """
         Display the 'Game Over' message.
         """
-        font_game_over = pygame.font.SysFont("Arial", self.size_block // 2)
-        text_game_over = font_game_over.render("Game Over!", True, (255, 0, 0))
+        text_game_over = self.font_game_over.render("Game Over!", True, (255, 0, 0))
         text_rect = text_game_over.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(text_game_over, text_rect)
-        pygame.display.update()
+        pygame.display.update(text_rect)
+        # The message covers some cells, so the next frame has to repaint everything.
+        self.invalidate()
 
-    def handle_events(self) -> bool:
+    def handle_events(self, events: Optional[List[pygame.event.Event]] = None) -> bool:
         """
-        Handle user input events.
+        Handle user input events and flag a redraw when the game state changes.
+
+        Args:
+            events (Optional[List[pygame.event.Event]]): The events to handle,
+                the pending events from the queue by default.
 
         Returns:
             bool: False if the game should exit, True otherwise.
         """
-        for event in pygame.event.get():
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.invalidate()
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT and self.game.move_left():
-                    self.game.insert_2_or_4(random.choice(self.game.get_empty_cells()))
-                elif event.key == pygame.K_RIGHT and self.game.move_right():
-                    self.game.insert_2_or_4(random.choice(self.game.get_empty_cells()))
-                elif event.key == pygame.K_UP and self.game.move_up():
-                    self.game.insert_2_or_4(random.choice(self.game.get_empty_cells()))
-                elif event.key == pygame.K_DOWN and self.game.move_down():
-                    self.game.insert_2_or_4(random.choice(self.game.get_empty_cells()))
+                direction = key_directions.get(event.key)
+                if direction is not None:
+                    self.needs_redraw |= self.move(direction)
+                elif self.history is not None and event.key == pygame.K_u:
+                    self.needs_redraw |= self.history.undo()
+                elif self.history is not None and event.key == pygame.K_r:
+                    self.needs_redraw |= self.history.redo()
         return True
 
+    def move(self, direction: str) -> bool:
+        """
+        Move the game and spawn a tile, through the history if there is one.
+
+        Args:
+            direction (str): The direction to move ('left', 'right', 'up', 'down').
+
+        Returns:
+            bool: True if the board changed, False otherwise.
+        """
+        if self.history is not None:
+            return self.history.move(direction)
+        if not self.game.move(direction):
+            return False
+        self.game.insert_random_tile()
+        return True
+
+    def next_events(self, clock: pygame.time.Clock) -> List[pygame.event.Event]:
+        """
+        Wait for the next batch of events, pacing frames to the FPS cap.
+
+        Args:
+            clock (pygame.time.Clock): The clock used for frame pacing.
+
+        Returns:
+            List[pygame.event.Event]: The events to handle.
+        """
+        if self.fps:
+            clock.tick(self.fps)
+        if self.wait_for_events:
+            # Sleeps in SDL until input arrives, then drains whatever queued up meanwhile.
+            return [pygame.event.wait()] + pygame.event.get()
+        return pygame.event.get()
+
     def run(self) -> None:
         """
         Run the main game loop.
+
+        The board is redrawn and checked for game over only after the game state
+        changed; between frames the loop blocks on input or sleeps to the FPS cap.
         """
         try:
             running = True
+            clock = pygame.time.Clock()
             while running:
-                self.draw_board()
-                if self.game.is_game_over():
-                    self.display_game_over()
-                    pygame.time.wait(2000)
-                    break
-                running = self.handle_events()
+                if self.needs_redraw:
+                    self.needs_redraw = False
+                    self.draw_board()
+                    if self.game.is_game_over():
+                        self.display_game_over()
+                        pygame.time.wait(2000)
+                        break
+                running = self.handle_events(self.next_events(clock))
         except Exception as e:
             print(f"An error occurred: {e}")
         finally:
@@ -0,0 +1,412 @@
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from game2048 import bitboard
+from game2048.bitboard import BitboardGame2048
+from game2048.game import DIRECTIONS, Game2048
+from game2048.rng import GameRNG
+from game2048.selfplay import GameResult, SelfPlayStats
+from game2048.symmetry import transforms
+
+# Tuples of cells, as row-major indices 4 * row + col, whose tile exponents index a
+# weight table. default_tuples are the four 6-tuples of Szubert and Jaskowski,
+# "Temporal Difference Learning of N-Tuple Networks for the Game 2048" (2014);
+# their tables take 4 * 16 ** 6 floats, 256 MiB. small_tuples take 1.25 MiB,
+# train faster and play weaker.
+default_tuples: List[Tuple[int, ...]] = [
+    (0, 1, 2, 3, 4, 5),
+    (4, 5, 6, 7, 8, 9),
+    (0, 1, 2, 4, 5, 6),
+    (4, 5, 6, 8, 9, 10),
+]
+small_tuples: List[Tuple[int, ...]] = [
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+    (5, 6, 9, 10),
+]
+
+# Checkpoint layout: MAGIC, a _HEADER (games trained, tuple count), every tuple as
+# its length byte and cell bytes, then every weight table as little-endian float32.
+MAGIC = b"2048NT01"
+_HEADER = struct.Struct("<QI")
+
+# Bit ranges of one tuple read in a single shift and mask: cells that are adjacent
+# in the packed board, as (board shift, mask, shift within the table index).
+_Run = Tuple[int, int, int]
+
+
+def _runs(cells: Tuple[int, ...]) -> List[_Run]:
+    """Splits a tuple into runs of consecutive cells."""
+    runs: List[_Run] = []
+    start = 0
+    for position in range(1, len(cells) + 1):
+        if position == len(cells) or cells[position] != cells[position - 1] + 1:
+            length = position - start
+            runs.append((4 * cells[start], (1 << (4 * length)) - 1, 4 * start))
+            start = position
+    return runs
+
+
+class NTupleNetwork:
+    """
+    A board evaluator summing the weights of n-tuples over all 8 board symmetries.
+
+    Each tuple owns a flat table of 16 ** n float32 weights indexed by the tile
+    exponents of its cells, read straight out of the packed 4x4 board. Sharing
+    a table across the symmetric boards (game2048.symmetry.transforms) makes the
+    value symmetric and trains every weight 8 times as often.
+
+    Attributes:
+        tuples (List[Tuple[int, ...]]): The cells of every tuple.
+        tables (List[array]): The weight tables, as array('f') for fast scalar reads.
+        games (int): The number of games the network was trained on.
+    """
+
+    __slots__ = ("tuples", "tables", "games", "_features")
+
+    def __init__(self, tuples: Optional[Sequence[Sequence[int]]] = None) -> None:
+        """
+        Creates a network with all weights zero.
+
+        Args:
+            tuples (Optional[Sequence[Sequence[int]]]): The cells of every tuple,
+                default_tuples if None.
+        """
+        self.tuples = [tuple(cells) for cells in (default_tuples if tuples is None else tuples)]
+        if not self.tuples:
+            raise ValueError("A network needs at least one tuple.")
+        for cells in self.tuples:
+            if not 1 <= len(cells) <= 8 or len(set(cells)) != len(cells):
+                raise ValueError(f"Tuple {cells} must hold 1 to 8 distinct cells.")
+            if not all(0 <= cell < 16 for cell in cells):
+                raise ValueError(f"Tuple {cells} has cells outside the 4x4 board.")
+        self.tables = [array("f", bytes(4 << (4 * len(cells)))) for cells in self.tuples]
+        self.games = 0
+        self._features = [(table, _runs(cells)) for table, cells in zip(self.tables, self.tuples)]
+
+    def arrays(self) -> List[npt.NDArray[np.float32]]:
+        """Returns NumPy views of the weight tables, sharing their memory."""
+        return [np.frombuffer(table, dtype=np.float32) for table in self.tables]
+
+    def value(self, packed: int) -> float:
+        """
+        Evaluates a packed board.
+
+        Args:
+            packed (int): The packed board, usually an afterstate.
+
+        Returns:
+            float: The sum of the tuple weights over the 8 symmetric boards.
+        """
+        total = 0.0
+        for board in transforms(packed):
+            for table, runs in self._features:
+                index = 0
+                for shift, mask, offset in runs:
+                    index |= ((board >> shift) & mask) << offset
+                total += table[index]
+        return total
+
+    def update(self, packed: int, delta: float) -> None:
+        """
+        Adds delta to every weight that makes up a board's value.
+
+        Args:
+            packed (int): The packed board.
+            delta (float): The change per weight.
+        """
+        for board in transforms(packed):
+            for table, runs in self._features:
+                index = 0
+                for shift, mask, offset in runs:
+                    index |= ((board >> shift) & mask) << offset
+                table[index] += delta
+
+    def best_move(self, packed: int) -> Optional[Tuple[str, int, int, float]]:
+        """
+        Picks the move maximizing its score gain plus the value of its afterstate.
+
+        Args:
+            packed (int): The packed board.
+
+        Returns:
+            Optional[Tuple[str, int, int, float]]: The direction, afterstate, gain and
+                afterstate value of the best move, or None if no move changes the board.
+        """
+        best = None
+        best_total = 0.0
+        for direction, move in bitboard.MOVES.items():
+            after, gain = move(packed)
+            if after == packed:
+                continue
+            value = self.value(after)
+            if best is None or gain + value > best_total:
+                best = (direction, after, gain, value)
+                best_total = gain + value
+        return best
+
+    def save(self, path: str) -> None:
+        """
+        Writes a checkpoint, replacing the file atomically.
+
+        Args:
+            path (str): The checkpoint file.
+        """
+        with open(f"{path}.tmp", "wb") as checkpoint:
+            checkpoint.write(MAGIC + _HEADER.pack(self.games, len(self.tuples)))
+            for cells in self.tuples:
+                checkpoint.write(bytes([len(cells), *cells]))
+            for table in self.tables:
+                if sys.byteorder == "little":
+                    table.tofile(checkpoint)
+                else:
+                    swapped = array("f", table)
+                    swapped.byteswap()
+                    swapped.tofile(checkpoint)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "NTupleNetwork":
+        """
+        Reads a checkpoint written by save.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Returns:
+            NTupleNetwork: The network with its tuples, weights and game count.
+        """
+        with open(path, "rb") as checkpoint:
+            head = checkpoint.read(len(MAGIC) + _HEADER.size)
+            if head[: len(MAGIC)] != MAGIC or len(head) < len(MAGIC) + _HEADER.size:
+                raise ValueError(f"{path} is not an n-tuple network checkpoint.")
+            games, count = _HEADER.unpack_from(head, len(MAGIC))
+            tuples = []
+            for _ in range(count):
+                length = checkpoint.read(1)
+                cells = checkpoint.read(length[0]) if length else b""
+                if not length or len(cells) != length[0]:
+                    raise ValueError(f"Truncated checkpoint {path}.")
+                tuples.append(tuple(cells))
+            network = cls(tuples)
+            network.games = games
+            for table in network.tables:
+                size = len(table)
+                del table[:]
+                try:
+                    table.fromfile(checkpoint, size)
+                except EOFError:
+                    raise ValueError(f"Truncated checkpoint {path}.") from None
+                if sys.byteorder != "little":
+                    table.byteswap()
+            if checkpoint.read(1):
+                raise ValueError(f"Trailing data in checkpoint {path}.")
+        return network
+
+
+class TDTrainer:
+    """
+    Trains a network by self-play with temporal-difference learning on afterstates.
+
+    Every move is chosen greedily by the network. After the next move is chosen,
+    the previous afterstate's value moves towards the next move's gain plus its
+    afterstate value; the last afterstate of a game moves towards 0 (TD(0) as in
+    Szubert and Jaskowski). Games are played on packed boards with the
+    BitboardGame2048 spawn rules.
+    """
+
+    def __init__(
+        self,
+        network: NTupleNetwork,
+        learning_rate: float = 0.0025,
+        seed: int = 0,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10_000,
+    ) -> None:
+        """
+        Initialize the TDTrainer.
+
+        Args:
+            network (NTupleNetwork): The network to train in place.
+            learning_rate (float): The step size per weight.
+            seed (int): The run seed; the network's n-th training game uses seed + n,
+                so a resumed run continues with new games.
+            checkpoint_path (Optional[str]): Where checkpoints are saved, none if None.
+            checkpoint_every (int): The number of games between checkpoints.
+        """
+        if checkpoint_every < 1:
+            raise ValueError("Checkpoint interval must be at least 1 game.")
+        self.network = network
+        self.learning_rate = learning_rate
+        self.seed = seed
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.stats = SelfPlayStats(0, 0, 0.0)
+
+    def play(self, seed: int) -> Tuple[int, int, int]:
+        """
+        Plays and learns from one game.
+
+        Args:
+            seed (int): The game's spawn seed.
+
+        Returns:
+            Tuple[int, int, int]: The score, the largest tile and the number of moves.
+        """
+        network = self.network
+        rate = self.learning_rate
+        game = BitboardGame2048(bitboard.BOARD_SIZE, GameRNG(seed))
+        score = moves = 0
+        previous = None
+        choice = network.best_move(game.bits)
+        while choice is not None:
+            _, after, gain, value = choice
+            if previous is not None:
+                network.update(previous, rate * (gain + value - network.value(previous)))
+            previous = after
+            score += gain
+            moves += 1
+            game.load_bits(after, score)
+            game.insert_random_tile()
+            choice = network.best_move(game.bits)
+        if previous is not None:
+            network.update(previous, -rate * network.value(previous))
+        max_tile = max(max(row) for row in game.board)
+        return score, max_tile, moves
+
+    def run(self, games: int) -> Iterator[GameResult]:
+        """
+        Trains on games and yields every result as soon as its game finishes.
+
+        A checkpoint is saved every checkpoint_every games and after the last one.
+        The aggregate throughput is available in ``stats`` while and after iterating.
+
+        Args:
+            games (int): The number of games to train on.
+        """
+        start = time.perf_counter()
+        moves = 0
+        try:
+            for game_index in range(games):
+                game_start = time.perf_counter()
+                seed = self.seed + self.network.games
+                score, max_tile, game_moves = self.play(seed)
+                self.network.games += 1
+                moves += game_moves
+                now = time.perf_counter()
+                self.stats = SelfPlayStats(game_index + 1, moves, now - start)
+                if self.checkpoint_path and self.network.games % self.checkpoint_every == 0:
+                    self.network.save(self.checkpoint_path)
+                yield GameResult(
+                    game_index, seed, score, max_tile, game_moves, game_moves, now - game_start
+                )
+        finally:
+            if self.checkpoint_path and self.network.games % self.checkpoint_every:
+                self.network.save(self.checkpoint_path)
+
+
+class NTuplePolicy:
+    """
+    A self-play policy playing the greedy move of a saved network.
+
+    The checkpoint is loaded on the first move, in whichever process plays it,
+    so the policy pickles as its path and can be handed to a SelfPlayRunner pool.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): The network checkpoint.
+        """
+        self.path = path
+        self.network: Optional[NTupleNetwork] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.path = state["path"]
+        self.network = None
+
+    def __call__(self, game: Game2048, rng: random.Random) -> str:
+        if self.network is None:
+            self.network = NTupleNetwork.load(self.path)
+        bits: Optional[int] = getattr(game, "bits", None)
+        choice = self.network.best_move(bitboard.pack(game.board) if bits is None else bits)
+        return rng.choice(DIRECTIONS) if choice is None else choice[0]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point: ``python -m game2048.ntuple``.
+
+    ``train`` trains a network, resuming from its checkpoint if the file exists;
+    ``play`` plays games with a trained network on a process pool.
+    """
+    parser = argparse.ArgumentParser(description="Train and play an n-tuple network.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="train by TD learning, resuming from PATH")
+    train.add_argument("path", help="checkpoint file")
+    train.add_argument("--games", type=int, default=100_000, help="number of training games")
+    train.add_argument("--learning-rate", type=float, default=0.0025, help="step size per weight")
+    train.add_argument("--seed", type=int, default=0, help="run seed")
+    train.add_argument("--tuples", choices=("default", "small"), default="default")
+    train.add_argument("--checkpoint-every", type=int, default=10_000, help="games per checkpoint")
+    train.add_argument("--report-every", type=int, default=1000, help="games per progress line")
+    play = commands.add_parser("play", help="play greedily with the network at PATH")
+    play.add_argument("path", help="checkpoint file")
+    play.add_argument("--games", type=int, default=100, help="number of games to play")
+    play.add_argument("--workers", type=int, default=None, help="worker processes")
+    play.add_argument("--seed", type=int, default=0, help="run seed, game i uses seed + i")
+    args = parser.parse_args(argv)
+
+    if args.command == "play":
+        from game2048.selfplay import SelfPlayRunner
+
+        runner = SelfPlayRunner(
+            args.games, NTuplePolicy(args.path), args.workers, args.seed, engine="bitboard"
+        )
+        finals = sorted(result.score for result in runner.run())
+        stats = runner.stats
+        print(
+            f"{stats.games} games in {stats.seconds:.2f}s ({stats.moves_per_sec:.0f} moves/s), "
+            f"mean score {sum(finals) / max(len(finals), 1):.0f}, "
+            f"median {finals[len(finals) // 2] if finals else 0}"
+        )
+        return
+
+    if os.path.exists(args.path):
+        network = NTupleNetwork.load(args.path)
+        print(f"Resuming {args.path} after {network.games} games.")
+    else:
+        network = NTupleNetwork(default_tuples if args.tuples == "default" else small_tuples)
+    trainer = TDTrainer(network, args.learning_rate, args.seed, args.path, args.checkpoint_every)
+    scores: List[int] = []
+    reached = 0
+    for result in trainer.run(args.games):
+        scores.append(result.score)
+        reached += result.max_tile >= 2048
+        if len(scores) == args.report_every:
+            stats = trainer.stats
+            print(
+                f"{network.games} games: mean score {sum(scores) / len(scores):.0f}, "
+                f"2048 reached {reached / len(scores):.1%}, {stats.games_per_sec:.1f} games/s, "
+                f"{stats.moves_per_sec:.0f} moves/s"
+            )
+            scores.clear()
+            reached = 0
+
+
+if __name__ == "__main__":
+    main()
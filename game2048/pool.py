@@ -0,0 +1,241 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of database connections with a minimum and maximum size.
+
+    Connections are created with the given factory, handed out with ``connection()``
+    and returned for reuse. Idle connections are health checked before being handed
+    out again and replaced when they are broken.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        check_interval: float = 30.0,
+    ) -> None:
+        """
+        Create the pool and open its minimum number of connections.
+
+        :param connect: Factory returning a new DB-API connection.
+        :param min_size: Number of connections kept open while the pool is alive;
+            discarded connections are replaced until the pool is back at this size.
+        :param max_size: Maximum number of connections open at the same time.
+        :param timeout: Seconds to wait for a free connection before giving up.
+        :param check_interval: Idle seconds after which a connection is probed
+            with ``SELECT 1`` before reuse.
+        """
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min {min_size}, max {max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._lock = threading.Condition()
+        # Idle connections with the time they were returned, most recent last.
+        self._idle: List[Tuple[Any, float]] = []
+        self._size = 0
+        self._closed = False
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.reconnects = 0
+        self.peak_in_use = 0
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or in use."""
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        """Number of connections currently borrowed."""
+        return self._size - len(self._idle)
+
+    @property
+    def utilization(self) -> float:
+        """Share of the maximum pool size currently borrowed."""
+        return self.in_use / self.max_size
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Snapshot the pool utilization metrics.
+
+        :return: Mapping of metric name to value.
+        """
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "utilization": self.utilization,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "timeouts": self.timeouts,
+                "reconnects": self.reconnects,
+            }
+
+    def getconn(self) -> Any:
+        """
+        Borrow a healthy connection, opening one if the pool is below its maximum size.
+
+        :return: A connection that must be given back with ``putconn``.
+        :raises PoolTimeout: If every connection stays busy for longer than the timeout.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            if not self._idle and self._size >= self.max_size:
+                self.waits += 1
+                start = time.monotonic()
+                available = self._lock.wait_for(
+                    lambda: self._closed or self._idle or self._size < self.max_size,
+                    self.timeout,
+                )
+                self.wait_seconds += time.monotonic() - start
+                if not available:
+                    self.timeouts += 1
+                    raise PoolTimeout(f"No connection available after {self.timeout}s")
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+            if self._idle:
+                connection, returned_at = self._idle.pop()
+            else:
+                connection, returned_at = None, 0.0
+            # Reserve the slot before releasing the lock to connect or probe.
+            if connection is None:
+                self._size += 1
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            if connection is None:
+                return self._connect()
+            if not self._healthy(connection, time.monotonic() - returned_at):
+                self._discard(connection)
+                with self._lock:
+                    self.reconnects += 1
+                logger.warning("Replacing a broken pooled database connection.")
+                return self._connect()
+            return connection
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+    def putconn(self, connection: Any, discard: bool = False) -> None:
+        """
+        Give a borrowed connection back to the pool.
+
+        :param connection: The connection returned by ``getconn``.
+        :param discard: Close the connection instead of reusing it, e.g. after
+            a connection-level error.
+        """
+        if discard or self._closed or getattr(connection, "closed", False):
+            self._discard(connection)
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            self._refill()
+            return
+        with self._lock:
+            self._idle.append((connection, time.monotonic()))
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of a ``with`` block.
+
+        The connection is discarded instead of reused if it was closed while borrowed.
+        """
+        connection = self.getconn()
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+
+    def close(self) -> None:
+        """
+        Close every idle connection and refuse further checkouts. Borrowed
+        connections are closed when they are given back.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for connection, _ in idle:
+            self._discard(connection)
+        logger.info("Connection pool closed.")
+
+    def _refill(self) -> None:
+        """Opens idle connections until the pool is back at its minimum size."""
+        while True:
+            with self._lock:
+                if self._closed or self._size >= self.min_size:
+                    return
+                # Reserve the slot before releasing the lock to connect.
+                self._size += 1
+            try:
+                connection = self._connect()
+            except Exception as e:
+                with self._lock:
+                    self._size -= 1
+                    self._lock.notify()
+                logger.warning(f"Could not refill the connection pool: {e}")
+                return
+            with self._lock:
+                if not self._closed:
+                    self.reconnects += 1
+                    self._idle.append((connection, time.monotonic()))
+                    self._lock.notify()
+                    continue
+                self._size -= 1
+            self._discard(connection)
+            return
+
+    def _open(self) -> Any:
+        connection = self._connect()
+        self._size += 1
+        return connection
+
+    def _healthy(self, connection: Any, idle_seconds: float) -> bool:
+        if getattr(connection, "closed", False):
+            return False
+        if idle_seconds < self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
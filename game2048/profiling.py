@@ -0,0 +1,288 @@
+import cProfile
+import functools
+import importlib.abc
+import importlib.machinery
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Storage operations timed on every backend. iter_rows is left out because calling
+# a generator only creates it; its rows are fetched later.
+_queries = [
+    "create_table",
+    "update_or_create_row",
+    "submit_scores",
+    "get_row",
+    "get_top",
+    "get_page",
+    "get_rank",
+    "get_all_rows",
+]
+
+# Methods timed by enable(), as (module, class, method). Engines that override a
+# method are listed separately, since wrapping the base class does not reach them.
+default_targets: List[Tuple[str, str, str]] = [
+    ("game2048.game", "Game2048", "move"),
+    ("game2048.game", "Game2048", "_merge"),
+    ("game2048.game", "Game2048", "get_empty_cells"),
+    ("game2048.game", "Game2048", "is_game_over"),
+    ("game2048.bitboard", "BitboardGame2048", "move"),
+    ("game2048.bitboard", "BitboardGame2048", "get_empty_cells"),
+    ("game2048.bitboard", "BitboardGame2048", "is_game_over"),
+    ("game2048.large", "LargeBoardGame2048", "move"),
+    ("game2048.large", "LargeBoardGame2048", "get_empty_cells"),
+    ("game2048.large", "LargeBoardGame2048", "is_game_over"),
+    ("game2048.manager", "GameManager", "draw_board"),
+    ("game2048.manager", "GameManager", "handle_events"),
+    *[("game2048.storage", "SQLiteStorage", query) for query in _queries],
+    *[("game2048.db", "DatabaseManager", query) for query in _queries],
+    ("game2048.db", "DatabaseManager", "export_scores"),
+    ("game2048.db", "DatabaseManager", "import_scores"),
+]
+
+
+class LatencyHistogram:
+    """
+    Call latencies in logarithmic buckets with eight buckets per power of two.
+
+    Percentiles are read from the bucket bounds, so they are accurate to within
+    an eighth of the value while memory stays constant however many calls are
+    recorded.
+
+    Attributes:
+        count (int): The number of recorded calls.
+        total_ns (int): The summed latency in nanoseconds.
+        max_ns (int): The slowest call in nanoseconds.
+    """
+
+    __slots__ = ("count", "total_ns", "max_ns", "_buckets")
+
+    def __init__(self) -> None:
+        """Creates an empty histogram."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Discards every recorded call."""
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        # (shift, top four bits) -> count; the bucket holds values up to (top + 1) << shift.
+        self._buckets: Dict[Tuple[int, int], int] = {}
+
+    def record(self, ns: int) -> None:
+        """
+        Adds one call.
+
+        Args:
+            ns (int): The call's latency in nanoseconds.
+        """
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        shift = max(ns.bit_length() - 4, 0)
+        key = (shift, ns >> shift)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        """Returns the mean latency in seconds."""
+        return self.total_ns / self.count / 1e9 if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns a latency percentile in seconds.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            float: The upper bound of the bucket holding the percentile, at most the maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for shift, top in sorted(self._buckets):
+            seen += self._buckets[shift, top]
+            if seen >= rank:
+                return min((top + 1) << shift, self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+
+# Label -> histogram of every timed method, and the methods replaced by enable().
+_histograms: Dict[str, LatencyHistogram] = {}
+_originals: Dict[Tuple[type, str], Callable[..., Any]] = {}
+# Module -> (class, method) of the targets waiting for their module to be imported.
+_pending: Dict[str, List[Tuple[str, str]]] = {}
+
+
+def _timed(function: Callable[..., Any], histogram: LatencyHistogram) -> Callable[..., Any]:
+    """Wraps a function to record the latency of every call."""
+    clock = time.perf_counter_ns
+    record = histogram.record
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(clock() - start)
+
+    return wrapper
+
+
+def _wrap(module: ModuleType, class_name: str, method: str) -> None:
+    """Replaces one method of a loaded module with its timed version."""
+    cls = getattr(module, class_name, None)
+    if cls is None or (cls, method) in _originals or method not in vars(cls):
+        return
+    original = vars(cls)[method]
+    histogram = _histograms.setdefault(f"{class_name}.{method}", LatencyHistogram())
+    _originals[cls, method] = original
+    setattr(cls, method, _timed(original, histogram))
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Loads a module with its usual loader, then wraps the pending targets in it."""
+
+    def __init__(self, loader: importlib.abc.Loader) -> None:
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        # get_source, get_code, etc. for tracebacks and tools that inspect the module.
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        for class_name, method in _pending.pop(module.__name__, []):
+            _wrap(module, class_name, method)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Hooks the import of modules with pending targets, so they are timed once loaded."""
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        if fullname not in _pending:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec: Optional[importlib.machinery.ModuleSpec] = finder.find_spec(
+                fullname, path, target
+            )
+            if spec is not None:
+                if spec.loader is not None:
+                    spec.loader = _TimingLoader(spec.loader)
+                return spec
+        return None
+
+
+_finder = _TimingFinder()
+
+
+def enable(targets: Optional[List[Tuple[str, str, str]]] = None) -> None:
+    """
+    Starts timing the hot-path methods.
+
+    Methods are wrapped in place, so while instrumentation is off the original
+    methods run untouched and cost nothing extra. Methods of modules that are not
+    imported yet are wrapped when something imports them, so enabling the timers
+    never loads pygame or the database driver on its own.
+
+    Args:
+        targets (Optional[List[Tuple[str, str, str]]]): (module, class, method) of the
+            methods to time, default_targets if None.
+    """
+    for module_name, class_name, method in default_targets if targets is None else targets:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            _wrap(module, class_name, method)
+        else:
+            _pending.setdefault(module_name, []).append((class_name, method))
+    if _pending and _finder not in sys.meta_path:
+        sys.meta_path.insert(0, _finder)
+
+
+def disable() -> None:
+    """Restores the original methods; the recorded latencies are kept."""
+    _pending.clear()
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+    while _originals:
+        (cls, method), original = _originals.popitem()
+        setattr(cls, method, original)
+
+
+def is_enabled() -> bool:
+    """Returns True while methods are being timed or waiting for their module."""
+    return bool(_originals or _pending)
+
+
+def reset() -> None:
+    """Discards the recorded latencies."""
+    for histogram in _histograms.values():
+        histogram.clear()
+
+
+def stats() -> Dict[str, LatencyHistogram]:
+    """Returns the histograms of the methods that were called, by label."""
+    return {label: histogram for label, histogram in _histograms.items() if histogram.count}
+
+
+def summary() -> str:
+    """
+    Formats the recorded latencies as a table, slowest total first.
+
+    Returns:
+        str: One line per called method with calls, total time, mean, p50, p99 and max.
+    """
+    lines = [
+        f"{'method':<36} {'calls':>9} {'total ms':>10} {'mean us':>9} "
+        f"{'p50 us':>9} {'p99 us':>9} {'max us':>10}"
+    ]
+    for label, histogram in sorted(stats().items(), key=lambda item: -item[1].total_ns):
+        lines.append(
+            f"{label:<36} {histogram.count:>9} {histogram.total_ns / 1e6:>10.1f} "
+            f"{histogram.mean * 1e6:>9.1f} {histogram.percentile(0.5) * 1e6:>9.1f} "
+            f"{histogram.percentile(0.99) * 1e6:>9.1f} {histogram.max_ns / 1e3:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_session(path: str) -> Iterator[None]:
+    """
+    Profiles the enclosed code with cProfile and the method timers.
+
+    At exit the cProfile statistics are written to path, for pstats or snakeviz,
+    and the latency summary is printed.
+
+    Args:
+        path (str): The file receiving the cProfile statistics.
+    """
+    enable()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        disable()
+        profiler.dump_stats(path)
+        print(f"cProfile statistics written to {path}")
+        print(summary())
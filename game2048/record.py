@@ -0,0 +1,341 @@
+import mmap
+import os
+import struct
+from typing import Any, BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from game2048 import bitboard
+from game2048.game import DIRECTIONS, Game2048
+
+# File layout: MAGIC, then one record per game, appended back to back. A record is
+# a _HEADER (board size, initial tile count, step count, final score), the final
+# board as one exponent byte per cell, and a bit-packed payload. The payload holds
+# one (cell, value bit) field per initial tile, then one (move, cell, value bit)
+# field per step: a move that changed the board and the tile spawned after it.
+# Cells are row-major indices; the value bit is 0 for a 2 and 1 for a 4.
+MAGIC = b"2048REC1"
+_HEADER = struct.Struct("<BBIQ")
+
+
+def cell_bits(board_size: int) -> int:
+    """
+    Returns the number of bits needed to store a cell index.
+
+    Args:
+        board_size (int): The size of the game board.
+    """
+    return max(1, (board_size * board_size - 1).bit_length())
+
+
+def _to_bits(fields: List[int], width: int) -> npt.NDArray[np.uint8]:
+    """Spells out fields of a fixed bit width, most significant bit first."""
+    values = np.array(fields, dtype=np.int64)
+    shifts = np.arange(width - 1, -1, -1, dtype=np.int64)
+    return ((values[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+
+
+def _unpack_fields(
+    data: Any, offset: int, count: int, width: int, skip_bits: int = 0
+) -> npt.NDArray[np.int64]:
+    """Reads count fields of a fixed bit width starting skip_bits into the buffer."""
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+    end_bit = skip_bits + count * width
+    raw = np.frombuffer(data, dtype=np.uint8, count=(end_bit + 7) // 8, offset=offset)
+    bits = np.unpackbits(raw)[skip_bits:end_bit].reshape(count, width).astype(np.int64)
+    return np.asarray(bits @ (1 << np.arange(width - 1, -1, -1, dtype=np.int64)))
+
+
+class GameRecord(NamedTuple):
+    """
+    One decoded game: its initial tiles, its steps and the recorded outcome.
+
+    Cells are row-major indices and tiles are exponents (1 for a 2, 2 for a 4).
+    """
+
+    board_size: int
+    initial_cells: npt.NDArray[np.int64]
+    initial_tiles: npt.NDArray[np.int64]
+    moves: npt.NDArray[np.int64]
+    spawn_cells: npt.NDArray[np.int64]
+    spawn_tiles: npt.NDArray[np.int64]
+    score: int
+    board: List[List[int]]
+
+
+def encode(
+    board_size: int,
+    initial: List[Tuple[int, int]],
+    steps: List[Tuple[int, int, int]],
+    score: int,
+    board: List[List[int]],
+) -> bytes:
+    """
+    Encodes one game as a record.
+
+    Args:
+        board_size (int): The size of the game board.
+        initial (List[Tuple[int, int]]): (cell, tile exponent) of the initial tiles.
+        steps (List[Tuple[int, int, int]]): (move code, cell, tile exponent) of every step.
+        score (int): The final score.
+        board (List[List[int]]): The final board.
+
+    Returns:
+        bytes: The encoded record.
+    """
+    bits = cell_bits(board_size)
+    payload = np.packbits(
+        np.concatenate(
+            [
+                _to_bits([cell << 1 | (tile - 1) for cell, tile in initial], bits + 1),
+                _to_bits(
+                    [(move << bits | cell) << 1 | (tile - 1) for move, cell, tile in steps],
+                    bits + 3,
+                ),
+            ]
+        )
+    )
+    exponents = bytes(value.bit_length() - 1 if value else 0 for row in board for value in row)
+    header = _HEADER.pack(board_size, len(initial), len(steps), score)
+    return header + exponents + payload.tobytes()
+
+
+class GameRecorder:
+    """
+    Records a game as it is played, for a compact binary record.
+
+    The game's current tiles are taken as its initial spawns, so the recorder is
+    attached right after the game is created. Moves must then be made through
+    ``move``, which also spawns the next tile.
+    """
+
+    __slots__ = ("game", "_initial", "_steps", "_codes")
+
+    def __init__(self, game: Game2048) -> None:
+        """
+        Starts recording a freshly created game.
+
+        Args:
+            game (Game2048): The game to record, on any engine.
+        """
+        if game.score:
+            raise ValueError("Only games that have not been played yet can be recorded.")
+        self.game = game
+        self._initial: List[Tuple[int, int]] = []
+        for x, row in enumerate(game.board):
+            for y, value in enumerate(row):
+                if value not in (0, 2, 4):
+                    raise ValueError("A new game can only hold 2 and 4 tiles.")
+                if value:
+                    self._initial.append((x * game.size + y, value // 2))
+        self._steps: List[Tuple[int, int, int]] = []
+        self._codes = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+    @property
+    def steps(self) -> int:
+        """Returns the number of recorded moves that changed the board."""
+        return len(self._steps)
+
+    def move(self, direction: str) -> bool:
+        """
+        Moves the game and, if the board changed, spawns and records a new tile.
+
+        Args:
+            direction (str): The direction to move ('left', 'right', 'up', 'down').
+
+        Returns:
+            bool: True if the board changed, False otherwise.
+        """
+        if not self.game.move(direction):
+            return False
+        position = self.game.insert_random_tile()
+        if position is None:
+            raise RuntimeError("A move that changed the board left no empty cell.")
+        x, y = position
+        tile = self.game.get_tile(position) // 2
+        self._steps.append((self._codes[direction], x * self.game.size + y, tile))
+        return True
+
+    def to_bytes(self) -> bytes:
+        """Returns the game so far as a record."""
+        return encode(self.game.size, self._initial, self._steps, self.game.score, self.game.board)
+
+
+class RecordWriter:
+    """
+    Appends game records to a file, creating it with the format header if needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens the record file for appending.
+
+        Args:
+            path (str): The record file.
+        """
+        self.path = path
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def write(self, record: Union[GameRecorder, bytes]) -> None:
+        """
+        Appends one game.
+
+        Args:
+            record (Union[GameRecorder, bytes]): A recorder or an already encoded record.
+        """
+        self._file.write(record.to_bytes() if isinstance(record, GameRecorder) else record)
+
+    def close(self) -> None:
+        """Flushes and closes the file."""
+        self._file.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class RecordReader:
+    """
+    Streams game records from a memory-mapped file.
+
+    Records are decoded one at a time straight from the mapping, so files with
+    millions of games are read without loading them into memory.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Maps the record file.
+
+        Args:
+            path (str): The record file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map: Optional[mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        )
+        if self._map is None or self._map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a 2048 record file.")
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        """Yields every record in file order."""
+        assert self._map is not None
+        data = self._map
+        offset = len(MAGIC)
+        while offset < len(data):
+            record, offset = self._decode(data, offset)
+            yield record
+
+    def _decode(self, data: Any, offset: int) -> Tuple[GameRecord, int]:
+        """Decodes the record at an offset and returns it with the next record's offset."""
+        if offset + _HEADER.size > len(data):
+            raise ValueError(f"Truncated record at offset {offset} in {self.path}.")
+        size, initial_count, step_count, score = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        cells = size * size
+        bits = cell_bits(size)
+        initial_bits = initial_count * (bits + 1)
+        payload_bytes = (initial_bits + step_count * (bits + 3) + 7) // 8
+        if offset + cells + payload_bytes > len(data):
+            raise ValueError(f"Truncated record at offset {offset} in {self.path}.")
+        end = offset + cells
+        tiles = [1 << e if e else 0 for e in data[offset:end]]
+        rows = zip(range(0, cells, size), range(size, cells + 1, size))
+        board = [tiles[start:stop] for start, stop in rows]
+        offset += cells
+        initial = _unpack_fields(data, offset, initial_count, bits + 1)
+        steps = _unpack_fields(data, offset, step_count, bits + 3, skip_bits=initial_bits)
+        cell_mask = (1 << bits) - 1
+        record = GameRecord(
+            size,
+            initial >> 1,
+            (initial & 1) + 1,
+            steps >> (bits + 1),
+            (steps >> 1) & cell_mask,
+            (steps & 1) + 1,
+            score,
+            board,
+        )
+        return record, offset + payload_bytes
+
+    def verify(self) -> Tuple[int, List[int]]:
+        """
+        Replays every record and checks it against its recorded outcome.
+
+        Returns:
+            Tuple[int, List[int]]: The number of records and the indices of those whose
+                replay does not reproduce the recorded score and board.
+        """
+        games = 0
+        failures = []
+        for index, record in enumerate(self):
+            games += 1
+            if replay(record) != (record.board, record.score):
+                failures.append(index)
+        return games, failures
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def replay(record: GameRecord) -> Tuple[List[List[int]], int]:
+    """
+    Replays a record from its initial tiles.
+
+    Classic 4x4 games are replayed on the bitboard row tables, other sizes on
+    the pure Game2048 afterstates.
+
+    Args:
+        record (GameRecord): The record to replay.
+
+    Returns:
+        Tuple[List[List[int]], int]: The final board and score.
+    """
+    if record.board_size == bitboard.BOARD_SIZE:
+        return _replay_bitboard(record)
+    size = record.board_size
+    board = [[0] * size for _ in range(size)]
+    for cell, tile in zip(record.initial_cells.tolist(), record.initial_tiles.tolist()):
+        board[cell // size][cell % size] = 1 << tile
+    score = 0
+    for move, cell, tile in zip(
+        record.moves.tolist(), record.spawn_cells.tolist(), record.spawn_tiles.tolist()
+    ):
+        state = Game2048.afterstates(board)[DIRECTIONS[move]]
+        board, score = state.board, score + state.gain
+        board[cell // size][cell % size] = 1 << tile
+    return board, score
+
+
+def _replay_bitboard(record: GameRecord) -> Tuple[List[List[int]], int]:
+    """Replays a 4x4 record on packed boards."""
+    packed = 0
+    for cell, tile in zip(record.initial_cells.tolist(), record.initial_tiles.tolist()):
+        packed |= tile << (4 * cell)
+    moves = [bitboard.MOVES[direction] for direction in DIRECTIONS]
+    score = 0
+    for move, cell, tile in zip(
+        record.moves.tolist(), record.spawn_cells.tolist(), record.spawn_tiles.tolist()
+    ):
+        packed, gain = moves[move](packed)
+        score += gain
+        packed |= tile << (4 * cell)
+    return bitboard.unpack(packed), score
@@ -0,0 +1,352 @@
+import argparse
+import importlib
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from game2048.game import DIRECTIONS, Game2048
+from game2048.rng import GameRNG
+
+# A policy picks the next direction for a game; it receives a per-game random
+# generator so that seeded runs are reproducible in any worker.
+Policy = Callable[[Game2048, random.Random], str]
+
+
+class GameResult(NamedTuple):
+    """
+    Outcome of a single self-play game.
+
+    ``moves`` counts only moves that changed the board; ``attempts`` also counts
+    moves the policy chose that changed nothing.
+    """
+
+    game_index: int
+    seed: int
+    score: int
+    max_tile: int
+    moves: int
+    attempts: int
+    seconds: float
+    record: Optional[bytes] = None
+
+
+class SelfPlayStats(NamedTuple):
+    """Aggregate throughput of a self-play run, counting only moves that changed the board."""
+
+    games: int
+    moves: int
+    seconds: float
+
+    @property
+    def games_per_sec(self) -> float:
+        """Returns the number of finished games per wall-clock second."""
+        return self.games / self.seconds if self.seconds else 0.0
+
+    @property
+    def moves_per_sec(self) -> float:
+        """Returns the number of moves played per wall-clock second."""
+        return self.moves / self.seconds if self.seconds else 0.0
+
+
+def random_policy(game: Game2048, rng: random.Random) -> str:
+    """Picks a uniformly random direction."""
+    return rng.choice(DIRECTIONS)
+
+
+def greedy_policy(game: Game2048, rng: random.Random) -> str:
+    """Picks the move with the highest immediate score gain, breaking ties at random."""
+    states = game.get_afterstates()
+    legal = [direction for direction in DIRECTIONS if states[direction].changed]
+    if not legal:
+        return rng.choice(DIRECTIONS)
+    best = max(states[direction].gain for direction in legal)
+    return rng.choice([direction for direction in legal if states[direction].gain == best])
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def resolve_policy(policy: Union[str, Policy]) -> Policy:
+    """
+    Resolves a policy given by name, by 'module:function' path or as a callable.
+
+    Args:
+        policy (Union[str, Policy]): The policy or its name.
+
+    Returns:
+        Policy: The policy callable.
+    """
+    if callable(policy):
+        return policy
+    if policy in POLICIES:
+        return POLICIES[policy]
+    module_name, _, attr = policy.partition(":")
+    if not attr:
+        raise ValueError(
+            f"Unknown policy '{policy}', expected one of {sorted(POLICIES)} or 'module:function'."
+        )
+    resolved = getattr(importlib.import_module(module_name), attr)
+    if not callable(resolved):
+        raise ValueError(f"Policy '{policy}' is not callable.")
+    return resolved  # type: ignore[no-any-return]
+
+
+def create_game(board_size: int, engine: str, rng: Optional[GameRNG] = None) -> Game2048:
+    """
+    Creates a game on the requested engine.
+
+    Args:
+        board_size (int): The size of the game board.
+        engine (str): 'list' for Game2048 or 'bitboard' for BitboardGame2048.
+        rng (Optional[GameRNG]): The game's spawn stream; a freshly seeded one if None.
+
+    Returns:
+        Game2048: The new game.
+    """
+    if engine == "bitboard":
+        from game2048.bitboard import BitboardGame2048
+
+        return BitboardGame2048(board_size, rng)
+    if engine == "list":
+        return Game2048(board_size, rng)
+    raise ValueError(f"Unknown engine '{engine}'.")
+
+
+def play_game(
+    game_index: int,
+    seed: int,
+    policy: Union[str, Policy],
+    board_size: int = 4,
+    engine: str = "list",
+    record: bool = False,
+) -> GameResult:
+    """
+    Plays one game to the end without any user interface.
+
+    The tile spawns and the policy draw from two streams split off the game
+    seed, so the global ``random`` state is neither used nor touched.
+
+    Args:
+        game_index (int): The index of the game within its run.
+        seed (int): The game seed; distinct spawn and policy seeds are derived from it.
+        policy (Union[str, Policy]): The policy choosing every move.
+        board_size (int): The size of the game board.
+        engine (str): The game engine to use.
+        record (bool): Whether to return the game as a binary record (see game2048.record).
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    choose = resolve_policy(policy)
+    start = time.perf_counter()
+    streams = GameRNG(seed)
+    game = create_game(board_size, engine, streams.split(0))
+    rng = random.Random(streams.split(1).seed)
+    recorder = None
+    if record:
+        # Imported here so that workers that do not record never load numpy.
+        from game2048.record import GameRecorder
+
+        recorder = GameRecorder(game)
+    moves = attempts = 0
+    while not game.is_game_over():
+        attempts += 1
+        direction = choose(game, rng)
+        if recorder is not None:
+            moves += recorder.move(direction)
+        elif game.move(direction):
+            game.insert_random_tile()
+            moves += 1
+    max_tile = max(max(row) for row in game.board)
+    return GameResult(
+        game_index,
+        seed,
+        game.score,
+        max_tile,
+        moves,
+        attempts,
+        time.perf_counter() - start,
+        recorder.to_bytes() if recorder is not None else None,
+    )
+
+
+def _init_worker() -> None:
+    """Keeps pool workers from writing per-game log records to the shared log file."""
+    logging.getLogger("Game2048").setLevel(logging.ERROR)
+
+
+def _load_shared_tables(engine: str) -> None:
+    """Builds the lookup tables before forking, so that the pool workers share them."""
+    if engine == "bitboard":
+        from game2048.bitboard import load_tables
+
+        load_tables()
+    # Loaded by resolving an expectimax policy, whose solvers need the heuristic table.
+    expectimax = sys.modules.get("game2048.expectimax")
+    if expectimax is not None:
+        expectimax.load_heuristic()
+
+
+def _play_task(task: Tuple[int, int, Union[str, Policy], int, str, bool]) -> GameResult:
+    """Unpacks a pool task for play_game."""
+    return play_game(*task)
+
+
+class SelfPlayRunner:
+    """
+    Plays many headless games under a policy on a multiprocessing pool.
+
+    Every game gets its own seed derived from the run seed, so results do not
+    depend on how games are scheduled across workers. Results are streamed
+    back as games finish.
+    """
+
+    def __init__(
+        self,
+        games: int,
+        policy: Union[str, Policy] = "random",
+        workers: Optional[int] = None,
+        seed: int = 0,
+        board_size: int = 4,
+        engine: str = "list",
+        chunksize: int = 0,
+        record: bool = False,
+    ) -> None:
+        """
+        Initialize the SelfPlayRunner.
+
+        Args:
+            games (int): The number of games to play.
+            policy (Union[str, Policy]): The policy name, 'module:function' path or a
+                module-level callable (it must be picklable to run on a pool).
+            workers (Optional[int]): The number of worker processes, all cores by default.
+                A single worker plays in the current process.
+            seed (int): The run seed; game ``i`` is played with seed ``seed + i``.
+            board_size (int): The size of the game boards.
+            engine (str): 'list' or 'bitboard'.
+            chunksize (int): Games handed to a worker at once, picked automatically if 0.
+            record (bool): Whether every result carries its game as a binary record.
+        """
+        if games < 0:
+            raise ValueError("Number of games must not be negative.")
+        resolve_policy(policy)
+        self.games = games
+        self.policy = policy
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.board_size = board_size
+        self.engine = engine
+        self.chunksize = chunksize or max(1, games // (self.workers * 8))
+        self.record = record
+        self.stats = SelfPlayStats(0, 0, 0.0)
+
+    def _tasks(self) -> List[Tuple[int, int, Union[str, Policy], int, str, bool]]:
+        """Builds one task per game."""
+        return [
+            (
+                game_index,
+                self.seed + game_index,
+                self.policy,
+                self.board_size,
+                self.engine,
+                self.record,
+            )
+            for game_index in range(self.games)
+        ]
+
+    def run(self) -> Iterator[GameResult]:
+        """
+        Plays all games and yields every result as soon as its game finishes.
+
+        The aggregate throughput is available in ``stats`` while and after iterating.
+        """
+        start = time.perf_counter()
+        games = moves = 0
+        if self.workers == 1:
+            results: Iterator[GameResult] = map(_play_task, self._tasks())
+            pool = None
+        else:
+            _load_shared_tables(self.engine)
+            pool = multiprocessing.Pool(self.workers, initializer=_init_worker)
+            results = pool.imap_unordered(_play_task, self._tasks(), self.chunksize)
+        try:
+            for result in results:
+                games += 1
+                moves += result.moves
+                self.stats = SelfPlayStats(games, moves, time.perf_counter() - start)
+                yield result
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    def run_all(self) -> List[GameResult]:
+        """Plays all games and returns their results in completion order."""
+        return list(self.run())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point: ``python -m game2048.selfplay``.
+
+    Prints one line per finished game followed by the aggregate throughput.
+    """
+    parser = argparse.ArgumentParser(description="Play headless 2048 games on a process pool.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: all cores)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="run seed, game i uses seed + i")
+    parser.add_argument("--policy", default="random", help="policy name or 'module:function'")
+    parser.add_argument("--size", type=int, default=4, help="board size")
+    parser.add_argument(
+        "--engine", choices=("list", "bitboard"), default="list", help="game engine"
+    )
+    parser.add_argument("--quiet", action="store_true", help="print only the summary")
+    parser.add_argument("--record", metavar="PATH", help="append every game to a record file")
+    args = parser.parse_args(argv)
+
+    runner = SelfPlayRunner(
+        args.games,
+        policy=args.policy,
+        workers=args.workers,
+        seed=args.seed,
+        board_size=args.size,
+        engine=args.engine,
+        record=bool(args.record),
+    )
+    writer = None
+    if args.record:
+        from game2048.record import RecordWriter
+
+        writer = RecordWriter(args.record)
+    best = 0
+    try:
+        for result in runner.run():
+            best = max(best, result.score)
+            if writer is not None and result.record is not None:
+                writer.write(result.record)
+            if not args.quiet:
+                print(
+                    f"game {result.game_index} seed {result.seed}: score {result.score}, "
+                    f"max tile {result.max_tile}, moves {result.moves} ({result.attempts} attempted)"
+                )
+    finally:
+        if writer is not None:
+            writer.close()
+    stats = runner.stats
+    print(
+        f"{stats.games} games, {stats.moves} moves in {stats.seconds:.2f}s "
+        f"({stats.games_per_sec:.1f} games/s, {stats.moves_per_sec:.0f} moves/s), best score {best}"
+    )
+
+
+if __name__ == "__main__":
+    main()
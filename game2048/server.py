@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from game2048.bitboard import BitboardGame2048, is_game_over, load_tables
+from game2048.game import DIRECTIONS
+from game2048.rng import GameRNG
+from game2048.submitter import ScoreSubmitter
+
+logger = logging.getLogger(__name__)
+
+default_host = "127.0.0.1"
+default_port = 2048
+# Seconds without a request after which a session is closed and its score recorded.
+idle_timeout = 300.0
+# Draws buffered per session. GameRNG buffers 1024 by default, which would make a
+# session take about 48 KB instead of about 3 KB.
+session_buffer = 4
+# Longest request line in bytes.
+max_line = 4096
+
+# Tile values of each packed 16-bit row, built by load_rows.
+_rows: List[Tuple[int, ...]] = []
+
+
+def load_rows() -> None:
+    """Builds the row table, so that a board is sent as four lookups instead of 16 shifts."""
+    if not _rows:
+        tiles = [1 << exponent if exponent else 0 for exponent in range(16)]
+        _rows.extend(
+            tuple(tiles[(row >> shift) & 0xF] for shift in (0, 4, 8, 12)) for row in range(1 << 16)
+        )
+
+
+class Session:
+    """
+    One player's game on the server.
+
+    Attributes:
+        name (Optional[str]): The name the score is recorded under, or None to not record it.
+        game (BitboardGame2048): The game, on a packed board.
+        touched (float): The event loop time of the last request.
+    """
+
+    __slots__ = ("name", "game", "touched")
+
+    def __init__(self, name: Optional[str], game: BitboardGame2048, touched: float) -> None:
+        self.name = name
+        self.game = game
+        self.touched = touched
+
+
+class GameServer:
+    """
+    Hosts many concurrent 2048 games over TCP with asyncio.
+
+    Each request and response is one line of JSON. A request names an operation:
+
+    - ``{"op": "new", "name": "alice", "seed": 7}`` starts a session; name and seed are optional.
+    - ``{"op": "move", "session": id, "direction": "left"}`` plays a move.
+    - ``{"op": "state", "session": id}`` returns the board without playing.
+    - ``{"op": "quit", "session": id}`` ends the session.
+
+    Responses hold the session id, the board as rows of tile values, the score,
+    whether the board changed and whether the game is over, or an ``error``.
+    Sessions are not tied to connections, so a client can reconnect and resume.
+
+    Moves are a few table lookups on a packed board, so they run on the event
+    loop. Sessions are kept in least recently used order, so closing idle ones
+    only looks at those that expired. Final scores of named sessions, on game
+    over, quit or expiry, go to a ScoreSubmitter, whose thread writes them to the
+    database off the event loop.
+
+    Attributes:
+        sessions (OrderedDict[str, Session]): Open sessions, least recently used first.
+        submitter (Optional[ScoreSubmitter]): Where final scores are sent, or None.
+        idle_timeout (float): Seconds without a request before a session expires.
+        max_sessions (int): The most sessions open at once; new ones are refused beyond it.
+        moves (int): Moves played since the server started.
+        expired (int): Sessions closed for being idle.
+    """
+
+    def __init__(
+        self,
+        submitter: Optional[ScoreSubmitter] = None,
+        idle_timeout: float = idle_timeout,
+        max_sessions: int = 100_000,
+    ) -> None:
+        """
+        Creates the server without listening yet.
+
+        Args:
+            submitter (Optional[ScoreSubmitter]): Where final scores are sent, or None.
+            idle_timeout (float): Seconds without a request before a session expires.
+            max_sessions (int): The most sessions open at once.
+        """
+        if idle_timeout <= 0:
+            raise ValueError("Idle timeout must be positive.")
+        self.sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.submitter = submitter
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.moves = 0
+        self.expired = 0
+        self._server: Optional[asyncio.Server] = None
+        self._reaper: Optional["asyncio.Task[None]"] = None
+
+    async def start(self, host: str = default_host, port: int = default_port) -> asyncio.Server:
+        """
+        Starts listening and closing idle sessions.
+
+        The bitboard and row tables are built on a worker thread first, so a server
+        started inside a running loop does not stall it.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, load_tables)
+        await loop.run_in_executor(None, load_rows)
+        self._server = await asyncio.start_server(self._handle, host, port, limit=max_line)
+        self._reaper = loop.create_task(self._reap())
+        return self._server
+
+    async def close(self) -> None:
+        """Stops listening and ends every session, recording the scores."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        while self.sessions:
+            self._finish(*self.sessions.popitem(last=False))
+
+    def dispatch(self, request: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """
+        Answers one request.
+
+        Args:
+            request (Dict[str, Any]): The decoded request.
+            now (float): The event loop time, recorded as the session's last use.
+
+        Returns:
+            Dict[str, Any]: The response, with an ``error`` key if the request failed.
+        """
+        op = request.get("op")
+        if op == "new":
+            return self._new(request, now)
+        session_id = request.get("session")
+        if not isinstance(session_id, str) or session_id not in self.sessions:
+            return {"error": "unknown session"}
+        session = self.sessions[session_id]
+        session.touched = now
+        self.sessions.move_to_end(session_id)
+        game = session.game
+        if op == "move":
+            direction = request.get("direction")
+            if direction not in DIRECTIONS:
+                return {"error": "unknown direction"}
+            moved = game.move(direction)
+            if moved:
+                game.insert_random_tile()
+            self.moves += 1
+            over = is_game_over(game.bits)
+            if over:
+                self._finish(session_id, self.sessions.pop(session_id))
+            return self._state(session_id, game, moved, over)
+        if op == "state":
+            return self._state(session_id, game, False, is_game_over(game.bits))
+        if op == "quit":
+            self._finish(session_id, self.sessions.pop(session_id))
+            return self._state(session_id, game, False, True)
+        return {"error": "unknown op"}
+
+    def expire(self, now: float) -> int:
+        """
+        Ends the sessions that have been idle for longer than the timeout.
+
+        Args:
+            now (float): The event loop time.
+
+        Returns:
+            int: The number of sessions ended.
+        """
+        deadline = now - self.idle_timeout
+        count = 0
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.touched > deadline:
+                break
+            del self.sessions[session_id]
+            self._finish(session_id, session)
+            count += 1
+        self.expired += count
+        return count
+
+    def _new(self, request: Dict[str, Any], now: float) -> Dict[str, Any]:
+        if len(self.sessions) >= self.max_sessions:
+            return {"error": "server full"}
+        name = request.get("name")
+        seed = request.get("seed")
+        if name is not None and not isinstance(name, str):
+            return {"error": "name must be a string"}
+        if seed is not None and not isinstance(seed, int):
+            return {"error": "seed must be an integer"}
+        game = BitboardGame2048(rng=GameRNG(seed, session_buffer))
+        session_id = secrets.token_urlsafe(12)
+        self.sessions[session_id] = Session(name, game, now)
+        return self._state(session_id, game, False, False)
+
+    def _finish(self, session_id: str, session: Session) -> None:
+        if self.submitter is not None and session.name:
+            self.submitter.submit(session.name, session.game.score)
+        logger.debug("Session %s ended with score %d.", session_id, session.game.score)
+
+    @staticmethod
+    def _state(session_id: str, game: BitboardGame2048, moved: bool, over: bool) -> Dict[str, Any]:
+        load_rows()
+        bits = game.bits
+        return {
+            "session": session_id,
+            "board": [_rows[(bits >> shift) & 0xFFFF] for shift in (0, 16, 32, 48)],
+            "score": game.score,
+            "moved": moved,
+            "over": over,
+        }
+
+    async def _reap(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(self.idle_timeout / 4, 5.0))
+            if self.expire(loop.time()):
+                logger.info("%d sessions open, %d expired.", len(self.sessions), self.expired)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # A line longer than max_line, or a reset connection.
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response: Dict[str, Any] = {"error": "invalid JSON"}
+                else:
+                    if isinstance(request, dict):
+                        response = self.dispatch(request, loop.time())
+                    else:
+                        response = {"error": "request must be an object"}
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    host: str,
+    port: int,
+    idle_timeout: float,
+    max_sessions: int,
+    record_scores: bool,
+) -> None:
+    """
+    Runs a GameServer until cancelled, then records the scores of open sessions.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on, 0 for any free port.
+        idle_timeout (float): Seconds without a request before a session expires.
+        max_sessions (int): The most sessions open at once.
+        record_scores (bool): Whether to send final scores to the leaderboard.
+    """
+    submitter = ScoreSubmitter() if record_scores else None
+    server = GameServer(submitter, idle_timeout, max_sessions)
+    listener = await server.start(host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Serving on {address[0]}:{address[1]}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        if submitter is not None:
+            await asyncio.get_running_loop().run_in_executor(None, submitter.close)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``python -m game2048.server``."""
+    parser = argparse.ArgumentParser(
+        description="Serve 2048 games over TCP, one JSON request per line."
+    )
+    parser.add_argument("--host", default=default_host)
+    parser.add_argument("--port", type=int, default=default_port, help="0 picks a free port")
+    parser.add_argument("--idle-timeout", type=float, default=idle_timeout, help="seconds")
+    parser.add_argument("--max-sessions", type=int, default=100_000)
+    parser.add_argument(
+        "--no-scores", action="store_true", help="do not record final scores in the leaderboard"
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.idle_timeout, args.max_sessions, not args.no_scores)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
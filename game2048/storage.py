@@ -0,0 +1,317 @@
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Backend used by open_storage when STORAGE_BACKEND is not set.
+default_backend = "postgres"
+default_sqlite_path = "game2048.sqlite3"
+
+
+class LeaderboardStorage(ABC):
+    """
+    The score storage operations the game needs, independent of the database.
+
+    Every backend keeps the best score per user name, orders the leaderboard by
+    score descending with ties by name, logs errors instead of raising them, and
+    answers failed reads with an empty result.
+    """
+
+    @abstractmethod
+    def create_table(self) -> None:
+        """
+        Create the score table and its indexes if they do not already exist.
+        """
+
+    @abstractmethod
+    def update_or_create_row(self, name: str, score: int) -> Optional[int]:
+        """
+        Save a score, keeping the user's best one.
+
+        :param name: Name of the user.
+        :param score: New score of the user.
+        :return: The user's best score after the update, or None on failure.
+        """
+
+    @abstractmethod
+    def submit_scores(self, scores: Iterable[Tuple[str, int]], page_size: int = 10000) -> int:
+        """
+        Save many scores in one transaction, keeping the best score per user.
+
+        :param scores: Pairs of user name and score.
+        :param page_size: Maximum number of rows sent per statement.
+        :return: Number of distinct users submitted, 0 on failure.
+        """
+
+    @abstractmethod
+    def get_row(self, name: str) -> Optional[Tuple[str, int]]:
+        """
+        Retrieve a user record by name.
+
+        :param name: Name of the user.
+        :return: Tuple containing the user's name and score, or None if not found.
+        """
+
+    @abstractmethod
+    def get_top(self, k: int = 10, offset: int = 0) -> List[Tuple[str, int]]:
+        """
+        Retrieve one page of the leaderboard.
+
+        :param k: Number of rows to return.
+        :param offset: Number of leading rows to skip.
+        :return: List of tuples containing user information (name and score).
+        """
+
+    @abstractmethod
+    def get_page(
+        self, k: int = 10, after: Optional[Tuple[str, int]] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Retrieve the leaderboard page that follows a given row.
+
+        :param k: Number of rows to return.
+        :param after: Last (name, score) of the previous page, or None for the first page.
+        :return: List of tuples containing user information (name and score).
+        """
+
+    @abstractmethod
+    def get_rank(self, name: str) -> Optional[int]:
+        """
+        Retrieve a user's leaderboard position; users with equal scores share a rank.
+
+        :param name: Name of the user.
+        :return: 1-based rank, or None if the user is not found.
+        """
+
+    @abstractmethod
+    def iter_rows(self, batch_size: int = 10000) -> Iterator[Tuple[str, int]]:
+        """
+        Stream every user record in leaderboard order.
+
+        :param batch_size: Number of rows fetched at a time.
+        :return: Iterator of tuples containing user information (name and score).
+        """
+
+    @abstractmethod
+    def get_all_rows(self) -> List[Tuple[str, int]]:
+        """
+        Retrieve all user records in leaderboard order.
+
+        :return: List of tuples containing user information (name and score).
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Release the backend's connection.
+        """
+
+
+class SQLiteStorage(LeaderboardStorage):
+    """
+    Leaderboard storage in an embedded SQLite database file.
+
+    The database runs in WAL mode so readers never block the writer, and every
+    statement is a class constant that sqlite3 prepares once and reuses
+    from its statement cache. The connection is shared between threads behind
+    a lock.
+    """
+
+    CREATE_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            scores INTEGER NOT NULL
+        )
+    """
+    CREATE_INDEX_SQL = (
+        "CREATE INDEX IF NOT EXISTS users_scores_name_idx ON users (scores DESC, name)"
+    )
+    UPSERT_SQL = (
+        "INSERT INTO users (name, scores) VALUES (?, ?) "
+        "ON CONFLICT (name) DO UPDATE SET scores = MAX(scores, excluded.scores)"
+    )
+    GET_ROW_SQL = "SELECT name, scores FROM users WHERE name = ?"
+    TOP_SQL = "SELECT name, scores FROM users ORDER BY scores DESC, name LIMIT ? OFFSET ?"
+    PAGE_SQL = (
+        "SELECT name, scores FROM users WHERE scores < ? OR (scores = ? AND name > ?) "
+        "ORDER BY scores DESC, name LIMIT ?"
+    )
+    RANK_SQL = (
+        "SELECT 1 + (SELECT COUNT(*) FROM users better WHERE better.scores > u.scores) "
+        "FROM users u WHERE u.name = ?"
+    )
+    ALL_SQL = "SELECT name, scores FROM users ORDER BY scores DESC, name"
+
+    def __init__(self, path: str = default_sqlite_path) -> None:
+        """
+        Open or create the database file.
+
+        :param path: Path of the SQLite database file, or ":memory:".
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self.connection: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, check_same_thread=False, cached_statements=64
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last transactions on power loss, never corruption.
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA busy_timeout=5000")
+        logger.info(f"Opened SQLite database '{path}'.")
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self.connection is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return self.connection
+
+    def create_table(self) -> None:
+        """Creates the users table and its score index."""
+        try:
+            with self._lock, self._db:
+                self._db.execute(self.CREATE_TABLE_SQL)
+                self._db.execute(self.CREATE_INDEX_SQL)
+            logger.info("Table 'users' created successfully (if it did not exist).")
+        except sqlite3.Error as e:
+            logger.error(f"Error creating table: {e}")
+
+    def update_or_create_row(self, name: str, score: int) -> Optional[int]:
+        """Upserts the score and reads back the best one in the same transaction."""
+        try:
+            with self._lock, self._db:
+                self._db.execute(self.UPSERT_SQL, (name, score))
+                best: int = self._db.execute(self.GET_ROW_SQL, (name,)).fetchone()[1]
+            logger.info(f"Saved score {score} for user '{name}', best score is {best}.")
+            return best
+        except sqlite3.Error as e:
+            logger.error(f"Error updating or creating user: {e}")
+            return None
+
+    def submit_scores(self, scores: Iterable[Tuple[str, int]], page_size: int = 10000) -> int:
+        """Upserts the best score per name in one transaction."""
+        best: Dict[str, int] = {}
+        for name, score in scores:
+            if name not in best or score > best[name]:
+                best[name] = score
+        if not best:
+            return 0
+        try:
+            # One prepared statement executed per row inside a single transaction;
+            # page_size does not apply since nothing crosses a network.
+            with self._lock, self._db:
+                self._db.executemany(self.UPSERT_SQL, sorted(best.items()))
+            logger.info(f"Submitted scores for {len(best)} users.")
+            return len(best)
+        except sqlite3.Error as e:
+            logger.error(f"Error submitting scores: {e}")
+            return 0
+
+    def get_row(self, name: str) -> Optional[Tuple[str, int]]:
+        """Looks a user up by the unique name index."""
+        try:
+            with self._lock:
+                row = self._db.execute(self.GET_ROW_SQL, (name,)).fetchone()
+            return None if row is None else (row[0], row[1])
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving record: {e}")
+            return None
+
+    def get_top(self, k: int = 10, offset: int = 0) -> List[Tuple[str, int]]:
+        """Reads one LIMIT/OFFSET page in leaderboard order."""
+        return self._fetch(self.TOP_SQL, (k, offset))
+
+    def get_page(
+        self, k: int = 10, after: Optional[Tuple[str, int]] = None
+    ) -> List[Tuple[str, int]]:
+        """Reads the page after a row as a range scan of the score index."""
+        if after is None:
+            return self.get_top(k)
+        name, score = after
+        return self._fetch(self.PAGE_SQL, (score, score, name, k))
+
+    def get_rank(self, name: str) -> Optional[int]:
+        """Counts the better scores from the score index."""
+        try:
+            with self._lock:
+                row = self._db.execute(self.RANK_SQL, (name,)).fetchone()
+            return None if row is None else int(row[0])
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving rank: {e}")
+            return None
+
+    def iter_rows(self, batch_size: int = 10000) -> Iterator[Tuple[str, int]]:
+        """Streams the leaderboard in keyset pages of batch_size rows."""
+        after: Optional[Tuple[str, int]] = None
+        while True:
+            # Keyset pages keep the lock and the read snapshot short between batches.
+            page = self.get_page(batch_size, after)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = page[-1]
+
+    def get_all_rows(self) -> List[Tuple[str, int]]:
+        """Reads the whole leaderboard."""
+        return self._fetch(self.ALL_SQL, ())
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+                logger.info("SQLite database closed.")
+
+    def _fetch(self, sql: str, params: Tuple[object, ...]) -> List[Tuple[str, int]]:
+        """Runs a query returning (name, score) rows, logging errors."""
+        try:
+            with self._lock:
+                rows = self._db.execute(sql, params).fetchall()
+            return [(row[0], row[1]) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving records: {e}")
+            return []
+
+
+def open_storage() -> LeaderboardStorage:
+    """
+    Open the leaderboard storage selected by configuration.
+
+    STORAGE_BACKEND chooses "postgres" (the shared DatabaseManager pool, configured
+    by the DB_* variables) or "sqlite" (a local file at SQLITE_PATH). Both can be
+    set in the .env file.
+
+    :return: A ready-to-use storage whose table exists.
+    """
+    # Imported here so that games that never save a score do not load dotenv.
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    backend = os.getenv("STORAGE_BACKEND", default_backend).lower()
+    storage: LeaderboardStorage
+    if backend == "sqlite":
+        storage = SQLiteStorage(os.getenv("SQLITE_PATH", default_sqlite_path))
+    elif backend in ("postgres", "postgresql"):
+        # Imported here so that SQLite-only installs never load psycopg2.
+        from game2048.db import DatabaseManager
+
+        storage = DatabaseManager.pooled()
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+    storage.create_table()
+    return storage
+
+
+def close_storage() -> None:
+    """
+    Release connections shared between storages returned by open_storage.
+    """
+    if os.getenv("STORAGE_BACKEND", default_backend).lower() != "sqlite":
+        from game2048.db import close_pool
+
+        close_pool()
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from game2048.storage import LeaderboardStorage, open_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreSubmitter:
+    """
+    Write-behind score submission on a background thread.
+
+    ``submit`` only records the score in memory and returns. The worker thread
+    keeps the best pending score per name, sends everything pending as one
+    ``submit_scores`` batch, and retries with exponential backoff while the
+    database is unreachable. Scores that could not be sent by shutdown are kept
+    in an optional spool file and sent by the next submitter that uses it.
+    """
+
+    def __init__(
+        self,
+        db_factory: Callable[[], LeaderboardStorage] = open_storage,
+        spool_path: Optional[str] = None,
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        """
+        Start the background worker.
+
+        :param db_factory: Opens the storage, called on the worker thread
+            so that connecting never blocks the caller.
+        :param spool_path: File where unsent scores are kept between runs, or None.
+        :param min_backoff: Seconds to wait after the first failed attempt.
+        :param max_backoff: Longest wait between attempts.
+        """
+        self._db_factory = db_factory
+        self._db: Optional[LeaderboardStorage] = None
+        self.spool_path = spool_path
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Condition()
+        # Name -> (best pending score, time it was first queued).
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        self._inflight: Dict[str, Tuple[int, float]] = {}
+        self._closing = False
+        self.submitted = 0
+        self.failures = 0
+        self.latencies: Deque[float] = deque(maxlen=1000)
+        if spool_path:
+            self._load_spool()
+        self._thread = threading.Thread(target=self._run, name="ScoreSubmitter", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of users with a score waiting to be sent, including the batch in flight."""
+        with self._lock:
+            return len(self._pending) + len(self._inflight)
+
+    @property
+    def flush_latency(self) -> float:
+        """Mean seconds from queuing a score to its commit, over recent flushes."""
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def submit(self, name: str, score: int) -> None:
+        """
+        Queue a score without waiting for the database.
+
+        :param name: Name of the user.
+        :param score: Score of the finished game.
+        """
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("ScoreSubmitter is closed")
+            self._queue(self._pending, name, score, time.monotonic())
+            self._lock.notify()
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Stop the worker after one last attempt to send what is pending.
+
+        Scores that are still unsent when the worker stops or the timeout passes
+        are written to the spool file, if one is configured.
+
+        :param timeout: Seconds to wait for the final flush, or None to wait forever.
+        :return: True if every queued score reached the database.
+        """
+        with self._lock:
+            self._closing = True
+            self._lock.notify()
+        self._thread.join(timeout)
+        with self._lock:
+            unsent: Dict[str, Tuple[int, float]] = {}
+            for queue in (self._inflight, self._pending):
+                for name, (score, queued_at) in queue.items():
+                    self._queue(unsent, name, score, queued_at)
+        if self.spool_path:
+            self._write_spool(unsent)
+        if unsent:
+            logger.warning(f"{len(unsent)} scores were not sent to the database.")
+        return not unsent
+
+    def _run(self) -> None:
+        backoff = self.min_backoff
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._closing or bool(self._pending))
+                if not self._pending:
+                    break
+                self._inflight, self._pending = self._pending, {}
+                closing = self._closing
+            if self._flush(self._inflight):
+                with self._lock:
+                    self._inflight = {}
+                backoff = self.min_backoff
+                continue
+            with self._lock:
+                for name, (score, queued_at) in self._inflight.items():
+                    self._queue(self._pending, name, score, queued_at)
+                self._inflight = {}
+                if closing:
+                    break
+            if self.spool_path:
+                self._write_spool(self._pending_snapshot())
+            with self._lock:
+                # Sleep through the backoff unless close() wakes us for a last attempt.
+                self._lock.wait_for(lambda: self._closing, backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+        if self._db is not None:
+            self._db.close()
+
+    def _flush(self, batch: Dict[str, Tuple[int, float]]) -> bool:
+        """Send one batch and record the outcome; True if it was committed."""
+        try:
+            if self._db is None:
+                self._db = self._db_factory()
+            sent = self._db.submit_scores((name, score) for name, (score, _) in batch.items())
+        except Exception as e:
+            logger.error(f"Error submitting queued scores: {e}")
+            sent = 0
+        if not sent:
+            self.failures += 1
+            return False
+        now = time.monotonic()
+        self.latencies.extend(now - queued_at for _, queued_at in batch.values())
+        self.submitted += sent
+        if self.spool_path:
+            self._write_spool(self._pending_snapshot())
+        return True
+
+    def _pending_snapshot(self) -> Dict[str, Tuple[int, float]]:
+        with self._lock:
+            return dict(self._pending)
+
+    @staticmethod
+    def _queue(
+        queue: Dict[str, Tuple[int, float]], name: str, score: int, queued_at: float
+    ) -> None:
+        """Keep the best score per name and the time its oldest score was queued."""
+        current = queue.get(name)
+        if current is None:
+            queue[name] = (score, queued_at)
+        else:
+            queue[name] = (max(score, current[0]), min(queued_at, current[1]))
+
+    def _load_spool(self) -> None:
+        assert self.spool_path is not None
+        try:
+            with open(self.spool_path, encoding="utf-8") as spool:
+                now = time.monotonic()
+                for line in spool:
+                    if line.strip():
+                        name, score = json.loads(line)
+                        self._queue(self._pending, name, int(score), now)
+            logger.info(f"Loaded {len(self._pending)} unsent scores from {self.spool_path}.")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading score spool {self.spool_path}: {e}")
+
+    def _write_spool(self, scores: Dict[str, Tuple[int, float]]) -> None:
+        assert self.spool_path is not None
+        try:
+            if not scores:
+                if os.path.exists(self.spool_path):
+                    os.remove(self.spool_path)
+                return
+            temporary = f"{self.spool_path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as spool:
+                for name, (score, _) in scores.items():
+                    spool.write(json.dumps([name, score]) + "\n")
+            os.replace(temporary, self.spool_path)
+        except OSError as e:
+            logger.error(f"Error writing score spool {self.spool_path}: {e}")
@@ -0,0 +1,374 @@
+from typing import Any, Dict, List, Sequence, Tuple, cast, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from game2048.game import DIRECTIONS
+
+# The 8 rotations and reflections of a board, in the order of transforms(): the
+# board, mirrored (columns reversed), flipped (rows reversed), rotated by 180
+# degrees, then the same four of its transpose. A board's canonical form is the
+# smallest of the 8. The transforms work on packed 4x4 boards and on NumPy uint64
+# arrays of them alike, since NumPy keeps uint64 arrays uint64 when combined with
+# Python ints.
+
+
+def _mirror(packed: Any) -> Any:
+    """Reverses the cells of every row of a packed board."""
+    a = ((packed & 0x0F0F0F0F0F0F0F0F) << 4) | ((packed >> 4) & 0x0F0F0F0F0F0F0F0F)
+    return ((a & 0x00FF00FF00FF00FF) << 8) | ((a >> 8) & 0x00FF00FF00FF00FF)
+
+
+def _flip(packed: Any) -> Any:
+    """Reverses the rows of a packed board."""
+    a = ((packed & 0x0000FFFF0000FFFF) << 16) | ((packed >> 16) & 0x0000FFFF0000FFFF)
+    return ((a & 0xFFFFFFFF) << 32) | (a >> 32)
+
+
+def _transpose(packed: Any) -> Any:
+    """Swaps rows and columns of a packed board, as bitboard.transpose but for arrays too."""
+    a = (
+        (packed & 0xF0F00F0FF0F00F0F)
+        | ((packed & 0x0000F0F00000F0F0) << 12)
+        | ((packed & 0x0F0F00000F0F0000) >> 12)
+    )
+    return (
+        (a & 0xFF00FF0000FF00FF)
+        | ((a & 0x00FF00FF00000000) >> 24)
+        | ((a & 0x00000000FF00FF00) << 24)
+    )
+
+
+@overload
+def transforms(packed: int) -> List[int]: ...
+
+
+@overload
+def transforms(packed: npt.NDArray[np.uint64]) -> List[npt.NDArray[np.uint64]]: ...
+
+
+def transforms(packed: Any) -> List[Any]:
+    """
+    Returns the 8 rotations and reflections of a packed board.
+
+    Args:
+        packed (Any): The packed board, or a NumPy uint64 array of packed boards.
+
+    Returns:
+        List[Any]: The transformed boards, or arrays of them, indexed by transform.
+    """
+    mirrored = _mirror(packed)
+    transposed = _transpose(packed)
+    both = _mirror(transposed)
+    return [
+        packed,
+        mirrored,
+        _flip(packed),
+        _flip(mirrored),
+        transposed,
+        both,
+        _flip(transposed),
+        _flip(both),
+    ]
+
+
+def _compose(*steps: Dict[str, str]) -> Dict[str, str]:
+    """Maps directions through elementary transforms applied in order."""
+    mapping = {direction: direction for direction in DIRECTIONS}
+    for step in steps:
+        mapping = {direction: step[moved] for direction, moved in mapping.items()}
+    return mapping
+
+
+_MIRROR = {"left": "right", "right": "left", "up": "up", "down": "down"}
+_FLIP = {"left": "left", "right": "right", "up": "down", "down": "up"}
+_TRANSPOSE = {"left": "up", "up": "left", "right": "down", "down": "right"}
+
+# move_maps[t][d] is the move on transform t of a board that matches move d on the
+# board itself: transform t of (board moved d) is (transform t of board) moved
+# move_maps[t][d]. inverse_maps[t] takes a move on the transform back.
+move_maps: List[Dict[str, str]] = [
+    _compose(),
+    _compose(_MIRROR),
+    _compose(_FLIP),
+    _compose(_MIRROR, _FLIP),
+    _compose(_TRANSPOSE),
+    _compose(_TRANSPOSE, _MIRROR),
+    _compose(_TRANSPOSE, _FLIP),
+    _compose(_TRANSPOSE, _MIRROR, _FLIP),
+]
+inverse_maps: List[Dict[str, str]] = [
+    {moved: direction for direction, moved in mapping.items()} for mapping in move_maps
+]
+
+
+def canonical(packed: int) -> Tuple[int, int]:
+    """
+    Returns the canonical form of a packed 4x4 board: the smallest of its 8 transforms.
+
+    Args:
+        packed (int): The packed board.
+
+    Returns:
+        Tuple[int, int]: The canonical board and the transform producing it; a move d
+            on the board is move_maps[transform][d] on the canonical board.
+    """
+    boards = transforms(packed)
+    best = min(boards)
+    return best, boards.index(best)
+
+
+def canonical_array(packed: npt.ArrayLike) -> npt.NDArray[np.uint64]:
+    """
+    Canonicalizes many packed 4x4 boards at once.
+
+    Args:
+        packed (npt.ArrayLike): Packed boards, converted to uint64.
+
+    Returns:
+        npt.NDArray[np.uint64]: The canonical form of every board.
+    """
+    boards = np.asarray(packed, dtype=np.uint64)
+    return cast(npt.NDArray[np.uint64], np.minimum.reduce(transforms(boards)))
+
+
+def canonical_board(board: Sequence[Sequence[int]]) -> Tuple[Tuple[Tuple[int, ...], ...], int]:
+    """
+    Returns the canonical form of a board of any size: the smallest of its 8 transforms.
+
+    The transforms are numbered as for packed boards, so move_maps applies, but
+    boards are compared row by row as tile values; the canonical transform of a
+    4x4 board can differ from canonical()'s, which compares packed integers.
+
+    Args:
+        board (Sequence[Sequence[int]]): The board as rows of tile values.
+
+    Returns:
+        Tuple[Tuple[Tuple[int, ...], ...], int]: The canonical board as nested tuples
+            and the transform producing it.
+    """
+    rows = tuple(tuple(row) for row in board)
+    mirrored = tuple(row[::-1] for row in rows)
+    transposed = tuple(zip(*rows))
+    both = tuple(row[::-1] for row in transposed)
+    boards = [
+        rows,
+        mirrored,
+        rows[::-1],
+        mirrored[::-1],
+        transposed,
+        both,
+        transposed[::-1],
+        both[::-1],
+    ]
+    best = min(boards)
+    return best, boards.index(best)
+
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_UINT64 = (1 << 64) - 1
+
+
+class StateIndex:
+    """
+    Counts visits to positions up to symmetry in a bounded open-addressing hash table.
+
+    Positions are stored as canonical packed boards in two NumPy arrays, 8 bytes
+    of key and 4 of count per slot, and the table doubles as it fills until it
+    can hold max_states positions at a load of at most 3/4. Positions first seen
+    after that are not stored; their visits are counted in ``dropped``.
+
+    Positions added one at a time are buffered and inserted in batches, each
+    batch canonicalized and probed with vectorized NumPy operations.
+
+    Attributes:
+        max_states (int): The largest number of distinct positions stored.
+    """
+
+    __slots__ = (
+        "max_states",
+        "_visits",
+        "_dropped",
+        "_keys",
+        "_counts",
+        "_size",
+        "_zero",
+        "_pending",
+    )
+
+    # Positions buffered by add() before they are inserted.
+    batch_size = 1 << 16
+
+    def __init__(self, max_states: int = 1 << 24, initial_capacity: int = 1 << 12) -> None:
+        """
+        Creates an empty index.
+
+        Args:
+            max_states (int): The largest number of distinct positions stored.
+            initial_capacity (int): The starting number of slots, rounded up to a power of two.
+        """
+        if max_states < 1:
+            raise ValueError("The index must hold at least one position.")
+        self.max_states = max_states
+        self._visits = 0
+        self._dropped = 0
+        capacity = 1 << max(initial_capacity - 1, 1).bit_length()
+        self._keys = np.zeros(capacity, dtype=np.uint64)
+        self._counts = np.zeros(capacity, dtype=np.uint32)
+        self._size = 0
+        # The empty board packs to 0, the empty slot marker, so it is counted apart.
+        self._zero = 0
+        self._pending: List[int] = []
+
+    def __len__(self) -> int:
+        """Returns the number of distinct positions stored."""
+        self._flush()
+        return self._size + (self._zero > 0)
+
+    @property
+    def visits(self) -> int:
+        """Returns the number of positions added, including repeats and dropped ones."""
+        self._flush()
+        return self._visits
+
+    @property
+    def dropped(self) -> int:
+        """Returns the visits to positions that did not fit in the index."""
+        self._flush()
+        return self._dropped
+
+    def memory_usage(self) -> int:
+        """Returns the bytes held by the hash table."""
+        return self._keys.nbytes + self._counts.nbytes
+
+    def add(self, packed: int) -> None:
+        """
+        Records a visit to a position.
+
+        Args:
+            packed (int): The packed board, in any of its 8 symmetric forms.
+        """
+        self._pending.append(packed)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def add_many(self, packed: npt.ArrayLike) -> None:
+        """
+        Records visits to many positions.
+
+        Args:
+            packed (npt.ArrayLike): The packed boards, in any of their symmetric forms.
+        """
+        keys = canonical_array(packed).ravel()
+        self._visits += len(keys)
+        zero = keys == 0
+        if zero.any():
+            self._zero += int(zero.sum())
+            keys = keys[~zero]
+        unique, counts = np.unique(keys, return_counts=True)
+        self._reserve(len(unique))
+        self._insert(unique, counts.astype(np.uint32))
+
+    def count(self, packed: int) -> int:
+        """
+        Returns how often a position or any of its symmetric forms was visited.
+
+        Args:
+            packed (int): The packed board.
+        """
+        self._flush()
+        key = canonical(packed)[0]
+        if key == 0:
+            return self._zero
+        keys = self._keys
+        mask = len(keys) - 1
+        slot = self._slot(key)
+        while True:
+            found = int(keys[slot])
+            if found == key:
+                return int(self._counts[slot])
+            if found == 0:
+                return 0
+            slot = (slot + 1) & mask
+
+    def __contains__(self, packed: object) -> bool:
+        return isinstance(packed, int) and self.count(packed) > 0
+
+    def arrays(self) -> Tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint32]]:
+        """
+        Returns the stored canonical positions and their visit counts.
+
+        Returns:
+            Tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint32]]: Copies of the keys and
+                counts, in table order.
+        """
+        self._flush()
+        used = self._keys != 0
+        keys, counts = self._keys[used], self._counts[used]
+        if self._zero:
+            keys = np.append(keys, np.uint64(0))
+            counts = np.append(counts, np.uint32(self._zero))
+        return keys, counts
+
+    def _flush(self) -> None:
+        """Inserts the positions buffered by add()."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.add_many(pending)
+
+    def _slot(self, key: int) -> int:
+        """Returns the home slot of a key by Fibonacci hashing."""
+        return ((key * _HASH_MULTIPLIER) & _UINT64) >> (65 - len(self._keys).bit_length())
+
+    def _slots(self, keys: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+        """Returns the home slots of many keys."""
+        shift = np.uint64(65 - len(self._keys).bit_length())
+        return ((keys * np.uint64(_HASH_MULTIPLIER)) >> shift).astype(np.int64)
+
+    def _reserve(self, new: int) -> None:
+        """Grows the table so that new more positions keep the load at most 3/4."""
+        capacity = len(self._keys)
+        wanted = min(self._size + new, self.max_states)
+        while wanted * 4 > capacity * 3:
+            capacity *= 2
+        if capacity == len(self._keys):
+            return
+        used = self._keys != 0
+        keys, counts = self._keys[used], self._counts[used]
+        self._keys = np.zeros(capacity, dtype=np.uint64)
+        self._counts = np.zeros(capacity, dtype=np.uint32)
+        self._size = 0
+        self._insert(keys, counts)
+
+    def _insert(self, keys: npt.NDArray[np.uint64], counts: npt.NDArray[np.uint32]) -> None:
+        """
+        Adds the counts of distinct non-zero keys by linear probing, all keys at once.
+
+        Every round, keys found in their slot add their count, and keys at an empty
+        slot claim it, one key per slot; the others move on to the next slot.
+        """
+        table, totals = self._keys, self._counts
+        mask = len(table) - 1
+        slots = self._slots(keys)
+        pending = np.arange(len(keys))
+        while len(pending):
+            at = slots[pending]
+            found = table[at]
+            hit = found == keys[pending]
+            totals[at[hit]] += counts[pending[hit]]
+            empty = np.flatnonzero(found == 0)
+            claimed, first = np.unique(at[empty], return_index=True)
+            winners = pending[empty[first]]
+            stored = np.zeros(len(pending), dtype=bool)
+            stored[empty[first]] = True
+            room = self.max_states - self._size
+            if len(winners) > room:
+                # The index is full: the surplus new positions are only counted as dropped.
+                self._dropped += int(counts[winners[room:]].sum())
+                claimed, winners = claimed[:room], winners[:room]
+            table[claimed] = keys[winners]
+            totals[claimed] = counts[winners]
+            self._size += len(winners)
+            moving = ~hit & ~stored & (found != 0)
+            slots[pending[moving]] = (at[moving] + 1) & mask
+            pending = pending[~hit & ~stored]
@@ -1,10 +1,108 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
+
+# Handlers attached so far, by logger name and log file path, so that creating a
+# Logger twice for the same file does not write every record twice.
+_handlers: Dict[Tuple[str, str], logging.Handler] = {}
+
+
+class _MessageQueueHandler(QueueHandler):
+    """
+    A queue handler that leaves formatting to a listener thread.
+
+    The standard handler copies and formats every record before queuing it. This
+    one only merges the message arguments, so that later changes to mutable
+    arguments do not show in the log, and queues the record itself. The listener
+    thread is started by the first record, so loggers that never log cost no thread.
+    """
+
+    def __init__(self, *targets: logging.Handler) -> None:
+        super().__init__(queue.SimpleQueue())
+        self.targets = targets
+        self.listener: Optional[QueueListener] = None
+        _queued.append(self)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Called with the handler lock held, so only one thread starts the listener.
+        if self.listener is None:
+            self.listener = _FlushingQueueListener(
+                self.queue, *self.targets, respect_handler_level=True
+            )
+            self.listener.start()
+        super().enqueue(record)
+
+    def flush(self) -> None:
+        """Waits until the listener has written every queued record."""
+        self.acquire()
+        try:
+            if self.listener is not None:
+                # Stopping drains the queue; the next record starts a new listener.
+                self.listener.stop()
+                self.listener = None
+            for target in self.targets:
+                target.flush()
+        finally:
+            self.release()
+
+
+# Every queue handler, for flushing at exit and resetting in forked children.
+_queued: List[_MessageQueueHandler] = []
+
+
+class _QueuedFileHandler(RotatingFileHandler):
+    """
+    A rotating file handler for the listener thread.
+
+    Records are written to the buffered file without flushing, which the
+    listener does once its queue is empty, and the file size is counted
+    instead of asked from the file before every record.
+    """
+
+    _size = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            text = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+                self._size = self.stream.tell()
+            if self.maxBytes > 0 and self._size and self._size + len(text) >= self.maxBytes:
+                self.doRollover()
+                self.stream = self._open()
+                self._size = 0
+            self.stream.write(text)
+            self._size += len(text)
+        except Exception:
+            self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """A queue listener that flushes its handlers whenever it has caught up."""
+
+    queue: "queue.SimpleQueue[logging.LogRecord]"
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
 
 
 class Logger:
     """
     A utility class for setting up and managing logging with rotating files.
+
+    In queue mode the logger only puts records on an in-memory queue, and a
+    background thread formats them and writes them to the file, so the thread
+    that logs never waits for disk I/O.
     """
 
     def __init__(
@@ -12,8 +110,9 @@ class Logger:
         name: str,
         log_file: str,
         level: int = logging.DEBUG,
-        max_bytes: int = 10000,
+        max_bytes: int = 10 * 1024 * 1024,
         backup_count: int = 3,
+        use_queue: bool = False,
     ):
         """
         Initialize the Logger instance.
@@ -22,14 +121,22 @@ class Logger:
             name (str): The name of the logger.
             log_file (str): The file where logs will be written.
             level (int): The logging level (default is logging.DEBUG).
-            max_bytes (int): The maximum file size in bytes before rotation (default is 10,000).
+            max_bytes (int): The maximum file size in bytes before rotation (default is 10 MiB).
             backup_count (int): The number of backup files to keep (default is 3).
+            use_queue (bool): Write records to the file from a background thread.
         """
         self.logger: logging.Logger = logging.getLogger(name)
         self.logger.setLevel(level)
 
-        # Create a rotating file handler
-        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+        key = (name, os.path.abspath(log_file))
+        if key in _handlers:
+            return
+
+        # Create a rotating file handler; the file is opened on the first record.
+        file_class = _QueuedFileHandler if use_queue else RotatingFileHandler
+        file_handler = file_class(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, delay=True
+        )
         file_handler.setLevel(level)
 
         # Create a formatter and set it for the handler
@@ -38,8 +145,13 @@ class Logger:
         )
         file_handler.setFormatter(formatter)
 
+        handler: logging.Handler = file_handler
+        if use_queue:
+            handler = _MessageQueueHandler(file_handler)
+
         # Add the handler to the logger
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(handler)
+        _handlers[key] = handler
 
     def get_logger(self) -> logging.Logger:
         """
@@ -49,3 +161,23 @@ class Logger:
             logging.Logger: The configured logger.
         """
         return self.logger
+
+
+def flush_logs() -> None:
+    """
+    Write out every record queued so far, e.g. before reading the log file.
+    """
+    for handler in _queued:
+        handler.flush()
+
+
+def _reset_after_fork() -> None:
+    """Gives a forked child empty queues; fork does not copy the listener threads."""
+    for handler in _queued:
+        handler.queue = queue.SimpleQueue()
+        handler.listener = None
+
+
+atexit.register(flush_logs)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
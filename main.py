@@ -1,34 +1,96 @@
-from game2048.db import DatabaseManager
-from game2048.game import Game2048
-from game2048.manager import GameManager
+import argparse
+from contextlib import nullcontext
+from typing import ContextManager, List, Optional
 
 
-def main() -> None:
+# Scores that could not reach the database are kept here until the next run.
+spool_path = "scores.spool"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     Main entry point for running the 2048 game.
 
-    - Initializes the game board and manager.
+    - Initializes the game board and manager, with undo (U) and redo (R).
     - Runs the game loop.
-    - Saves the score to the database.
-    - Displays the leaderboard.
+    - Saves the score to the database in the background.
+    - Displays the top of the leaderboard and the player's rank.
+
+    With --profile, the session runs under cProfile and the hot-path timers, and
+    the profile and a latency summary are written at exit. With --headless, the
+    game is played in the terminal instead, without pygame or the leaderboard.
 
+    pygame, the database driver and the profiler are imported only by the modes
+    that use them, so starting the headless game does not pay for them.
+
+    Args:
+        argv (Optional[List[str]]): The command line arguments, sys.argv by default.
     """
+    parser = argparse.ArgumentParser(description="Play 2048.")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="game2048.prof",
+        metavar="PATH",
+        help="write cProfile statistics to PATH (default game2048.prof) and print latencies",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="play in the terminal, reading moves from stdin, without saving the score",
+    )
+    args = parser.parse_args(argv)
+    session: ContextManager[None] = nullcontext()
+    if args.profile:
+        from game2048 import profiling
+
+        session = profiling.profile_session(args.profile)
+    with session:
+        if args.headless:
+            from game2048 import console
+
+            console.main([])
+        else:
+            play()
+
+
+def play() -> None:
+    """Plays one game and saves its score."""
+    from game2048.game import Game2048
+    from game2048.history import GameHistory
+    from game2048.manager import GameManager
+    from game2048.storage import close_storage, open_storage
+    from game2048.submitter import ScoreSubmitter
+
     size = 4
     name = input("Enter your name: ").strip() or "Anonymous"
+    # Connects and sends spooled scores from earlier runs while the game is played.
+    submitter = ScoreSubmitter(spool_path=spool_path)
     game = Game2048(size)
-    manager = GameManager(game)
+    manager = GameManager(game, history=GameHistory(game))
     manager.run()
     score = game.score
     print(f"Game over! Final score for {name}: {score}")
-    db = DatabaseManager()
+    submitter.submit(name, score)
     try:
-        db.update_or_create_row(name, score)
-        rows = db.get_all_rows()
-        for index, row in enumerate(rows, 1):
-            name, score = row
-            print(f"{index}. {name} has score {score}")
+        if not submitter.close(timeout=5.0):
+            print(f"The leaderboard is unavailable; your score was saved to {spool_path}.")
+            return
+        print(f"Score saved in {submitter.flush_latency * 1000:.0f} ms.")
+        storage = open_storage()
+        try:
+            for index, (leader, best) in enumerate(storage.get_top(10), 1):
+                print(f"{index}. {leader} has score {best}")
+            rank = storage.get_rank(name)
+            if rank is not None:
+                print(f"{name} is ranked #{rank}")
+        finally:
+            storage.close()
+    except Exception as e:
+        # The score is already saved; only the leaderboard display failed.
+        print(f"The leaderboard could not be shown: {e}")
     finally:
-        db.close()
+        close_storage()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
+import random
 import unittest
 from unittest.mock import patch
 
 from game2048.game import Game2048
+from game2048.rng import GameRNG
 
 
 class TestGame2048(unittest.TestCase):
@@ -63,6 +65,18 @@ class TestGame2048(unittest.TestCase):
         self.assertTrue(changed)
         self.assertEqual(self.game.board, expected)
 
+    def test_move_right_unchanged(self) -> None:
+        """Test that a right move which moves nothing reports no change."""
+        self.game._board = [
+            [0, 0, 2, 8],
+            [0, 0, 0, 4],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+        ]
+        changed = self.game.move_right()
+        self.assertFalse(changed)
+        self.assertEqual(self.game.board[0], [0, 0, 2, 8])
+
     def test_move_up(self) -> None:
         """Test moving tiles up."""
         self.game._board = [
@@ -109,11 +123,53 @@ class TestGame2048(unittest.TestCase):
         ]
         self.assertTrue(self.game.is_game_over())
 
-    @patch("random.choice", side_effect=[(0, 0), (1, 1)])
-    @patch("random.random", side_effect=[0.1, 0.9])
-    def test_initialize_board(self, mock_random: patch, mock_choice: patch) -> None:
+    def test_afterstates(self) -> None:
+        """Test that afterstates match every move without mutating the game."""
+        self.game._board = [row[:] for row in self.initial_board]
+        self.game._score = 0
+        states = Game2048.afterstates(self.game.board)
+        self.assertEqual(self.game.board, self.initial_board)
+        self.assertEqual(self.game.score, 0)
+        for direction, state in states.items():
+            game = Game2048(4)
+            game._board = [row[:] for row in self.initial_board]
+            game._score = 0
+            self.assertEqual(game.move(direction), state.changed)
+            self.assertEqual(game.board, state.board)
+            self.assertEqual(game.score, state.gain)
+
+    def test_game_over_matches_afterstates(self) -> None:
+        """Test that the early-exit game over check agrees with the afterstates."""
+        rnd = random.Random(1)
+        for _ in range(300):
+            board = [[rnd.choice([0, 2, 4, 8, 16]) for _ in range(4)] for _ in range(4)]
+            if rnd.random() < 0.7:
+                board = [[cell or rnd.choice([2, 4]) for cell in row] for row in board]
+            self.game._board = board
+            stuck = not any(state.changed for state in self.game.get_afterstates().values())
+            self.assertEqual(self.game.is_game_over(), stuck)
+
+    def test_afterstates_unchanged(self) -> None:
+        """Test that moves which move nothing are flagged as unchanged."""
+        board = [
+            [2, 4, 0, 0],
+            [4, 2, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+        ]
+        states = Game2048.afterstates(board)
+        self.assertFalse(states["left"].changed)
+        self.assertFalse(states["up"].changed)
+        self.assertTrue(states["right"].changed)
+        self.assertTrue(states["down"].changed)
+        self.assertEqual(states["left"].gain, 0)
+
+    def test_initialize_board(self) -> None:
         """Test that the board initializes correctly with predictable random values."""
-        game = Game2048(4)
+        with patch.object(GameRNG, "below", side_effect=[0, 5]), patch.object(
+            GameRNG, "tile", side_effect=[2, 4]
+        ):
+            game = Game2048(4, GameRNG(0))
         expected = [
             [2, 0, 0, 0],
             [0, 4, 0, 0],
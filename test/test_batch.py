@@ -0,0 +1,86 @@
+import random
+import unittest
+from typing import List
+
+import numpy as np
+
+from game2048.batch import BatchGame2048
+from game2048.game import DIRECTIONS, Game2048
+
+
+def random_board(rnd: random.Random, size: int) -> List[List[int]]:
+    """Builds a random board with a mix of empty cells and small tiles."""
+    return [[rnd.choice([0, 0, 2, 2, 4, 8, 16]) for _ in range(size)] for _ in range(size)]
+
+
+class TestBatchGame2048(unittest.TestCase):
+    def test_initial_boards(self) -> None:
+        """Test that every board starts with exactly two tiles."""
+        batch = BatchGame2048(50, seed=1)
+        self.assertTrue(np.all(np.count_nonzero(batch.boards, axis=(1, 2)) == 2))
+        self.assertTrue(np.all(batch.scores == 0))
+
+    def test_move_matches_scalar_engine(self) -> None:
+        """Test that moves, scores and changed flags match Game2048 for every game."""
+        rnd = random.Random(7)
+        for size in (2, 4, 5):
+            boards = [random_board(rnd, size) for _ in range(200)]
+            moves = [rnd.randrange(len(DIRECTIONS)) for _ in boards]
+            batch = BatchGame2048(1, board_size=size, seed=0)
+            batch.load_boards(boards)
+            gains, changed = batch.move(moves)
+            results = batch.boards
+            game = Game2048(size)
+            for i, board in enumerate(boards):
+                game._board = [row[:] for row in board]
+                game._score = 0
+                self.assertEqual(game.move(DIRECTIONS[moves[i]]), bool(changed[i]))
+                self.assertEqual(game.board, results[i].tolist())
+                self.assertEqual(game.score, gains[i])
+
+    def test_game_over_matches_scalar_engine(self) -> None:
+        """Test that game-over detection matches Game2048."""
+        rnd = random.Random(3)
+        boards = [[[rnd.choice([2, 4, 8]) for _ in range(4)] for _ in range(4)] for _ in range(300)]
+        boards.append([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]])
+        batch = BatchGame2048(1, seed=0)
+        batch.load_boards(boards)
+        over = batch.is_game_over()
+        game = Game2048(4)
+        for i, board in enumerate(boards):
+            game._board = board
+            self.assertEqual(game.is_game_over(), bool(over[i]))
+        self.assertTrue(over.any() and not over.all())
+
+    def test_load_boards_checks_scores(self) -> None:
+        """Test that scores must match the number of boards."""
+        batch = BatchGame2048(1, seed=0)
+        with self.assertRaises(ValueError):
+            batch.load_boards([[[2, 0], [0, 0]], [[0, 2], [0, 0]]], scores=[4])
+
+    def test_step_spawns_only_on_change(self) -> None:
+        """Test that a tile is spawned exactly on the boards that changed."""
+        batch = BatchGame2048(2, seed=5)
+        batch.load_boards(
+            [
+                [[2, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
+                [[0, 0, 0, 2], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
+            ]
+        )
+        _, changed, over = batch.step([0, 0])
+        self.assertEqual(changed.tolist(), [False, True])
+        self.assertEqual(np.count_nonzero(batch.boards, axis=(1, 2)).tolist(), [1, 2])
+        self.assertFalse(over.any())
+
+    def test_games_finish(self) -> None:
+        """Test that random play drives every game to game over."""
+        batch = BatchGame2048(64, seed=11)
+        rng = np.random.default_rng(11)
+        over = batch.is_game_over()
+        while not over.all():
+            _, _, over = batch.step(rng.integers(0, 4, batch.count))
+        self.assertTrue(np.all(batch.scores > 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
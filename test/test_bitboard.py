@@ -0,0 +1,120 @@
+import random
+import unittest
+from typing import List, Tuple
+
+from game2048.bitboard import BitboardGame2048, pack, transpose, unpack
+from game2048.game import Game2048
+from game2048.rng import GameRNG
+
+
+def play_random_game(
+    game: Game2048, seed: int
+) -> List[Tuple[str, bool, int, List[List[int]], List[Tuple[int, int]]]]:
+    """Plays a seeded random game and returns the trace of boards, scores and flags."""
+    moves = random.Random(seed)
+    trace = []
+    while not game.is_game_over():
+        direction = moves.choice(["left", "right", "up", "down"])
+        changed = game.move(direction)
+        if changed:
+            game.insert_random_tile()
+        trace.append((direction, changed, game.score, game.board, game.get_empty_cells()))
+    return trace
+
+
+class TestBitboard(unittest.TestCase):
+    def setUp(self) -> None:
+        self.game = BitboardGame2048(4)
+        self.initial_board = [
+            [2, 2, 4, 4],
+            [0, 0, 0, 2],
+            [2, 0, 2, 0],
+            [0, 0, 0, 0],
+        ]
+
+    def test_pack_roundtrip(self) -> None:
+        """Test that packing and unpacking preserves the board."""
+        board = [
+            [2, 4, 8, 16],
+            [32, 64, 128, 256],
+            [512, 1024, 2048, 4096],
+            [8192, 16384, 32768, 0],
+        ]
+        self.assertEqual(unpack(pack(board)), board)
+
+    def test_pack_rejects_invalid_tiles(self) -> None:
+        """Test that tiles outside the 4-bit exponent range are rejected."""
+        with self.assertRaises(ValueError):
+            pack([[3, 0, 0, 0], [0] * 4, [0] * 4, [0] * 4])
+        with self.assertRaises(ValueError):
+            pack([[65536, 0, 0, 0], [0] * 4, [0] * 4, [0] * 4])
+
+    def test_transpose(self) -> None:
+        """Test that transpose swaps rows and columns."""
+        board = [[2 ** (4 * row + col + 1) % 65536 for col in range(4)] for row in range(4)]
+        expected = [list(column) for column in zip(*board)]
+        self.assertEqual(unpack(transpose(pack(board))), expected)
+
+    def test_rejects_other_sizes(self) -> None:
+        """Test that only 4x4 boards are supported."""
+        with self.assertRaises(ValueError):
+            BitboardGame2048(5)
+
+    def test_move_left(self) -> None:
+        """Test moving tiles to the left."""
+        self.game._bits = pack(self.initial_board)
+        self.game._score = 0
+        changed = self.game.move_left()
+        expected = [
+            [4, 8, 0, 0],
+            [2, 0, 0, 0],
+            [4, 0, 0, 0],
+            [0, 0, 0, 0],
+        ]
+        self.assertTrue(changed)
+        self.assertEqual(self.game.board, expected)
+        self.assertEqual(self.game.score, 16)
+
+    def test_game_over(self) -> None:
+        """Test the game over condition."""
+        self.game._bits = pack(
+            [
+                [2, 4, 2, 4],
+                [4, 2, 4, 2],
+                [2, 4, 2, 4],
+                [4, 2, 4, 2],
+            ]
+        )
+        self.assertTrue(self.game.is_game_over())
+
+    def test_get_afterstates(self) -> None:
+        """Test that the bitboard afterstates match the list engine."""
+        self.game.load_board(self.initial_board)
+        list_game = Game2048(4)
+        list_game.load_board(self.initial_board)
+        self.assertEqual(self.game.get_afterstates(), list_game.get_afterstates())
+
+    def test_matches_list_engine(self) -> None:
+        """Test that both engines produce identical games from the same random stream."""
+        start = [
+            [0, 2, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 4, 0],
+            [0, 0, 0, 0],
+        ]
+        for seed in range(5):
+            list_game = Game2048(4, GameRNG(seed))
+            list_game._board = [row[:] for row in start]
+            list_game._score = 0
+            list_trace = play_random_game(list_game, seed)
+
+            bit_game = BitboardGame2048(4, GameRNG(seed))
+            bit_game._bits = pack(start)
+            bit_game._score = 0
+            bit_trace = play_random_game(bit_game, seed)
+
+            self.assertEqual(list_trace, bit_trace)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import random
+import unittest
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from game2048.cache import LeaderboardCache
+from game2048.db import DatabaseManager
+
+
+class FakeDatabase(DatabaseManager):
+    """An in-memory stand-in for DatabaseManager that counts queries."""
+
+    def __init__(self) -> None:
+        self.pool = None
+        self.connection = None
+        self.scores: Dict[str, int] = {}
+        self.queries = 0
+
+    def _rows(self) -> List[Tuple[str, int]]:
+        return sorted(self.scores.items(), key=lambda row: (-row[1], row[0]))
+
+    def get_top(self, k: int = 10, offset: int = 0) -> List[Tuple[str, int]]:
+        self.queries += 1
+        end = offset + k
+        return self._rows()[offset:end]
+
+    def get_all_rows(self) -> List[Tuple[str, int]]:
+        self.queries += 1
+        return self._rows()
+
+    def get_row(self, name: str) -> Optional[Tuple[str, int]]:
+        self.queries += 1
+        return (name, self.scores[name]) if name in self.scores else None
+
+    def update_or_create_row(self, name: str, score: int) -> Optional[int]:
+        self.scores[name] = max(score, self.scores.get(name, score))
+        return self.scores[name]
+
+    def submit_scores(self, scores: Iterable[Tuple[str, int]], page_size: int = 10000) -> int:
+        names = set()
+        for name, score in scores:
+            self.update_or_create_row(name, score)
+            names.add(name)
+        return len(names)
+
+
+class TestLeaderboardCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.db = FakeDatabase()
+        for index in range(10):
+            self.db.scores[f"user{index}"] = index * 10
+        self.cache = LeaderboardCache(self.db, top_size=5, ttl=10.0, clock=lambda: self.now)
+
+    def test_reads_hit_until_ttl(self) -> None:
+        """Test that repeated reads are served from the cache until they expire."""
+        top = self.cache.get_top(3)
+        self.assertEqual(top, [("user9", 90), ("user8", 80), ("user7", 70)])
+        for _ in range(9):
+            self.assertEqual(self.cache.get_top(3), top)
+        self.assertEqual((self.cache.hits, self.cache.misses), (9, 1))
+        self.assertEqual(self.db.queries, 1)
+        self.assertAlmostEqual(self.cache.hit_rate, 0.9)
+        self.now = 10.0
+        self.cache.get_top(3)
+        self.assertEqual(self.db.queries, 2)
+
+    def test_get_row_caches_missing_users(self) -> None:
+        """Test that per-user lookups, including misses, are cached."""
+        self.assertEqual(self.cache.get_row("user3"), ("user3", 30))
+        self.assertEqual(self.cache.get_row("user3"), ("user3", 30))
+        self.assertIsNone(self.cache.get_row("nobody"))
+        self.assertIsNone(self.cache.get_row("nobody"))
+        self.assertEqual(self.db.queries, 2)
+
+    def test_writes_update_cache_in_place(self) -> None:
+        """Test that a write reorders the snapshot without another query."""
+        self.cache.get_top(5)
+        self.cache.get_row("user1")
+        self.assertEqual(self.cache.update_or_create_row("user1", 85), 85)
+        self.assertEqual(self.cache.get_top(3), [("user9", 90), ("user1", 85), ("user8", 80)])
+        self.assertEqual(self.cache.get_row("user1"), ("user1", 85))
+        # A lower score does not lower the best one.
+        self.cache.update_or_create_row("user9", 1)
+        self.assertEqual(self.cache.get_top(1), [("user9", 90)])
+        self.assertEqual(self.db.queries, 2)
+
+    def test_bypasses_cache_beyond_top_size(self) -> None:
+        """Test that pages larger than the snapshot go to the database."""
+        self.assertEqual(len(self.cache.get_top(8)), 8)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_all_rows_from_complete_snapshot(self) -> None:
+        """Test that a snapshot holding the whole table answers full reads."""
+        cache = LeaderboardCache(self.db, top_size=50, clock=lambda: self.now)
+        rows = cache.get_all_rows()
+        self.assertEqual(cache.get_all_rows(), rows)
+        cache.update_or_create_row("new", 55)
+        self.assertEqual(cache.get_all_rows(), self.db._rows())
+        self.assertEqual(self.db.queries, 1)
+
+    def test_matches_database_under_random_writes(self) -> None:
+        """Test that write-through patching keeps the cache equal to the database."""
+        rnd = random.Random(3)
+        self.cache.ttl = float("inf")
+        for _ in range(500):
+            name = f"user{rnd.randrange(15)}"
+            operation = rnd.random()
+            if operation < 0.4:
+                self.cache.update_or_create_row(name, rnd.randrange(120))
+            elif operation < 0.6:
+                batch = [(f"user{rnd.randrange(15)}", rnd.randrange(120)) for _ in range(3)]
+                self.cache.submit_scores(batch)
+            elif operation < 0.8:
+                self.assertEqual(self.cache.get_row(name), self.db.get_row(name))
+            else:
+                self.assertEqual(self.cache.get_top(5), self.db.get_top(5))
+        self.assertGreater(self.cache.hit_rate, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
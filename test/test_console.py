@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from game2048 import console
+from game2048.game import Game2048
+from game2048.rng import GameRNG
+
+root = Path(__file__).resolve().parent.parent
+
+
+class TestConsole(unittest.TestCase):
+    def test_parse(self) -> None:
+        """Test that a line holds one word or any number of letters."""
+        self.assertEqual(console.parse("Left\n"), ["left"])
+        self.assertEqual(console.parse("wasd"), ["up", "left", "down", "right"])
+        self.assertEqual(console.parse("u x r"), ["undo", "redo"])
+        self.assertEqual(console.parse(""), [])
+
+    def test_render(self) -> None:
+        """Test that tiles are right-aligned and empty cells drawn as dots."""
+        game = Game2048(2, GameRNG(0))
+        game.load_board([[2, 0], [0, 128]], 12)
+        self.assertEqual(console.render(game), "  2   .\n  . 128\nScore: 12")
+
+    def test_play_matches_moves(self) -> None:
+        """Test that piped commands play the same game as the moves themselves."""
+        game = Game2048(4, GameRNG(3))
+        expected = Game2048(4, GameRNG(3))
+        for direction in ("left", "up", "right", "down"):
+            if expected.move(direction):
+                expected.insert_random_tile()
+        out = StringIO()
+        score = console.play(game, StringIO("a\nw\nd\ns\n"), out, quiet=True)
+        self.assertEqual(game.board, expected.board)
+        self.assertEqual(score, expected.score)
+        self.assertIn(f"Final score: {expected.score}", out.getvalue())
+
+    def test_undo_redo_and_quit(self) -> None:
+        """Test that u and r step through the history and q stops reading."""
+        game = Game2048(4, GameRNG(5))
+        start = [row[:] for row in game.board]
+        console.play(game, StringIO("a\nu\n"), StringIO(), quiet=True)
+        self.assertEqual(game.board, start)
+        console.play(game, StringIO("q\na\n"), StringIO(), quiet=True)
+        self.assertEqual(game.board, start)
+
+    def test_play_until_game_over(self) -> None:
+        """Test that play stops at game over and says so."""
+        game = Game2048(4, GameRNG(0))
+        out = StringIO()
+        console.play(game, StringIO("wasd\n" * 2000), out)
+        self.assertTrue(game.is_game_over())
+        self.assertIn("Game over!", out.getvalue())
+
+    def test_headless_import_is_light(self) -> None:
+        """Test that the headless modules load no GUI, database or array library."""
+        code = (
+            "import sys, threading, game2048.console, game2048.selfplay, main; "
+            "print(sorted(m for m in ('pygame', 'psycopg2', 'dotenv', 'numpy') "
+            "if m in sys.modules), threading.active_count())"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=str(root))
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=directory,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            self.assertEqual(result.stdout.split(), ["[]", "1"])
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_headless_profile_is_light(self) -> None:
+        """Test that profiling the headless game loads no GUI or database module."""
+        code = (
+            "import sys, main; main.main(['--headless', '--profile', 'game.prof']); "
+            "print(sorted(m for m in ('pygame', 'psycopg2', 'dotenv') if m in sys.modules))"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=str(root))
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=directory,
+                env=env,
+                input="q\n",
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            self.assertEqual(result.stdout.splitlines()[-1], "[]")
+            self.assertIn("Game2048.is_game_over", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
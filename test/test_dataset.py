@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from typing import List
+
+import numpy as np
+import numpy.typing as npt
+
+from game2048 import dataset
+from game2048.game import DIRECTIONS, Game2048
+from game2048.selfplay import play_game
+
+
+def to_board(exponents: npt.NDArray[np.uint8], size: int) -> List[List[int]]:
+    """Turns a row of exponent bytes back into a board."""
+    tiles = [1 << int(e) if e else 0 for e in exponents]
+    return [tiles[start:][:size] for start in range(0, size * size, size)]
+
+
+class TestTransitions(unittest.TestCase):
+    def test_transitions_follow_the_rules(self) -> None:
+        """Test that every transition is its move's afterstate plus one spawned tile."""
+        transitions = dataset.play_transitions(7, "greedy", 4, "list")
+        self.assertGreater(len(transitions), 0)
+        for row in transitions:
+            state = Game2048.afterstates(to_board(row["board"], 4))[DIRECTIONS[row["action"]]]
+            self.assertTrue(state.changed)
+            self.assertEqual(row["reward"], state.gain)
+            after = np.array([v.bit_length() - 1 if v else 0 for r in state.board for v in r])
+            spawned = np.flatnonzero(after != row["next_board"])
+            self.assertEqual(len(spawned), 1)
+            self.assertEqual(after[spawned[0]], 0)
+            self.assertIn(row["next_board"][spawned[0]], (1, 2))
+        np.testing.assert_array_equal(transitions["board"][1:], transitions["next_board"][:-1])
+        self.assertEqual(transitions["done"].tolist(), [False] * (len(transitions) - 1) + [True])
+
+    def test_engines_and_selfplay_agree(self) -> None:
+        """Test that a seed yields the same game on both engines and in play_game."""
+        bits = dataset.play_transitions(3, "random", 4, "bitboard")
+        lists = dataset.play_transitions(3, "random", 4, "list")
+        np.testing.assert_array_equal(bits, lists)
+        result = play_game(0, 3, "random", 4, "list")
+        self.assertEqual(len(bits), result.moves)
+        self.assertEqual(int(bits["reward"].sum()), result.score)
+
+    def test_generate_is_independent_of_workers(self) -> None:
+        """Test that a pool yields the same games in the same order."""
+        serial = list(dataset.generate(6, seed=10, workers=1))
+        pooled = list(dataset.generate(6, seed=10, workers=2))
+        self.assertEqual(len(pooled), 6)
+        for one, other in zip(serial, pooled):
+            np.testing.assert_array_equal(one, other)
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self) -> None:
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = os.path.join(temporary.name, "data")
+        self.games = list(dataset.generate(20, seed=0))
+        self.everything = np.concatenate(self.games)
+        self.dtype = dataset.transition_dtype(4)
+
+    def write(self, games: List[npt.NDArray[np.void]], max_bytes: int) -> None:
+        with dataset.ShardWriter(self.directory, 4, max_bytes) as writer:
+            for transitions in games:
+                writer.write(transitions)
+
+    def test_shards_are_bounded_and_complete(self) -> None:
+        """Test that shards respect the size bound and hold every transition in order."""
+        max_bytes = 500 * self.dtype.itemsize
+        self.write(self.games, max_bytes)
+        with dataset.ShardReader(self.directory) as reader:
+            self.assertEqual(len(reader), len(self.everything))
+            self.assertEqual(len(reader.shards), -(-len(self.everything) // 500))
+            for shard in reader.shards:
+                self.assertIsInstance(shard, np.memmap)
+                self.assertLessEqual(len(shard), 500)
+            np.testing.assert_array_equal(np.concatenate(list(reader.batches(64))), self.everything)
+            self.assertEqual(reader[-1], self.everything[-1])
+            with self.assertRaises(IndexError):
+                reader[len(reader)]
+
+    def test_shards_are_plain_npy_files(self) -> None:
+        """Test that a finished shard loads with np.load and has no trailing capacity."""
+        self.write(self.games, 1 << 20)
+        path = os.path.join(self.directory, dataset.SHARD_NAME.format(0))
+        np.testing.assert_array_equal(np.load(path), self.everything)
+        header = np.load(path, mmap_mode="r").offset
+        self.assertEqual(os.path.getsize(path), header + self.everything.nbytes)
+
+    def test_writer_appends(self) -> None:
+        """Test that reopening a dataset adds shards after the existing ones."""
+        self.write(self.games[:10], 1 << 20)
+        self.write(self.games[10:], 1 << 20)
+        with dataset.ShardReader(self.directory) as reader:
+            self.assertEqual(len(reader.shards), 2)
+            np.testing.assert_array_equal(np.concatenate(reader.shards), self.everything)
+        with self.assertRaises(ValueError):
+            dataset.ShardWriter(self.directory, board_size=5)
+
+    def test_sample(self) -> None:
+        """Test that samples come from across shards and without replacement if asked."""
+        self.write(self.games, 300 * self.dtype.itemsize)
+        with dataset.ShardReader(self.directory) as reader:
+            batch = reader.sample(len(reader), np.random.default_rng(0), replace=False)
+            self.assertEqual(batch.dtype, self.dtype)
+            order = np.lexsort(np.column_stack([batch["board"], batch["next_board"]]).T)
+            expected = np.lexsort(
+                np.column_stack([self.everything["board"], self.everything["next_board"]]).T
+            )
+            np.testing.assert_array_equal(batch[order], self.everything[expected])
+
+    def test_rejects_mismatched_input(self) -> None:
+        """Test that a missing index and a foreign dtype are reported."""
+        with self.assertRaises(ValueError):
+            dataset.ShardReader(self.directory)
+        with dataset.ShardWriter(self.directory, 4) as writer:
+            with self.assertRaises(ValueError):
+                writer.write(dataset.play_transitions(0, "random", 3, "list"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import os
+import tempfile
+import unittest
+from typing import BinaryIO
+from unittest.mock import MagicMock, patch
+
+from game2048.db import UPSERT_SCORE_SQL, UPSERT_SCORES_SQL, DatabaseManager
+
+
+class TestDatabaseManager(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = patch("psycopg2.connect")
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection = self.connect.return_value
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        self.db = DatabaseManager()
+
+    def test_update_or_create_row_is_one_upsert(self) -> None:
+        """Test that saving a score is a single atomic statement."""
+        self.cursor.fetchone.return_value = {"scores": 512}
+        self.db.update_or_create_row("alice", 256)
+        self.cursor.execute.assert_called_once_with(UPSERT_SCORE_SQL, ("alice", 256))
+        self.assertIn("ON CONFLICT (name)", UPSERT_SCORE_SQL)
+        self.assertIn("GREATEST", UPSERT_SCORE_SQL)
+        self.connection.commit.assert_called_once()
+
+    def test_update_or_create_row_rolls_back(self) -> None:
+        """Test that a failed upsert rolls the transaction back."""
+        self.cursor.execute.side_effect = RuntimeError("boom")
+        self.db.update_or_create_row("alice", 256)
+        self.connection.rollback.assert_called_once()
+        self.connection.commit.assert_not_called()
+
+    @patch("game2048.db.execute_values")
+    def test_submit_scores_keeps_best_per_name(self, execute_values: MagicMock) -> None:
+        """Test that a batch is reduced to one sorted row per user and sent at once."""
+        count = self.db.submit_scores([("bob", 8), ("alice", 4), ("bob", 32), ("alice", 2)])
+        self.assertEqual(count, 2)
+        execute_values.assert_called_once()
+        _, sql, rows = execute_values.call_args[0]
+        self.assertEqual(sql, UPSERT_SCORES_SQL)
+        self.assertEqual(rows, [("alice", 4), ("bob", 32)])
+        self.connection.commit.assert_called_once()
+
+    @patch("game2048.db.execute_values")
+    def test_submit_scores_empty(self, execute_values: MagicMock) -> None:
+        """Test that an empty batch does not reach the database."""
+        self.assertEqual(self.db.submit_scores([]), 0)
+        execute_values.assert_not_called()
+
+    @patch("game2048.db.execute_values", side_effect=RuntimeError("boom"))
+    def test_submit_scores_rolls_back(self, execute_values: MagicMock) -> None:
+        """Test that a failed batch is rolled back and reported as nothing saved."""
+        self.assertEqual(self.db.submit_scores([("alice", 4)]), 0)
+        self.connection.rollback.assert_called_once()
+
+    def test_create_table_adds_scores_index(self) -> None:
+        """Test that the leaderboard index is created with the table."""
+        self.db.create_table()
+        statements = [call[0][0] for call in self.cursor.execute.call_args_list]
+        self.assertTrue(any("CREATE INDEX IF NOT EXISTS" in sql for sql in statements))
+        self.connection.commit.assert_called_once()
+
+    def test_get_top_is_limited(self) -> None:
+        """Test that the top-K query is bounded by LIMIT and OFFSET."""
+        self.cursor.fetchall.return_value = [{"name": "alice", "scores": 64}]
+        self.assertEqual(self.db.get_top(5, 10), [("alice", 64)])
+        sql, params = self.cursor.execute.call_args[0]
+        self.assertIn("LIMIT %s OFFSET %s", sql)
+        self.assertEqual(params, (5, 10))
+
+    def test_get_page_continues_after_last_row(self) -> None:
+        """Test that keyset pages start strictly after the previous page's last row."""
+        self.cursor.fetchall.return_value = [{"name": "carol", "scores": 32}]
+        self.assertEqual(self.db.get_page(3, after=("bob", 64)), [("carol", 32)])
+        sql, params = self.cursor.execute.call_args[0]
+        self.assertNotIn("OFFSET", sql)
+        self.assertEqual(params, (64, 64, "bob", 3))
+
+    def test_get_rank(self) -> None:
+        """Test that the rank is read from one row and missing users have none."""
+        self.cursor.fetchone.return_value = {"rank": 3}
+        self.assertEqual(self.db.get_rank("alice"), 3)
+        self.cursor.fetchone.return_value = None
+        self.assertIsNone(self.db.get_rank("nobody"))
+
+    def test_iter_rows_uses_server_side_cursor(self) -> None:
+        """Test that exports stream through a named cursor in batches."""
+        self.cursor.__iter__.return_value = iter([{"name": "alice", "scores": 8}])
+        self.assertEqual(list(self.db.iter_rows(batch_size=500)), [("alice", 8)])
+        self.assertIsNotNone(self.connection.cursor.call_args.kwargs["name"])
+        self.assertEqual(self.cursor.itersize, 500)
+        self.connection.commit.assert_called_once()
+
+    def test_iter_rows_errors_are_logged(self) -> None:
+        """Test that a failed stream is logged and ends instead of raising."""
+        self.cursor.execute.side_effect = RuntimeError("boom")
+        with self.assertLogs("game2048.db", "ERROR"):
+            self.assertEqual(list(self.db.iter_rows()), [])
+        self.connection.rollback.assert_called_once()
+
+    def test_iter_rows_holds_the_connection(self) -> None:
+        """Test that other calls fail while the dedicated connection is streaming."""
+        self.cursor.__iter__.return_value = iter([{"name": "alice", "scores": 8}] * 2)
+        self.cursor.fetchall.return_value = [{"name": "alice", "scores": 8}]
+        rows = self.db.iter_rows()
+        self.assertEqual(next(rows), ("alice", 8))
+        with self.assertLogs("game2048.db", "ERROR"):
+            self.assertEqual(self.db.get_top(1), [])
+        self.connection.commit.assert_not_called()
+        self.assertEqual(list(rows), [("alice", 8)])
+        self.assertEqual(self.db.get_top(1), [("alice", 8)])
+
+    def test_export_streams_copy_to_file(self) -> None:
+        """Test that exports stream COPY output straight into the file."""
+        self.cursor.copy_expert.side_effect = lambda sql, file: file.write(b"name,scores\n")
+        self.cursor.rowcount = 1
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.csv")
+            stats = self.db.export_scores(path)
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), b"name,scores\n")
+        assert stats is not None
+        self.assertEqual(stats.rows, 1)
+        sql = self.cursor.copy_expert.call_args[0][0]
+        self.assertIn("TO STDOUT WITH (FORMAT csv, HEADER true)", sql)
+
+    def test_failed_export_keeps_previous_file(self) -> None:
+        """Test that a failed export neither truncates the file nor leaves a temporary one."""
+
+        def fail(sql: str, file: BinaryIO) -> None:
+            file.write(b"name,scores\n")
+            raise RuntimeError("connection lost")
+
+        self.cursor.copy_expert.side_effect = fail
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.csv")
+            with open(path, "wb") as file:
+                file.write(b"name,scores\nalice,8\n")
+            self.assertIsNone(self.db.export_scores(path))
+            with open(path, "rb") as exported:
+                self.assertEqual(exported.read(), b"name,scores\nalice,8\n")
+            self.assertEqual(os.listdir(directory), ["scores.csv"])
+
+    def test_import_merges_keeping_best_score(self) -> None:
+        """Test that imports COPY into a staging table and merge with one upsert."""
+        self.cursor.rowcount = 3
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.bin")
+            with open(path, "wb") as file:
+                file.write(b"PGCOPY")
+            stats = self.db.import_scores(path, "binary")
+        assert stats is not None
+        self.assertEqual(stats.rows, 3)
+        copy_sql = self.cursor.copy_expert.call_args[0][0]
+        self.assertIn("FROM STDIN WITH (FORMAT binary)", copy_sql)
+        statements = [call[0][0] for call in self.cursor.execute.call_args_list]
+        self.assertIn("ON COMMIT DROP", statements[0])
+        self.assertIn("GROUP BY name", statements[1])
+        self.assertIn("GREATEST", statements[1])
+        self.connection.commit.assert_called_once()
+
+    def test_import_failure_rolls_back(self) -> None:
+        """Test that a failed import leaves the table untouched."""
+        self.cursor.copy_expert.side_effect = RuntimeError("bad row")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.csv")
+            open(path, "wb").close()
+            self.assertIsNone(self.db.import_scores(path))
+        self.connection.rollback.assert_called_once()
+
+    def test_unknown_format(self) -> None:
+        """Test that an unknown file format is rejected."""
+        with self.assertRaises(ValueError):
+            self.db.export_scores("scores.xml", "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
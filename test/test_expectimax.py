@@ -0,0 +1,84 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from game2048.bitboard import pack
+from game2048.expectimax import ExpectimaxSolver, count_empty, evaluate
+from game2048.game import Game2048
+
+root = Path(__file__).resolve().parent.parent
+
+
+class TestExpectimax(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = [
+            [2, 4, 8, 16],
+            [0, 2, 4, 8],
+            [0, 0, 2, 4],
+            [0, 0, 0, 2],
+        ]
+
+    def test_count_empty(self) -> None:
+        """Test that empty cells of a packed board are counted."""
+        self.assertEqual(count_empty(pack(self.board)), 6)
+        self.assertEqual(count_empty(0), 16)
+
+    def test_evaluate_prefers_empty_boards(self) -> None:
+        """Test that the heuristic rewards empty cells."""
+        full = pack([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]])
+        self.assertGreater(evaluate(pack(self.board)), evaluate(full))
+
+    def test_depth_adapts_to_empty_cells(self) -> None:
+        """Test that fuller boards are searched deeper."""
+        solver = ExpectimaxSolver(max_depth=3)
+        self.assertEqual(solver.depth_for(0), 1)
+        self.assertEqual(solver.depth_for(pack(self.board)), 2)
+        full = pack([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 0]])
+        self.assertEqual(solver.depth_for(full), 3)
+
+    def test_best_move(self) -> None:
+        """Test that the solver returns a legal move and None once the game is over."""
+        game = Game2048(4)
+        game._board = self.board
+        solver = ExpectimaxSolver(max_depth=2)
+        move = solver.choose(game)
+        assert move is not None
+        self.assertIn(move, {"left", "right", "up", "down"})
+        self.assertTrue(game.move(move))
+        over = pack([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]])
+        self.assertIsNone(solver.best_move(over))
+        self.assertEqual(solver.stats.moves, 2)
+
+    def test_cache_is_bounded(self) -> None:
+        """Test that the transposition table never grows past its size."""
+        solver = ExpectimaxSolver(max_depth=3, cache_size=20)
+        board = pack([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 8, 0], [8, 16, 0, 0]])
+        solver.best_move(board)
+        self.assertLessEqual(solver.table_size, 20)
+        self.assertGreater(solver.stats.evictions, 0)
+        solver.best_move(board)
+        self.assertGreater(solver.stats.hit_rate, 0)
+
+    def test_time_budget(self) -> None:
+        """Test that a tiny time budget still yields a move from the shallowest search."""
+        solver = ExpectimaxSolver(max_depth=6, time_budget=1e-6)
+        board = pack([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 0, 0], [0, 0, 0, 0]])
+        self.assertIsNotNone(solver.best_move(board))
+        self.assertEqual(solver.stats.timeouts, 1)
+
+    def test_heuristic_is_built_on_first_use(self) -> None:
+        """Test that importing the module does not build the heuristic table, and a solver does."""
+        code = (
+            "from game2048 import expectimax as e; "
+            "print(type(e._HEURISTIC).__name__); "
+            "e.ExpectimaxSolver(); print(type(e._HEURISTIC).__name__, len(e._HEURISTIC))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.split(), ["_LazyHeuristicTable", "list", "65536"])
+
+
+if __name__ == "__main__":
+    unittest.main()
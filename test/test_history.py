@@ -0,0 +1,113 @@
+import random
+import unittest
+from typing import List, Tuple
+
+from game2048.bitboard import BitboardGame2048
+from game2048.game import DIRECTIONS, Game2048
+from game2048.history import GameHistory
+from game2048.large import LargeBoardGame2048
+from game2048.rng import GameRNG
+
+
+class TestGameHistory(unittest.TestCase):
+    def play(
+        self, history: GameHistory, moves: int, seed: int = 0
+    ) -> List[Tuple[List[List[int]], int]]:
+        """Makes random moves and returns every position as (board, score)."""
+        rnd = random.Random(seed)
+        positions = [(history.game.board, history.game.score)]
+        for _ in range(moves):
+            if history.game.is_game_over():
+                break
+            if history.move(rnd.choice(DIRECTIONS)):
+                positions.append((history.game.board, history.game.score))
+        return positions
+
+    def test_undo_redo_every_engine(self) -> None:
+        """Test that undo walks back through every position and redo forward again."""
+        for game in (Game2048(4, GameRNG(1)), BitboardGame2048(4, GameRNG(1)), Game2048(6)):
+            history = GameHistory(game)
+            positions = self.play(history, 200)
+            self.assertEqual(len(history), len(positions))
+            for board, score in reversed(positions[:-1]):
+                self.assertTrue(history.undo())
+                self.assertEqual((game.board, game.score), (board, score))
+            self.assertFalse(history.undo())
+            for board, score in positions[1:]:
+                self.assertTrue(history.redo())
+                self.assertEqual((game.board, game.score), (board, score))
+            self.assertFalse(history.redo())
+
+    def test_large_board_bookkeeping_after_undo(self) -> None:
+        """Test that an undone large board keeps playing with consistent bookkeeping."""
+        game = LargeBoardGame2048(8, GameRNG(2))
+        history = GameHistory(game)
+        positions = self.play(history, 100)
+        for _ in range(10):
+            history.undo()
+        self.assertEqual(game.board, positions[-11][0])
+        self.assertEqual(game.empty_count, sum(row.count(0) for row in game.board))
+
+    def test_move_after_undo_branches(self) -> None:
+        """Test that a move after undo discards the undone positions."""
+        game = Game2048(4, GameRNG(3))
+        history = GameHistory(game)
+        self.play(history, 20)
+        history.undo()
+        history.undo()
+        self.assertTrue(history.can_redo)
+        self.play(history, 5, seed=1)
+        self.assertFalse(history.can_redo)
+
+    def test_unchanged_rows_are_shared(self) -> None:
+        """Test that rows a move did not touch are stored once."""
+        game = Game2048(4)
+        game.load_board([[2, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+        history = GameHistory(game)
+        before = history._current.cells
+        game.move("right")
+        history.record()
+        after = history._current.cells
+        assert isinstance(before, tuple) and isinstance(after, tuple)
+        self.assertIsNot(after[0], before[0])
+        self.assertIs(after[3], before[3])
+
+    def test_max_states(self) -> None:
+        """Test that the oldest positions are dropped beyond max_states."""
+        game = Game2048(4, GameRNG(4))
+        history = GameHistory(game, max_states=5)
+        positions = self.play(history, 50)
+        undone = 0
+        while history.undo():
+            undone += 1
+        self.assertEqual(undone, 5)
+        self.assertEqual(game.board, positions[-6][0])
+
+    def test_snapshots(self) -> None:
+        """Test that a snapshot can be restored and the restore undone."""
+        game = BitboardGame2048(4, GameRNG(5))
+        history = GameHistory(game)
+        self.play(history, 10)
+        saved = (game.board, game.score)
+        history.snapshot("opening")
+        self.play(history, 30, seed=1)
+        reached = (game.board, game.score)
+        history.restore("opening")
+        self.assertEqual((game.board, game.score), saved)
+        self.assertEqual(history.snapshots, ["opening"])
+        history.undo()
+        self.assertEqual((game.board, game.score), reached)
+        with self.assertRaises(KeyError):
+            history.restore("missing")
+
+    def test_memory_usage(self) -> None:
+        """Test that memory usage counts shared rows once and grows with the history."""
+        game = Game2048(8, GameRNG(6))
+        history = GameHistory(game)
+        empty = history.memory_usage()
+        self.play(history, 100)
+        self.assertGreater(history.memory_usage(), empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
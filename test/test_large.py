@@ -0,0 +1,97 @@
+import random
+import unittest
+from typing import List
+
+from game2048.game import DIRECTIONS, Game2048
+from game2048.large import LargeBoardGame2048
+from game2048.rng import GameRNG
+
+
+def count_pairs(board: List[List[int]]) -> int:
+    """Counts adjacent equal tiles by brute force."""
+    size = len(board)
+    pairs = 0
+    for i in range(size):
+        for j in range(size):
+            if board[i][j] and j + 1 < size and board[i][j] == board[i][j + 1]:
+                pairs += 1
+            if board[i][j] and i + 1 < size and board[i][j] == board[i + 1][j]:
+                pairs += 1
+    return pairs
+
+
+class TestLargeBoardGame2048(unittest.TestCase):
+    def test_initial_board(self) -> None:
+        """Test that the board initializes with exactly two tiles."""
+        game = LargeBoardGame2048(32)
+        self.assertEqual(sum(cell != 0 for row in game.board for cell in row), 2)
+        self.assertEqual(game.empty_count, 32 * 32 - 2)
+
+    def test_matches_list_engine(self) -> None:
+        """Test that moves, spawns, scores and game over match Game2048 on the same seeds."""
+        for size, seed in ((4, 1), (5, 2), (6, 3)):
+            rnd = random.Random(seed)
+            game = Game2048(size, GameRNG(seed))
+            large = LargeBoardGame2048(size, GameRNG(seed))
+            self.assertEqual(large.board, game.board)
+            for _ in range(3000):
+                if game.is_game_over():
+                    break
+                direction = rnd.choice(DIRECTIONS)
+                changed = game.move(direction)
+                self.assertEqual(large.move(direction), changed)
+                if changed:
+                    self.assertEqual(large.insert_random_tile(), game.insert_random_tile())
+                self.assertEqual(large.board, game.board)
+                self.assertEqual(large.score, game.score)
+                self.assertEqual(large.get_empty_cells(), game.get_empty_cells())
+                self.assertEqual(large.is_game_over(), game.is_game_over())
+
+    def test_bookkeeping(self) -> None:
+        """Test that the free-list and pair count stay consistent during random play."""
+        rnd = random.Random(5)
+        game = LargeBoardGame2048(6, GameRNG(5))
+        for _ in range(500):
+            if game.move(rnd.choice(DIRECTIONS)):
+                game.insert_random_tile()
+            board = game.board
+            self.assertEqual(game._pairs, count_pairs(board))
+            self.assertEqual(
+                sorted(divmod(index, 6) for index in game._free),
+                [(i, j) for i in range(6) for j in range(6) if board[i][j] == 0],
+            )
+            self.assertEqual(game._row_tiles, [sum(cell != 0 for cell in row) for row in board])
+            empty = [i * 6 + j for i in range(6) for j in range(6) if board[i][j] == 0]
+            self.assertEqual([game._kth_empty(k) for k in range(len(empty))], empty)
+
+    def test_spawn_on_nearly_full_board(self) -> None:
+        """Test that spawns that fall back to the k-th empty cell match the list engine."""
+        for seed in range(20):
+            rnd = random.Random(seed)
+            board = [[2 << rnd.randrange(10) for _ in range(8)] for _ in range(8)]
+            for index in rnd.sample(range(64), 3):
+                board[index // 8][index % 8] = 0
+            games = [Game2048(8, GameRNG(seed)), LargeBoardGame2048(8, GameRNG(seed))]
+            for game in games:
+                game.load_board(board)
+            for _ in range(4):
+                self.assertEqual(games[1].insert_random_tile(), games[0].insert_random_tile())
+            self.assertEqual(games[1].board, games[0].board)
+
+    def test_game_over(self) -> None:
+        """Test the game over condition."""
+        game = LargeBoardGame2048(4)
+        game.load_board(
+            [
+                [2, 4, 2, 4],
+                [4, 2, 4, 2],
+                [2, 4, 2, 4],
+                [4, 2, 4, 2],
+            ]
+        )
+        self.assertTrue(game.is_game_over())
+        self.assertIsNone(game.insert_random_tile())
+
+
+if __name__ == "__main__":
+    unittest.main()
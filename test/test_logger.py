@@ -0,0 +1,109 @@
+import logging
+import os
+import tempfile
+import unittest
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+from logger import logger as logger_module
+from logger.logger import Logger, flush_logs
+
+
+class Counted:
+    """Counts how often it is converted to text."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return "counted"
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.log")
+        self.name = f"test_logger.{self.id()}"
+
+    def tearDown(self) -> None:
+        log = logging.getLogger(self.name)
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+            if isinstance(handler, logger_module._MessageQueueHandler):
+                handler.flush()
+                logger_module._queued.remove(handler)
+                for target in handler.targets:
+                    target.close()
+            handler.close()
+        logger_module._handlers.pop((self.name, os.path.abspath(self.path)), None)
+        self.directory.cleanup()
+
+    def read_log(self) -> str:
+        flush_logs()
+        with open(self.path, encoding="utf-8") as log_file:
+            return log_file.read()
+
+    def test_handlers_are_not_duplicated(self) -> None:
+        """Test that creating a Logger twice for the same file attaches one handler."""
+        first = Logger(self.name, self.path).get_logger()
+        second = Logger(self.name, self.path).get_logger()
+        self.assertIs(first, second)
+        self.assertEqual(len(first.handlers), 1)
+        first.info("once")
+        first.handlers[0].flush()
+        with open(self.path, encoding="utf-8") as log_file:
+            self.assertEqual(log_file.read().count("once"), 1)
+
+    def test_rotation_size(self) -> None:
+        """Test that the default rotation size no longer rotates every few records."""
+        handler = Logger(self.name, self.path).get_logger().handlers[0]
+        assert isinstance(handler, RotatingFileHandler)
+        self.assertEqual(handler.maxBytes, 10 * 1024 * 1024)
+
+    def test_file_is_opened_lazily(self) -> None:
+        """Test that no file is created until something is logged."""
+        Logger(self.name, self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_queue_mode_writes_in_background(self) -> None:
+        """Test that queued records reach the file with their arguments merged."""
+        log = Logger(self.name, self.path, use_queue=True).get_logger()
+        self.assertIsInstance(log.handlers[0], QueueHandler)
+        for index in range(100):
+            log.info("record %d of %s", index, "queue")
+        contents = self.read_log()
+        self.assertEqual(contents.count("of queue"), 100)
+        self.assertIn("record 99 of queue", contents)
+
+    def test_queue_mode_rotates(self) -> None:
+        """Test that the background writer rotates at the configured size."""
+        log = Logger(self.name, self.path, max_bytes=2000, use_queue=True).get_logger()
+        for index in range(100):
+            log.info("record %d", index)
+        contents = self.read_log()
+        self.assertTrue(os.path.exists(f"{self.path}.1"))
+        self.assertLess(len(contents), 2000)
+        self.assertIn("record 99", contents)
+
+    def test_listener_starts_on_first_record(self) -> None:
+        """Test that a queued logger starts no thread until it logs."""
+        log = Logger(self.name, self.path, use_queue=True).get_logger()
+        handler = log.handlers[0]
+        assert isinstance(handler, logger_module._MessageQueueHandler)
+        self.assertIsNone(handler.listener)
+        log.info("first")
+        self.assertIsNotNone(handler.listener)
+        self.assertIn("first", self.read_log())
+
+    def test_filtered_records_are_not_formatted(self) -> None:
+        """Test that %-style arguments are not formatted below the logger level."""
+        log = Logger(self.name, self.path, level=logging.WARNING, use_queue=True).get_logger()
+        counted = Counted()
+        log.info("value %s", counted)
+        self.assertEqual(counted.calls, 0)
+        log.warning("value %s", counted)
+        self.assertIn("value counted", self.read_log())
+
+
+if __name__ == "__main__":
+    unittest.main()
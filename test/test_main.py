@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any
+from unittest import mock
+
+import main
+from game2048.storage import SQLiteStorage
+
+
+class ClosingStorage(SQLiteStorage):
+    """A SQLite leaderboard that remembers being closed."""
+
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        super().close()
+
+
+class TestPlay(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ClosingStorage(os.path.join(directory.name, "scores.sqlite3"))
+        self.storage.create_table()
+        self.storage.update_or_create_row("alice", 64)
+        submitter = mock.Mock(flush_latency=0.0)
+        submitter.close.return_value = True
+        for target, value in (
+            ("builtins.input", mock.Mock(return_value="alice")),
+            ("game2048.manager.GameManager", mock.Mock()),
+            ("game2048.submitter.ScoreSubmitter", mock.Mock(return_value=submitter)),
+            ("game2048.storage.close_storage", mock.Mock()),
+        ):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def play(self, open_storage: Any) -> str:
+        """Plays a game with the window mocked out and returns the printed text."""
+        out = StringIO()
+        with mock.patch("game2048.storage.open_storage", open_storage), redirect_stdout(out):
+            main.play()
+        return out.getvalue()
+
+    def test_leaderboard_storage_is_closed(self) -> None:
+        """Test that the storage opened to show the leaderboard is closed afterwards."""
+        output = self.play(mock.Mock(return_value=self.storage))
+        self.assertIn("1. alice has score 64", output)
+        self.assertTrue(self.storage.closed)
+
+    def test_leaderboard_errors_are_reported(self) -> None:
+        """Test that a failing leaderboard prints one line instead of raising."""
+        output = self.play(mock.Mock(side_effect=ValueError("Unknown STORAGE_BACKEND: nope")))
+        self.assertIn("The leaderboard could not be shown: Unknown STORAGE_BACKEND: nope", output)
+        with mock.patch.object(
+            self.storage, "get_top", side_effect=RuntimeError("connection lost")
+        ):
+            output = self.play(mock.Mock(return_value=self.storage))
+        self.assertIn("The leaderboard could not be shown: connection lost", output)
+        self.assertTrue(self.storage.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
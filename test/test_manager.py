@@ -0,0 +1,112 @@
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from game2048.game import Game2048  # noqa: E402
+from game2048.history import GameHistory  # noqa: E402
+from game2048.manager import GameManager  # noqa: E402
+
+
+class TestGameManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.game = Game2048(4)
+        self.game.load_board(
+            [
+                [2, 0, 0, 0],
+                [0, 4, 0, 0],
+                [0, 0, 0, 0],
+                [0, 0, 0, 0],
+            ]
+        )
+        self.manager = GameManager(self.game)
+
+    def tearDown(self) -> None:
+        pygame.quit()
+
+    def test_first_frame_redraws_everything(self) -> None:
+        """Test that the first frame flips the whole screen."""
+        with patch("pygame.display.flip") as flip, patch("pygame.display.update") as update:
+            self.manager.draw_board()
+        flip.assert_called_once()
+        update.assert_not_called()
+        self.assertEqual(len(self.manager.frame_times), 1)
+
+    def test_unchanged_frame_updates_nothing(self) -> None:
+        """Test that a frame without changes does not touch the display."""
+        self.manager.draw_board()
+        with patch("pygame.display.flip") as flip, patch("pygame.display.update") as update:
+            self.manager.draw_board()
+        flip.assert_not_called()
+        update.assert_not_called()
+
+    def test_only_changed_cells_are_updated(self) -> None:
+        """Test that a move updates only the changed cells and the score."""
+        self.manager.draw_board()
+        self.game.move_left()
+        with patch("pygame.display.update") as update:
+            self.manager.draw_board()
+        rects = update.call_args[0][0]
+        # Cell (1, 1) emptied and cell (1, 0) filled; the score did not change.
+        self.assertEqual(
+            sorted((rect.x, rect.y) for rect in rects),
+            sorted(
+                (rect.x, rect.y)
+                for rect in (self.manager.get_cell_rect(1, 0), self.manager.get_cell_rect(1, 1))
+            ),
+        )
+        self.assertEqual(
+            self.manager.screen.get_at(self.manager.get_cell_rect(1, 0).topleft)[:3],
+            (255, 255, 128),
+        )
+
+    def test_run_redraws_only_after_changes(self) -> None:
+        """Test that the event-driven loop draws once per state change."""
+        self.game.load_board([[2, 0, 0, 0], [4, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+        for key in (pygame.K_LEFT, pygame.K_LEFT, pygame.K_RIGHT):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        pygame.time.set_timer(pygame.QUIT, 100, loops=1)
+        self.manager.run()
+        # The initial frame plus one frame for the right move; no-op left moves draw nothing.
+        self.assertEqual(len(self.manager.frame_times), 2)
+        self.assertEqual(self.game.board[0][3], 2)
+
+    def test_undo_and_redo_keys(self) -> None:
+        """Test that U and R step through the history and flag a redraw."""
+        manager = GameManager(self.game, history=GameHistory(self.game))
+        start = self.game.board
+
+        def press(key: int) -> None:
+            manager.needs_redraw = False
+            manager.handle_events([pygame.event.Event(pygame.KEYDOWN, key=key)])
+
+        press(pygame.K_RIGHT)
+        moved = self.game.board
+        self.assertTrue(manager.needs_redraw)
+        press(pygame.K_u)
+        self.assertTrue(manager.needs_redraw)
+        self.assertEqual(self.game.board, start)
+        press(pygame.K_u)
+        self.assertFalse(manager.needs_redraw)
+        press(pygame.K_r)
+        self.assertTrue(manager.needs_redraw)
+        self.assertEqual(self.game.board, moved)
+
+    def test_polling_mode_with_fps_cap(self) -> None:
+        """Test that the polling loop paces itself and still exits on quit."""
+        manager = GameManager(self.game, fps=30, wait_for_events=False)
+        pygame.time.set_timer(pygame.QUIT, 100, loops=1)
+        manager.run()
+        self.assertEqual(len(manager.frame_times), 1)
+
+    def test_tiles_are_cached(self) -> None:
+        """Test that tile surfaces are rendered once per value."""
+        self.assertIs(self.manager.get_tile(2), self.manager.get_tile(2))
+        self.assertIsNot(self.manager.get_tile(2), self.manager.get_tile(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from game2048 import bitboard, ntuple
+from game2048.game import Game2048
+from game2048.rng import GameRNG
+from game2048.selfplay import play_game
+from game2048.symmetry import transforms
+
+tuples = [(0, 1, 2, 3), (0, 1, 4, 5)]
+
+
+class TestNTupleNetwork(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = [[2, 4, 8, 16], [32, 64, 128, 256], [0, 2, 0, 4], [0, 0, 0, 2048]]
+        self.packed = bitboard.pack(self.board)
+        self.network = ntuple.NTupleNetwork(tuples)
+        for table in self.network.arrays():
+            table[:] = np.random.default_rng(0).random(len(table), dtype=np.float32)
+
+    def test_runs(self) -> None:
+        """Test that a tuple is read in runs of adjacent cells."""
+        self.assertEqual(ntuple._runs((0, 1, 2, 3)), [(0, 0xFFFF, 0)])
+        self.assertEqual(ntuple._runs((0, 1, 4, 5)), [(0, 0xFF, 0), (16, 0xFF, 8)])
+        self.assertEqual(ntuple._runs((5, 3)), [(20, 0xF, 0), (12, 0xF, 4)])
+
+    def test_value(self) -> None:
+        """Test that the value sums the table entries of every tuple on every symmetry."""
+        expected = 0.0
+        for board in transforms(self.packed):
+            for cells, table in zip(tuples, self.network.tables):
+                index = sum(
+                    ((board >> (4 * cell)) & 0xF) << (4 * k) for k, cell in enumerate(cells)
+                )
+                expected += table[index]
+        self.assertAlmostEqual(self.network.value(self.packed), expected, places=4)
+        for board in transforms(self.packed):
+            self.assertAlmostEqual(self.network.value(board), expected, places=4)
+
+    def test_update(self) -> None:
+        """Test that an update moves the value by the delta per weight."""
+        before = self.network.value(self.packed)
+        self.network.update(self.packed, 0.5)
+        self.assertGreaterEqual(self.network.value(self.packed) - before, 0.5 * 16 - 1e-3)
+
+    def test_best_move(self) -> None:
+        """Test that the best move maximizes gain plus afterstate value."""
+        direction, after, gain, value = self.network.best_move(self.packed) or ("", 0, 0, 0.0)
+        totals = {}
+        for name, move in bitboard.MOVES.items():
+            moved, reward = move(self.packed)
+            if moved != self.packed:
+                totals[name] = reward + self.network.value(moved)
+        self.assertEqual(direction, max(totals, key=totals.__getitem__))
+        self.assertEqual((after, gain), bitboard.MOVES[direction](self.packed))
+        self.assertAlmostEqual(value, self.network.value(after), places=4)
+        stuck = bitboard.pack([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 2]])
+        self.assertIsNone(self.network.best_move(stuck))
+
+    def test_rejects_bad_tuples(self) -> None:
+        """Test that tuples must hold distinct cells of the board."""
+        for bad in ([], [(0, 0)], [(0, 16)], [tuple(range(9))]):
+            with self.assertRaises(ValueError):
+                ntuple.NTupleNetwork(bad)
+
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "network.bin")
+
+    def test_round_trip(self) -> None:
+        """Test that a checkpoint restores tuples, weights and the game count."""
+        network = ntuple.NTupleNetwork(tuples)
+        network.arrays()[1][:] = np.arange(len(network.tables[1]), dtype=np.float32)
+        network.games = 42
+        network.save(self.path)
+        self.assertEqual(os.path.getsize(self.path), 8 + 12 + 10 + 4 * (16**4 + 16**4))
+        loaded = ntuple.NTupleNetwork.load(self.path)
+        self.assertEqual((loaded.tuples, loaded.games), (tuples, 42))
+        for mine, theirs in zip(network.arrays(), loaded.arrays()):
+            np.testing.assert_array_equal(mine, theirs)
+
+    def test_rejects_damaged_files(self) -> None:
+        """Test that foreign and truncated files are reported."""
+        ntuple.NTupleNetwork(tuples).save(self.path)
+        with open(self.path, "rb") as checkpoint:
+            data = checkpoint.read()
+        for damaged in (b"not a checkpoint", data[:-4], data + b"\0"):
+            with open(self.path, "wb") as checkpoint:
+                checkpoint.write(damaged)
+            with self.assertRaises(ValueError):
+                ntuple.NTupleNetwork.load(self.path)
+
+
+class TestTraining(unittest.TestCase):
+    def test_training_is_reproducible(self) -> None:
+        """Test that a seed trains the same weights and results in every run."""
+        runs = []
+        for _ in range(2):
+            network = ntuple.NTupleNetwork([(0, 1, 2, 3)])
+            trainer = ntuple.TDTrainer(network, learning_rate=0.01, seed=5)
+            results = list(trainer.run(3))
+            runs.append((network.arrays()[0].copy(), [r.score for r in results]))
+            self.assertEqual(network.games, 3)
+            self.assertEqual(trainer.stats.games, 3)
+            self.assertTrue(network.arrays()[0].any())
+        np.testing.assert_array_equal(runs[0][0], runs[1][0])
+        self.assertEqual(runs[0][1], runs[1][1])
+
+    def test_game_follows_the_rules(self) -> None:
+        """Test that a training game ends only when no move changes the board."""
+        network = ntuple.NTupleNetwork([(0, 1, 2, 3)])
+        score, max_tile, moves = ntuple.TDTrainer(network).play(1)
+        self.assertGreater(moves, 0)
+        self.assertGreater(score, 0)
+        self.assertGreaterEqual(max_tile, 16)
+
+    def test_checkpoints(self) -> None:
+        """Test that checkpoints are saved periodically and at the end, and resume."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.bin")
+            network = ntuple.NTupleNetwork([(0, 1, 2, 3)])
+            trainer = ntuple.TDTrainer(network, checkpoint_path=path, checkpoint_every=2)
+            results = trainer.run(3)
+            next(results)
+            self.assertFalse(os.path.exists(path))
+            next(results)
+            self.assertEqual(ntuple.NTupleNetwork.load(path).games, 2)
+            list(results)
+            resumed = ntuple.NTupleNetwork.load(path)
+            self.assertEqual(resumed.games, 3)
+            result = next(ntuple.TDTrainer(resumed, seed=0).run(1))
+            self.assertEqual(result.seed, 3)
+
+
+class TestNTuplePolicy(unittest.TestCase):
+    def test_policy_plays_on_any_engine(self) -> None:
+        """Test that the policy loads lazily, pickles as its path and plays list games."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.bin")
+            network = ntuple.NTupleNetwork([(0, 1, 2, 3)])
+            ntuple.TDTrainer(network).play(0)
+            network.save(path)
+            policy = ntuple.NTuplePolicy(path)
+            game = Game2048(4, GameRNG(0))
+            direction = policy(game, random.Random(0))
+            choice = network.best_move(bitboard.pack(game.board))
+            assert choice is not None
+            self.assertEqual(direction, choice[0])
+            copy = pickle.loads(pickle.dumps(policy))
+            self.assertIsNone(copy.network)
+            self.assertGreater(play_game(0, 1, copy, engine="list").moves, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import threading
+import unittest
+from typing import List
+from unittest.mock import MagicMock
+
+import psycopg2
+
+from game2048.db import DatabaseManager
+from game2048.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.probes = 0
+        self.fail_probe = False
+
+    def cursor(self) -> MagicMock:
+        cursor = MagicMock()
+        if self.fail_probe:
+            cursor.__enter__.return_value.execute.side_effect = RuntimeError("gone")
+        else:
+            self.probes += 1
+        return cursor
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.opened: List[FakeConnection] = []
+        self.pool = ConnectionPool(self.connect, min_size=1, max_size=2, timeout=0.05)
+
+    def connect(self) -> FakeConnection:
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def test_connections_are_reused(self) -> None:
+        """Test that sequential checkouts share the minimum connection."""
+        for _ in range(5):
+            with self.pool.connection():
+                pass
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.pool.stats()["checkouts"], 5)
+
+    def test_grows_to_max_size_then_times_out(self) -> None:
+        """Test that the pool opens up to max_size connections and then waits."""
+        first, second = self.pool.getconn(), self.pool.getconn()
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.utilization, 1.0)
+        with self.assertRaises(PoolTimeout):
+            self.pool.getconn()
+        self.assertEqual(self.pool.timeouts, 1)
+        self.pool.putconn(first)
+        self.assertIs(self.pool.getconn(), first)
+
+    def test_waiting_checkout_gets_returned_connection(self) -> None:
+        """Test that a blocked checkout is served as soon as a connection comes back."""
+        self.pool.timeout = 5.0
+        held = [self.pool.getconn(), self.pool.getconn()]
+        got: List[FakeConnection] = []
+        waiter = threading.Thread(target=lambda: got.append(self.pool.getconn()))
+        waiter.start()
+        self.pool.putconn(held[0])
+        waiter.join(5.0)
+        self.assertEqual(got, [held[0]])
+        self.assertEqual(self.pool.waits, 1)
+        self.assertEqual(self.pool.peak_in_use, 2)
+
+    def test_broken_connections_are_replaced(self) -> None:
+        """Test that closed or unresponsive idle connections are reconnected."""
+        connection = self.pool.getconn()
+        self.pool.putconn(connection)
+        connection.closed = True
+        self.assertIsNot(self.pool.getconn(), connection)
+        self.assertEqual(self.pool.reconnects, 1)
+
+        self.pool.check_interval = 0.0
+        stale = self.pool.getconn()
+        self.pool.putconn(stale)
+        stale.fail_probe = True
+        self.assertIsNot(self.pool.getconn(), stale)
+        self.assertTrue(stale.closed)
+        self.assertEqual(self.pool.size, 2)
+
+    def test_discard_frees_a_slot(self) -> None:
+        """Test that discarding a connection closes it and reopens the minimum size."""
+        connection = self.pool.getconn()
+        self.pool.putconn(connection, discard=True)
+        self.assertTrue(connection.closed)
+        self.assertEqual((self.pool.size, self.pool.in_use, self.pool.reconnects), (1, 0, 1))
+        self.assertIsNot(self.pool.getconn(), connection)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_discard_above_minimum_is_not_refilled(self) -> None:
+        """Test that only discards below min_size open replacements."""
+        first = self.pool.getconn()
+        self.pool.getconn()
+        self.pool.putconn(first, discard=True)
+        self.assertEqual((self.pool.size, len(self.opened)), (1, 2))
+
+    def test_failed_refill_frees_the_slot(self) -> None:
+        """Test that a refill that cannot connect leaves the pool below its minimum."""
+        connection = self.pool.getconn()
+        self.pool._connect = MagicMock(side_effect=RuntimeError("down"))
+        with self.assertLogs("game2048.pool", "WARNING"):
+            self.pool.putconn(connection, discard=True)
+        self.assertEqual(self.pool.size, 0)
+
+    def test_close(self) -> None:
+        """Test that closing the pool closes idle connections and refuses checkouts."""
+        borrowed = self.pool.getconn()
+        self.pool.close()
+        self.assertTrue(all(c.closed for c in self.opened if c is not borrowed))
+        with self.assertRaises(RuntimeError):
+            self.pool.getconn()
+        self.pool.putconn(borrowed)
+        self.assertTrue(borrowed.closed)
+        self.assertEqual(self.pool.size, 0)
+
+    def test_invalid_size(self) -> None:
+        """Test that a pool cannot be smaller than its minimum."""
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.connect, min_size=3, max_size=2)
+
+
+class TestPooledDatabaseManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connection = MagicMock(closed=False)
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        self.pool = ConnectionPool(lambda: self.connection, min_size=1, max_size=1)
+        self.db = DatabaseManager(self.pool)
+
+    def test_calls_borrow_and_return(self) -> None:
+        """Test that each call borrows a connection, commits and gives it back."""
+        self.cursor.fetchone.return_value = {"name": "alice", "scores": 8}
+        self.assertEqual(self.db.get_row("alice"), ("alice", 8))
+        self.db.update_or_create_row("alice", 4)
+        self.assertEqual(self.pool.in_use, 0)
+        self.assertEqual(self.pool.checkouts, 2)
+        self.assertEqual(self.connection.commit.call_count, 2)
+
+    def test_connection_errors_discard_the_connection(self) -> None:
+        """Test that a connection-level error rolls back and drops the connection."""
+        self.cursor.execute.side_effect = psycopg2.OperationalError("server closed")
+        self.assertIsNone(self.db.get_row("alice"))
+        self.connection.rollback.assert_called_once()
+        self.connection.close.assert_called_once()
+        # The pool reconnects to stay at its minimum size.
+        self.assertEqual((self.pool.size, self.pool.reconnects), (1, 1))
+
+    def test_close_keeps_the_pool_open(self) -> None:
+        """Test that closing a pooled manager does not close shared connections."""
+        self.db.close()
+        self.connection.close.assert_not_called()
+        self.assertEqual(self.pool.size, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
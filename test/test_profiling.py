@@ -0,0 +1,108 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from game2048 import profiling
+from game2048.bitboard import BitboardGame2048
+from game2048.game import Game2048
+from game2048.rng import GameRNG
+from game2048.storage import SQLiteStorage
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self) -> None:
+        """Test that percentiles fall within an eighth of the exact value."""
+        histogram = profiling.LatencyHistogram()
+        for ns in range(1, 10001):
+            histogram.record(ns * 100)
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.max_ns, 1_000_000)
+        self.assertAlmostEqual(histogram.percentile(0.5), 500e-6, delta=500e-6 / 8)
+        self.assertAlmostEqual(histogram.percentile(0.99), 990e-6, delta=990e-6 / 8)
+        self.assertEqual(histogram.percentile(1.0), 1e-3)
+        self.assertAlmostEqual(histogram.mean, 500.05e-6)
+
+    def test_empty(self) -> None:
+        """Test that an empty histogram reports zeros."""
+        histogram = profiling.LatencyHistogram()
+        self.assertEqual((histogram.mean, histogram.percentile(0.99)), (0.0, 0.0))
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        profiling.reset()
+        self.addCleanup(profiling.reset)
+        self.addCleanup(profiling.disable)
+
+    def test_disabled_methods_are_untouched(self) -> None:
+        """Test that enable wraps the hot-path methods and disable restores them."""
+        original = vars(Game2048)["move"]
+        profiling.enable()
+        self.assertTrue(profiling.is_enabled())
+        self.assertIsNot(vars(Game2048)["move"], original)
+        profiling.disable()
+        self.assertFalse(profiling.is_enabled())
+        self.assertIs(vars(Game2048)["move"], original)
+
+    def test_modules_are_timed_once_imported(self) -> None:
+        """Test that enabling does not import a target's module, and importing it wraps it."""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "profiled_module.py"), "w") as file:
+                file.write("class Engine:\n    def step(self):\n        return 1\n")
+            sys.path.insert(0, directory)
+            self.addCleanup(sys.path.remove, directory)
+            self.addCleanup(sys.modules.pop, "profiled_module", None)
+            profiling.enable([("profiled_module", "Engine", "step")])
+            self.assertNotIn("profiled_module", sys.modules)
+            import profiled_module
+
+            self.assertEqual(profiled_module.Engine().step(), 1)
+            self.assertEqual(profiling.stats()["Engine.step"].count, 1)
+            profiling.disable()
+            profiled_module.Engine().step()
+            self.assertEqual(profiling.stats()["Engine.step"].count, 1)
+
+    def test_game_methods_are_timed(self) -> None:
+        """Test that calls on every engine are counted under their class."""
+        profiling.enable()
+        for game in (Game2048(4, GameRNG(0)), BitboardGame2048(4, GameRNG(0))):
+            for direction in ("left", "right", "up", "down"):
+                game.move(direction)
+            game.is_game_over()
+        stats = profiling.stats()
+        self.assertEqual(stats["Game2048.move"].count, 4)
+        self.assertEqual(stats["Game2048._merge"].count, 16)
+        self.assertEqual(stats["BitboardGame2048.move"].count, 4)
+        self.assertEqual(stats["BitboardGame2048.is_game_over"].count, 1)
+        profiling.disable()
+        Game2048(4).move("left")
+        self.assertEqual(profiling.stats()["Game2048.move"].count, 4)
+
+    def test_storage_queries_are_timed(self) -> None:
+        """Test that storage queries are timed and the summary lists them."""
+        profiling.enable()
+        storage = SQLiteStorage(":memory:")
+        self.addCleanup(storage.close)
+        storage.create_table()
+        storage.update_or_create_row("alice", 10)
+        storage.get_top(5)
+        self.assertEqual(profiling.stats()["SQLiteStorage.get_top"].count, 1)
+        self.assertIn("SQLiteStorage.update_or_create_row", profiling.summary())
+
+    def test_profile_session(self) -> None:
+        """Test that a session writes cProfile statistics and prints the summary."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.prof")
+            output = StringIO()
+            with redirect_stdout(output), profiling.profile_session(path):
+                Game2048(4).move("left")
+            self.assertTrue(os.path.getsize(path))
+        self.assertIn("Game2048.move", output.getvalue())
+        self.assertFalse(profiling.is_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
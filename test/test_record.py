@@ -0,0 +1,105 @@
+import os
+import random
+import tempfile
+import unittest
+
+from game2048.bitboard import BitboardGame2048
+from game2048.game import DIRECTIONS, Game2048
+from game2048.large import LargeBoardGame2048
+from game2048.record import MAGIC, GameRecorder, RecordReader, RecordWriter, replay
+from game2048.selfplay import play_game
+
+
+def play(game: Game2048, seed: int) -> GameRecorder:
+    """Plays a recorded game with random moves until it ends."""
+    rnd = random.Random(seed)
+    recorder = GameRecorder(game)
+    for _ in range(3000):
+        if game.is_game_over():
+            break
+        recorder.move(rnd.choice(DIRECTIONS))
+    return recorder
+
+
+class TestRecord(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "games.rec")
+
+    def test_replay_reproduces_every_engine(self) -> None:
+        """Test that records from every engine and size replay to the same outcome."""
+        games = [Game2048(4), BitboardGame2048(), Game2048(5), LargeBoardGame2048(6)]
+        recorders = [play(game, seed) for seed, game in enumerate(games)]
+        with RecordWriter(self.path) as writer:
+            for recorder in recorders:
+                writer.write(recorder)
+        with RecordReader(self.path) as reader:
+            records = list(reader)
+            self.assertEqual(reader.verify(), (4, []))
+        for game, recorder, record in zip(games, recorders, records):
+            self.assertEqual(record.board_size, game.size)
+            self.assertEqual(len(record.moves), recorder.steps)
+            self.assertEqual(replay(record), (game.board, game.score))
+
+    def test_steps_are_bit_packed(self) -> None:
+        """Test that a 4x4 step takes 7 bits: 2 for the move, 4 for the cell, 1 for the tile."""
+        recorder = play(Game2048(4), 1)
+        data = recorder.to_bytes()
+        payload_bits = 2 * 5 + recorder.steps * 7
+        self.assertEqual(len(data), 14 + 16 + (payload_bits + 7) // 8)
+
+    def test_appends_across_writers(self) -> None:
+        """Test that reopening a record file appends after the existing games."""
+        for seed in range(3):
+            with RecordWriter(self.path) as writer:
+                writer.write(play(Game2048(4), seed))
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read().count(MAGIC), 1)
+        with RecordReader(self.path) as reader:
+            self.assertEqual(reader.verify(), (3, []))
+
+    def test_detects_tampering(self) -> None:
+        """Test that a record whose outcome does not match its replay is reported."""
+        data = bytearray(play(Game2048(4), 2).to_bytes())
+        data[6] ^= 0x04
+        with RecordWriter(self.path) as writer:
+            writer.write(play(Game2048(4), 3))
+            writer.write(bytes(data))
+        with RecordReader(self.path) as reader:
+            self.assertEqual(reader.verify(), (2, [1]))
+
+    def test_rejects_truncated_and_foreign_files(self) -> None:
+        """Test that truncated records and other files are errors."""
+        with RecordWriter(self.path) as writer:
+            writer.write(play(Game2048(4), 4).to_bytes()[:-1])
+        with RecordReader(self.path) as reader:
+            with self.assertRaises(ValueError):
+                list(reader)
+        with open(self.path, "wb") as file:
+            file.write(b"not a record")
+        with self.assertRaises(ValueError):
+            RecordReader(self.path)
+
+    def test_only_new_games_are_recorded(self) -> None:
+        """Test that a game in progress cannot be recorded."""
+        game = Game2048(4)
+        game.load_board([[8, 0, 0, 0], [0] * 4, [0] * 4, [0] * 4])
+        with self.assertRaises(ValueError):
+            GameRecorder(game)
+
+    def test_self_play_records(self) -> None:
+        """Test that self-play can return its games as records."""
+        result = play_game(0, 5, "random", record=True)
+        assert result.record is not None
+        with RecordWriter(self.path) as writer:
+            writer.write(result.record)
+        with RecordReader(self.path) as reader:
+            (record,) = list(reader)
+        self.assertEqual(record.score, result.score)
+        self.assertEqual(len(record.moves), result.moves)
+        self.assertEqual(play_game(0, 5, "random")[:6], result[:6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from game2048.batch import BatchGame2048
+from game2048.bitboard import BitboardGame2048
+from game2048.game import DIRECTIONS, Game2048
+from game2048.large import LargeBoardGame2048
+from game2048.rng import GameRNG
+
+
+class TestGameRNG(unittest.TestCase):
+    def test_same_seed_same_stream(self) -> None:
+        """Test that a seed always produces the same draws, whatever the buffer size."""
+        first = GameRNG(11)
+        second = GameRNG(11, buffer_size=3)
+        self.assertEqual([first.draw() for _ in range(50)], [second.draw() for _ in range(50)])
+        self.assertNotEqual(GameRNG(12).draw(), GameRNG(11).draw())
+
+    def test_fresh_seed_is_kept(self) -> None:
+        """Test that an unseeded stream records its seed so it can be replayed."""
+        rng = GameRNG()
+        draws = [rng.draw() for _ in range(5)]
+        replay = GameRNG(rng.seed)
+        self.assertEqual([replay.draw() for _ in range(5)], draws)
+
+    def test_split(self) -> None:
+        """Test that children depend on the index only, not on draws already made."""
+        parent = GameRNG(3)
+        child = parent.split(1).draw()
+        parent.draw()
+        self.assertEqual(parent.split(1).draw(), child)
+        self.assertNotEqual(parent.split(2).draw(), child)
+
+    def test_below(self) -> None:
+        """Test that scaled draws stay in range and cover it."""
+        rng = GameRNG(5)
+        values = [rng.below(7) for _ in range(2000)]
+        self.assertEqual(set(values), set(range(7)))
+
+    def test_tile_ratio(self) -> None:
+        """Test that about one spawned tile in ten is a 4."""
+        rng = GameRNG(9)
+        tiles = [rng.tile() for _ in range(20000)]
+        self.assertEqual(set(tiles), {2, 4})
+        self.assertAlmostEqual(tiles.count(4) / len(tiles), 0.1, delta=0.01)
+
+    def test_invalid_buffer_size(self) -> None:
+        """Test that an empty buffer is rejected."""
+        with self.assertRaises(ValueError):
+            GameRNG(0, buffer_size=0)
+
+    def test_engines_play_the_same_game(self) -> None:
+        """Test that a seed and a move sequence give the same game on every engine."""
+        for seed in range(3):
+            games = [
+                Game2048(4, GameRNG(seed)),
+                BitboardGame2048(4, GameRNG(seed)),
+                LargeBoardGame2048(4, GameRNG(seed)),
+            ]
+            moves = random.Random(seed)
+            while not games[0].is_game_over():
+                direction = moves.choice(DIRECTIONS)
+                changed = [game.move(direction) for game in games]
+                if changed[0]:
+                    spawns = [game.insert_random_tile() for game in games]
+                    self.assertEqual(spawns, [spawns[0]] * 3)
+                self.assertEqual(changed, [changed[0]] * 3)
+                self.assertEqual([game.board for game in games], [games[0].board] * 3)
+            self.assertEqual([game.score for game in games], [games[0].score] * 3)
+
+    def test_batch_plays_the_same_games(self) -> None:
+        """Test that game i of a seeded batch plays like a game on the seed's i-th split stream."""
+        for size in (3, 4):
+            batch = BatchGame2048(3, board_size=size, seed=size)
+            games = [Game2048(size, GameRNG(size).split(lane)) for lane in range(batch.count)]
+            self.assertEqual(batch.boards.tolist(), [game.board for game in games])
+            moves = random.Random(size)
+            while not all(game.is_game_over() for game in games):
+                codes = [
+                    -1 if game.is_game_over() else moves.randrange(len(DIRECTIONS))
+                    for game in games
+                ]
+                for game, code in zip(games, codes):
+                    if code >= 0 and game.move(DIRECTIONS[code]):
+                        game.insert_random_tile()
+                batch.step(codes)
+                self.assertEqual(batch.boards.tolist(), [game.board for game in games])
+            self.assertEqual(batch.scores.tolist(), [game.score for game in games])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from game2048.game import Game2048
+from game2048.selfplay import SelfPlayRunner, play_game, resolve_policy
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_games_are_independent(self) -> None:
+        """Test that one process can hold several games at once."""
+        first, second = Game2048(4), Game2048(5)
+        self.assertIsNot(first, second)
+        self.assertEqual((first.size, second.size), (4, 5))
+
+    def test_play_game_is_reproducible(self) -> None:
+        """Test that the same seed replays the same game on every engine."""
+        result = play_game(0, 42, "random")
+        self.assertEqual(play_game(0, 42, "random")[:6], result[:6])
+        self.assertEqual(play_game(0, 42, "random", engine="bitboard")[:6], result[:6])
+        self.assertGreater(result.moves, 0)
+        self.assertGreaterEqual(result.attempts, result.moves)
+        self.assertGreaterEqual(result.max_tile, 4)
+
+    def test_play_game_keeps_global_random_state(self) -> None:
+        """Test that playing a game does not reseed the caller's random module."""
+        random.seed(9)
+        expected = random.Random(9)
+        expected.random()
+        random.random()
+        play_game(0, 1, "random")
+        self.assertEqual(random.random(), expected.random())
+
+    def test_pool_matches_single_process(self) -> None:
+        """Test that results do not depend on the number of workers."""
+        serial = SelfPlayRunner(12, workers=1, seed=3).run_all()
+        runner = SelfPlayRunner(12, workers=2, seed=3)
+        parallel = runner.run_all()
+        self.assertEqual(
+            sorted(result[:6] for result in serial), sorted(result[:6] for result in parallel)
+        )
+        self.assertEqual(runner.stats.games, 12)
+        self.assertEqual(runner.stats.moves, sum(result.moves for result in parallel))
+        self.assertGreater(runner.stats.moves_per_sec, 0)
+
+    def test_resolve_policy(self) -> None:
+        """Test that policies resolve by name and by module path."""
+        self.assertIs(resolve_policy("random"), resolve_policy("game2048.selfplay:random_policy"))
+        with self.assertRaises(ValueError):
+            resolve_policy("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
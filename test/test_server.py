@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+
+from game2048.bitboard import BitboardGame2048, pack
+from game2048.rng import GameRNG
+from game2048.server import GameServer, session_buffer
+from game2048.storage import SQLiteStorage
+from game2048.submitter import ScoreSubmitter
+
+
+def open_sqlite(path: str) -> SQLiteStorage:
+    """Opens a SQLite leaderboard with its table created."""
+    storage = SQLiteStorage(path)
+    storage.create_table()
+    return storage
+
+
+class TestGameServer(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "scores.sqlite3")
+        self.submitter = ScoreSubmitter(lambda: open_sqlite(self.path))
+        self.server = GameServer(self.submitter, idle_timeout=10.0, max_sessions=3)
+
+    def scores(self) -> List[Any]:
+        """Closes the submitter and returns the recorded scores."""
+        self.assertTrue(self.submitter.close())
+        storage = open_sqlite(self.path)
+        try:
+            return storage.get_all_rows()
+        finally:
+            storage.close()
+
+    def test_game_over_records_score(self) -> None:
+        """Test that the move that ends a game closes the session and records its score."""
+        session = self.server.dispatch({"op": "new", "name": "alice"}, 0.0)["session"]
+        # Moving right leaves one empty cell, which no spawned tile can merge with.
+        board = [[2, 4, 2, 4], [4, 2, 4, 2], [8, 4, 2, 4], [16, 8, 2, 0]]
+        self.server.sessions[session].game.load_bits(pack(board), 500)
+        response = self.server.dispatch(
+            {"op": "move", "session": session, "direction": "right"}, 1.0
+        )
+        self.assertTrue(response["moved"])
+        self.assertTrue(response["over"])
+        self.assertEqual(response["score"], 500)
+        self.assertNotIn(session, self.server.sessions)
+        self.assertEqual(self.scores(), [("alice", 500)])
+
+    def test_expire(self) -> None:
+        """Test that only sessions idle past the timeout expire, with their scores recorded."""
+        first = self.server.dispatch({"op": "new", "name": "alice"}, 0.0)["session"]
+        second = self.server.dispatch({"op": "new", "name": "bob"}, 5.0)["session"]
+        third = self.server.dispatch({"op": "new"}, 7.0)["session"]
+        self.assertEqual(self.server.dispatch({"op": "new"}, 7.0), {"error": "server full"})
+        self.server.dispatch({"op": "state", "session": first}, 8.0)
+        self.assertEqual(self.server.expire(16.0), 1)
+        self.assertEqual(list(self.server.sessions), [third, first])
+        self.assertNotIn(second, self.server.sessions)
+        self.assertEqual(self.server.expire(30.0), 2)
+        self.assertEqual((len(self.server.sessions), self.server.expired), (0, 3))
+        # The unnamed session is not recorded.
+        self.assertEqual(sorted(self.scores()), [("alice", 0), ("bob", 0)])
+
+    def test_errors(self) -> None:
+        """Test that bad requests get an error and leave the sessions unchanged."""
+        session = self.server.dispatch({"op": "new", "seed": 1}, 0.0)["session"]
+        requests: List[Dict[str, Any]] = [
+            {"op": "move", "session": "missing", "direction": "left"},
+            {"op": "move", "session": session, "direction": "sideways"},
+            {"op": "dance", "session": session},
+            {"op": "new", "seed": "one"},
+            {"op": "new", "name": 7},
+        ]
+        for request in requests:
+            self.assertIn("error", self.server.dispatch(request, 1.0))
+        self.assertEqual(len(self.server.sessions), 1)
+        self.assertEqual(self.server.moves, 0)
+        self.assertEqual(self.scores(), [])
+
+
+class TestGameServerOverTCP(unittest.IsolatedAsyncioTestCase):
+    async def request(self, line: bytes) -> Dict[str, Any]:
+        """Sends one request line and decodes the response."""
+        self.writer.write(line + b"\n")
+        response: Dict[str, Any] = json.loads(await self.reader.readline())
+        return response
+
+    async def asyncSetUp(self) -> None:
+        self.server = GameServer(idle_timeout=60.0)
+        listener = await self.server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def asyncTearDown(self) -> None:
+        self.writer.close()
+        await self.server.close()
+
+    async def test_play(self) -> None:
+        """Test that a seeded session plays the same game as a local engine."""
+        game = BitboardGame2048(rng=GameRNG(7, session_buffer))
+        response = await self.request(b'{"op": "new", "seed": 7}')
+        session = response["session"]
+        self.assertEqual(response["board"], game.board)
+        for direction in ("left", "up", "right", "down") * 10:
+            moved = game.move(direction)
+            if moved:
+                game.insert_random_tile()
+            request = {"op": "move", "session": session, "direction": direction}
+            response = await self.request(json.dumps(request).encode())
+            self.assertEqual((response["board"], response["score"]), (game.board, game.score))
+            self.assertEqual(response["moved"], moved)
+        response = await self.request(json.dumps({"op": "quit", "session": session}).encode())
+        self.assertTrue(response["over"])
+        self.assertEqual(self.server.sessions, {})
+        self.assertEqual(self.server.moves, 40)
+
+    async def test_malformed_lines(self) -> None:
+        """Test that malformed lines get an error and the connection stays usable."""
+        self.assertEqual(await self.request(b"{not json"), {"error": "invalid JSON"})
+        self.assertEqual(await self.request(b"[1, 2]"), {"error": "request must be an object"})
+        self.assertIn("session", await self.request(b'{"op": "new"}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
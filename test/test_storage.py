@@ -0,0 +1,189 @@
+import os
+import tempfile
+import threading
+import unittest
+from typing import TYPE_CHECKING, List, Tuple
+from unittest.mock import patch
+
+from game2048.storage import LeaderboardStorage, SQLiteStorage, open_storage
+
+
+# The mixin is typed as a TestCase but must not be collected as one on its own.
+if TYPE_CHECKING:
+    _TestCase = unittest.TestCase
+else:
+    _TestCase = object
+
+
+class StorageConformance(_TestCase):
+    """
+    Behaviour every LeaderboardStorage backend must share. Backend test cases
+    mix this in and implement make_storage with an empty database.
+    """
+
+    storage: LeaderboardStorage
+
+    def make_storage(self) -> LeaderboardStorage:
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        self.storage = self.make_storage()
+        self.storage.create_table()
+
+    def tearDown(self) -> None:
+        self.storage.close()
+
+    def fill(self) -> List[Tuple[str, int]]:
+        rows = [("dave", 8), ("alice", 64), ("carol", 16), ("bob", 64), ("erin", 2)]
+        for name, score in rows:
+            self.storage.update_or_create_row(name, score)
+        return sorted(rows, key=lambda row: (-row[1], row[0]))
+
+    def test_keeps_best_score(self) -> None:
+        """Test that a lower score never replaces a better one."""
+        self.assertEqual(self.storage.update_or_create_row("alice", 32), 32)
+        self.assertEqual(self.storage.update_or_create_row("alice", 8), 32)
+        self.assertEqual(self.storage.update_or_create_row("alice", 128), 128)
+        self.assertEqual(self.storage.get_row("alice"), ("alice", 128))
+        self.assertEqual(self.storage.get_row("nobody"), None)
+
+    def test_create_table_is_idempotent(self) -> None:
+        """Test that creating the table again keeps the stored scores."""
+        self.storage.update_or_create_row("alice", 32)
+        self.storage.create_table()
+        self.assertEqual(self.storage.get_row("alice"), ("alice", 32))
+
+    def test_leaderboard_order(self) -> None:
+        """Test that every listing orders by score descending, then by name."""
+        expected = self.fill()
+        self.assertEqual(self.storage.get_all_rows(), expected)
+        self.assertEqual(self.storage.get_top(2), expected[:2])
+        self.assertEqual(self.storage.get_top(2, 2), expected[2:4])
+        self.assertEqual(list(self.storage.iter_rows(batch_size=2)), expected)
+
+    def test_keyset_pages(self) -> None:
+        """Test that following pages visits every row exactly once."""
+        expected = self.fill()
+        pages: List[Tuple[str, int]] = []
+        page = self.storage.get_page(2)
+        while page:
+            pages.extend(page)
+            page = self.storage.get_page(2, after=page[-1])
+        self.assertEqual(pages, expected)
+
+    def test_rank(self) -> None:
+        """Test that ranks count better scores and ties share a rank."""
+        self.fill()
+        ranks = {name: self.storage.get_rank(name) for name in ("alice", "bob", "carol", "erin")}
+        self.assertEqual(ranks, {"alice": 1, "bob": 1, "carol": 3, "erin": 5})
+        self.assertEqual(self.storage.get_rank("nobody"), None)
+
+    def test_submit_scores(self) -> None:
+        """Test that a batch keeps the best score per name, old and new."""
+        self.storage.update_or_create_row("alice", 100)
+        count = self.storage.submit_scores([("alice", 50), ("bob", 4), ("bob", 40)])
+        self.assertEqual(count, 2)
+        self.assertEqual(self.storage.get_all_rows(), [("alice", 100), ("bob", 40)])
+        self.assertEqual(self.storage.submit_scores([]), 0)
+
+    def test_concurrent_writers(self) -> None:
+        """Test that scores written from several threads all land."""
+
+        def write(thread: int) -> None:
+            for score in range(50):
+                self.storage.update_or_create_row(f"user{thread}", score)
+            self.storage.submit_scores((f"batch{thread}-{index}", index) for index in range(50))
+
+        threads = [threading.Thread(target=write, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        rows = self.storage.get_all_rows()
+        self.assertEqual(len(rows), 4 + 4 * 50)
+        self.assertEqual(self.storage.get_row("user3"), ("user3", 49))
+
+
+class TestSQLiteStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self) -> LeaderboardStorage:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        return SQLiteStorage(os.path.join(self.directory.name, "scores.sqlite3"))
+
+    def test_wal_mode(self) -> None:
+        """Test that the database file runs in write-ahead logging mode."""
+        assert isinstance(self.storage, SQLiteStorage) and self.storage.connection
+        mode = self.storage.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_leaderboard_queries_use_index(self) -> None:
+        """Test that the top-K query reads the score index instead of sorting."""
+        assert isinstance(self.storage, SQLiteStorage) and self.storage.connection
+        plan = self.storage.connection.execute(
+            "EXPLAIN QUERY PLAN " + SQLiteStorage.TOP_SQL, (10, 0)
+        ).fetchall()
+        details = " ".join(str(row[-1]) for row in plan)
+        self.assertIn("users_scores_name_idx", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+    def test_closed_storage_reports_errors(self) -> None:
+        """Test that a closed storage logs errors instead of raising them."""
+        self.storage.close()
+        self.assertIsNone(self.storage.get_row("alice"))
+        self.assertEqual(self.storage.get_top(), [])
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_DB_NAME"), "set TEST_DB_NAME to a disposable PostgreSQL database"
+)
+class TestPostgresStorage(StorageConformance, unittest.TestCase):
+    def make_storage(self) -> LeaderboardStorage:
+        from game2048.db import DatabaseManager, connect
+
+        environment = patch.dict(os.environ, {"DB_NAME": os.environ["TEST_DB_NAME"]})
+        environment.start()
+        self.addCleanup(environment.stop)
+        connection = connect()
+        with connection, connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS users")
+        connection.close()
+        return DatabaseManager()
+
+    def test_copy_round_trip(self) -> None:
+        """Test that export and import through COPY merge keeping the best score."""
+        from game2048.db import DatabaseManager
+
+        assert isinstance(self.storage, DatabaseManager)
+        expected = self.fill()
+        with tempfile.TemporaryDirectory() as directory:
+            for file_format in ("csv", "binary"):
+                path = os.path.join(directory, f"scores.{file_format}")
+                stats = self.storage.export_scores(path, file_format)
+                self.assertEqual(stats.rows if stats else None, 5)
+                self.storage.update_or_create_row("alice", 1000)
+                self.storage.import_scores(path, file_format)
+                self.assertEqual(self.storage.get_row("alice"), ("alice", 1000))
+                self.storage.submit_scores([("alice", 64)])
+        self.assertEqual(self.storage.get_all_rows()[1:], expected[1:])
+
+
+class TestOpenStorage(unittest.TestCase):
+    def test_selects_sqlite_from_configuration(self) -> None:
+        """Test that STORAGE_BACKEND=sqlite opens a ready SQLite storage."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.sqlite3")
+            with patch.dict(os.environ, {"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": path}):
+                storage = open_storage()
+            self.assertIsInstance(storage, SQLiteStorage)
+            self.assertEqual(storage.update_or_create_row("alice", 2), 2)
+            storage.close()
+
+    def test_rejects_unknown_backend(self) -> None:
+        """Test that a misspelt backend is an error rather than a silent default."""
+        with patch.dict(os.environ, {"STORAGE_BACKEND": "mongo"}):
+            with self.assertRaises(ValueError):
+                open_storage()
+
+
+if __name__ == "__main__":
+    unittest.main()
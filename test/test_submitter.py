@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import Dict, Iterable, List, Tuple
+
+from game2048.db import DatabaseManager
+from game2048.submitter import ScoreSubmitter
+
+
+class FakeDatabase(DatabaseManager):
+    """An in-memory DatabaseManager whose batches can be delayed or failed."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.pool = None
+        self.connection = None
+        self.failures = failures
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.batches: List[List[Tuple[str, int]]] = []
+        self.scores: Dict[str, int] = {}
+
+    def submit_scores(self, scores: Iterable[Tuple[str, int]], page_size: int = 10000) -> int:
+        self.entered.set()
+        self.release.wait()
+        if self.failures:
+            self.failures -= 1
+            return 0
+        batch = sorted(scores)
+        self.batches.append(batch)
+        for name, score in batch:
+            self.scores[name] = max(score, self.scores.get(name, score))
+        return len(batch)
+
+
+class TestScoreSubmitter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.spool = os.path.join(self.directory.name, "scores.spool")
+
+    def test_submit_does_not_wait_for_database(self) -> None:
+        """Test that submitting returns while the database is blocked, and close flushes."""
+        db = FakeDatabase()
+        db.release.clear()
+        submitter = ScoreSubmitter(lambda: db)
+        start = time.perf_counter()
+        submitter.submit("alice", 64)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(submitter.queue_depth, 1)
+        db.release.set()
+        self.assertTrue(submitter.close())
+        self.assertEqual(db.scores, {"alice": 64})
+        self.assertEqual(submitter.queue_depth, 0)
+        self.assertGreater(submitter.flush_latency, 0.0)
+
+    def test_pending_scores_are_coalesced(self) -> None:
+        """Test that scores queued during a slow flush are sent as one row per name."""
+        db = FakeDatabase()
+        db.release.clear()
+        submitter = ScoreSubmitter(lambda: db)
+        submitter.submit("first", 1)
+        self.assertTrue(db.entered.wait(5.0))
+        for score in (8, 32, 16):
+            submitter.submit("alice", score)
+        submitter.submit("bob", 4)
+        db.release.set()
+        self.assertTrue(submitter.close())
+        self.assertEqual(db.batches, [[("first", 1)], [("alice", 32), ("bob", 4)]])
+
+    def test_retries_with_backoff(self) -> None:
+        """Test that failed batches are retried until the database accepts them."""
+        db = FakeDatabase(failures=2)
+        submitter = ScoreSubmitter(lambda: db, min_backoff=0.01)
+        submitter.submit("alice", 64)
+        deadline = time.monotonic() + 5.0
+        while not db.scores and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(submitter.close())
+        self.assertEqual(submitter.failures, 2)
+        self.assertEqual(db.scores, {"alice": 64})
+
+    def test_unreachable_database_is_spooled(self) -> None:
+        """Test that unsent scores survive in the spool file and are sent next run."""
+
+        def unreachable() -> DatabaseManager:
+            raise ConnectionError("database is down")
+
+        submitter = ScoreSubmitter(unreachable, spool_path=self.spool, min_backoff=10.0)
+        submitter.submit("alice", 64)
+        submitter.submit("bob", 8)
+        self.assertFalse(submitter.close(timeout=1.0))
+        self.assertTrue(os.path.exists(self.spool))
+
+        db = FakeDatabase()
+        submitter = ScoreSubmitter(lambda: db, spool_path=self.spool)
+        self.assertTrue(submitter.close())
+        self.assertEqual(db.scores, {"alice": 64, "bob": 8})
+        self.assertFalse(os.path.exists(self.spool))
+
+    def test_submit_after_close(self) -> None:
+        """Test that a closed submitter refuses new scores."""
+        submitter = ScoreSubmitter(FakeDatabase)
+        submitter.close()
+        with self.assertRaises(RuntimeError):
+            submitter.submit("alice", 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import random
+import unittest
+from typing import List
+
+import numpy as np
+
+from game2048 import bitboard, symmetry
+from game2048.game import DIRECTIONS, Game2048
+
+
+def rotate(board: List[List[int]]) -> List[List[int]]:
+    """Rotates a board by 90 degrees clockwise."""
+    return [list(row) for row in zip(*board[::-1])]
+
+
+def list_transforms(board: List[List[int]]) -> List[List[List[int]]]:
+    """Transforms a board of any size in the order of symmetry.transforms."""
+    mirrored = [row[::-1] for row in board]
+    transposed = [list(row) for row in zip(*board)]
+    both = [row[::-1] for row in transposed]
+    return [
+        board,
+        mirrored,
+        board[::-1],
+        mirrored[::-1],
+        transposed,
+        both,
+        transposed[::-1],
+        both[::-1],
+    ]
+
+
+def random_packed(rnd: random.Random) -> int:
+    """Returns a random packed board with small tiles and empty cells."""
+    return sum(rnd.choice((0, 0, 1, 2, 3)) << (4 * cell) for cell in range(16))
+
+
+class TestTransforms(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = [[2, 4, 8, 16], [32, 64, 128, 256], [0, 2, 0, 4], [0, 0, 0, 2048]]
+        self.packed = bitboard.pack(self.board)
+
+    def test_transforms_are_the_dihedral_group(self) -> None:
+        """Test that the 8 transforms are the rotations of the board and its mirror."""
+        expected = []
+        for board in (self.board, [row[::-1] for row in self.board]):
+            for _ in range(4):
+                expected.append(bitboard.pack(board))
+                board = rotate(board)
+        self.assertEqual(sorted(symmetry.transforms(self.packed)), sorted(expected))
+        listed = [bitboard.pack(board) for board in list_transforms(self.board)]
+        self.assertEqual(symmetry.transforms(self.packed), listed)
+
+    def test_move_maps(self) -> None:
+        """Test that a move on a board matches the mapped move on each transform."""
+        rnd = random.Random(0)
+        for _ in range(200):
+            packed = random_packed(rnd)
+            for t, transformed in enumerate(symmetry.transforms(packed)):
+                for direction in DIRECTIONS:
+                    moved, gain = bitboard.MOVES[direction](packed)
+                    mapped = symmetry.move_maps[t][direction]
+                    self.assertEqual(
+                        bitboard.MOVES[mapped](transformed), (symmetry.transforms(moved)[t], gain)
+                    )
+                    self.assertEqual(symmetry.inverse_maps[t][mapped], direction)
+
+    def test_move_maps_on_other_sizes(self) -> None:
+        """Test that the move maps hold for list boards of other sizes."""
+        board = [[2, 0, 4], [2, 8, 0], [0, 4, 4]]
+        for t, transformed in enumerate(list_transforms(board)):
+            for direction in DIRECTIONS:
+                moved = Game2048.afterstates(board)[direction].board
+                mapped = Game2048.afterstates(transformed)[symmetry.move_maps[t][direction]]
+                self.assertEqual(mapped.board, list_transforms(moved)[t])
+
+
+class TestCanonical(unittest.TestCase):
+    def test_canonical(self) -> None:
+        """Test that all transforms share one canonical form, the smallest."""
+        rnd = random.Random(1)
+        for _ in range(100):
+            packed = random_packed(rnd)
+            form, t = symmetry.canonical(packed)
+            self.assertEqual(form, min(symmetry.transforms(packed)))
+            self.assertEqual(symmetry.transforms(packed)[t], form)
+            for transformed in symmetry.transforms(packed):
+                self.assertEqual(symmetry.canonical(transformed)[0], form)
+
+    def test_canonical_array(self) -> None:
+        """Test that the vectorized form matches the scalar one."""
+        rnd = random.Random(2)
+        boards = [rnd.getrandbits(64) for _ in range(1000)]
+        forms = symmetry.canonical_array(boards)
+        self.assertEqual(forms.dtype, np.uint64)
+        self.assertEqual(forms.tolist(), [symmetry.canonical(board)[0] for board in boards])
+
+    def test_canonical_board(self) -> None:
+        """Test that list boards of any size share one canonical form."""
+        board = [[2, 0, 4, 0, 0], [2, 8, 0, 0, 16], [0, 4, 4, 0, 0], [0] * 5, [0, 0, 0, 0, 2]]
+        form, t = symmetry.canonical_board(board)
+        self.assertEqual([list(row) for row in form], list_transforms(board)[t])
+        for transformed in list_transforms(board):
+            self.assertEqual(symmetry.canonical_board(transformed)[0], form)
+
+
+class TestStateIndex(unittest.TestCase):
+    def test_counts_up_to_symmetry(self) -> None:
+        """Test that the transforms of a position count as one position."""
+        packed = bitboard.pack([[2, 4, 0, 0], [0, 0, 0, 0], [0, 0, 8, 0], [0, 0, 0, 0]])
+        index = symmetry.StateIndex()
+        for transformed in symmetry.transforms(packed):
+            index.add(transformed)
+        index.add(0x21)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.visits, 9)
+        self.assertEqual(index.count(symmetry.transforms(packed)[5]), 8)
+        self.assertIn(0x1200000000000000, index)
+        self.assertNotIn(0x3, index)
+        self.assertEqual(index.count(0), 0)
+
+    def test_matches_a_counter(self) -> None:
+        """Test that batched and single additions, growth and the empty board count exactly."""
+        rnd = np.random.default_rng(3)
+        boards = rnd.integers(0, 40, size=50_000).astype(np.uint64) * np.uint64(0x1111)
+        boards[::1000] = 0
+        index = symmetry.StateIndex(initial_capacity=2)
+        index.add_many(boards[:20_000])
+        for board in boards[20_000:].tolist():
+            index.add(board)
+        forms, counts = np.unique(symmetry.canonical_array(boards), return_counts=True)
+        keys, totals = index.arrays()
+        order = np.argsort(keys)
+        np.testing.assert_array_equal(keys[order], forms)
+        np.testing.assert_array_equal(totals[order], counts)
+        self.assertEqual((len(index), index.visits, index.dropped), (len(forms), 50_000, 0))
+        self.assertLessEqual(len(index) * 4, len(index._keys) * 3)
+
+    def test_bounded(self) -> None:
+        """Test that positions beyond max_states are dropped and the table stops growing."""
+        boards = np.unique(symmetry.canonical_array(np.arange(1, 20_001) << 4))[:5000]
+        index = symmetry.StateIndex(max_states=1000, initial_capacity=16)
+        index.add_many(boards)
+        index.add_many(boards)
+        self.assertEqual(len(index), 1000)
+        self.assertEqual(index.visits, 10_000)
+        self.assertEqual(index.dropped, 8000)
+        self.assertEqual(int(index.arrays()[1].sum()), 2000)
+        self.assertEqual(index.memory_usage(), 2048 * 12)
+
+
+if __name__ == "__main__":
+    unittest.main()